@@ -8,6 +8,9 @@ from flask import Flask
 from flask_cors import CORS
 
 from server.common.authentication import ClientsRemoteAuth
+from server.common.scheduler import scheduler_service
+from server.common.rest_cache import rest_cache_service
+from server.managers.connectivity_manager import connectivity_manager_service
 from server.managers.mqtt_manager import mqtt_manager_service
 from server.managers.mqtt_liveobjects_manager import mqtt_liveobjects_manager_service
 from server.managers.wifi_bands_ssh_manager import wifi_bands_manager_service
@@ -29,6 +32,7 @@ from .rest_api.energy_recommendations_controler import (
     bp as energy_recommendations_controler_bp,
 )
 from .rest_api.mqtt_test_controler import bp as mqtt_test_bp
+from .rest_api.metrics_controler import bp as metrics_controler_bp
 from .orchestrator import orchestrator_service
 from .extension import api
 from .common import ServerBoxException, handle_server_box_exception
@@ -100,6 +104,12 @@ def register_extensions(app: Flask):
             },
         },
     )
+    # Periodic jobs scheduler
+    scheduler_service.init_app(app=app)
+    # REST endpoints readings cache
+    rest_cache_service.init_app(app=app)
+    # Internet connectivity service
+    connectivity_manager_service.init_app(app=app)
     # MQTT service
     mqtt_manager_service.init_app(app=app)
     # MQTT LiveObjects service
@@ -141,6 +151,7 @@ def register_blueprints(app: Flask):
     api.register_blueprint(commands_controler_bp)
     api.register_blueprint(energy_recommendations_controler_bp)
     api.register_blueprint(mqtt_test_bp)
+    api.register_blueprint(metrics_controler_bp)
 
 
 def register_remote_blueprints(app: Flask):
@@ -0,0 +1,13 @@
+"""Device state store package"""
+from .service import (
+    DeviceStateStore,
+    DeviceStateSnapshot,
+    device_state_store,
+    state_property,
+    WIFI_STATUS,
+    ELECTRICAL_PANEL_RELAYS,
+    POWER_STRIP_RELAYS,
+    ALIMELO_RESSOURCES,
+    THREAD_NODES,
+    USE_SITUATION,
+)
@@ -0,0 +1,156 @@
+"""
+Device state store, the last known state of the box resources. Each
+commit publishes a new immutable versioned snapshot, readers never lock
+"""
+import logging
+import threading
+import time
+from types import MappingProxyType
+from typing import Any, Callable, Mapping
+
+logger = logging.getLogger(__name__)
+
+# State keys
+WIFI_STATUS = "wifi_status"
+ELECTRICAL_PANEL_RELAYS = "electrical_panel_relays"
+POWER_STRIP_RELAYS = "power_strip_relays"
+ALIMELO_RESSOURCES = "alimelo_ressources"
+THREAD_NODES = "thread_nodes"
+USE_SITUATION = "use_situation"
+
+
+class DeviceStateSnapshot:
+    """
+    Consistent view of all the resources at one version. The values must
+    be immutable, the snapshot is shared between threads
+    """
+
+    __slots__ = ("version", "values", "key_versions", "committed_at")
+
+    def __init__(self, version: int, values: dict, key_versions: dict, committed_at: float):
+        self.version = version
+        self.values = MappingProxyType(values)
+        # {key: version of the last change}
+        self.key_versions = MappingProxyType(key_versions)
+        self.committed_at = committed_at
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Return the value of a resource"""
+        return self.values.get(key, default)
+
+    def __getitem__(self, key: str) -> Any:
+        return self.values[key]
+
+
+class DeviceStateStore:
+    """
+    Copy on write state store. Writers are serialized, a commit builds new
+    dicts and swaps the snapshot reference. The subscribers of a key are
+    called after the commit when its value changed
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.time):
+        self.clock = clock
+        self._write_lock = threading.Lock()
+        self._snapshot = DeviceStateSnapshot(0, {}, {}, clock())
+        # {key: [callback(key, value, snapshot)]}
+        self._subscribers = {}
+        self.counters = {"commits": 0, "unchanged": 0, "callback_errors": 0}
+
+    def snapshot(self) -> DeviceStateSnapshot:
+        """Return the current snapshot, lock free"""
+        return self._snapshot
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Return the current value of a resource"""
+        return self._snapshot.get(key, default)
+
+    def set(self, key: str, value: Any) -> DeviceStateSnapshot:
+        """Commit a resource value"""
+        return self.update({key: value})
+
+    def update(self, changes: Mapping[str, Any]) -> DeviceStateSnapshot:
+        """Commit several resources values atomically, return the snapshot"""
+        with self._write_lock:
+            snapshot, subscribers = self._commit(changes)
+        self._notify(snapshot, subscribers)
+        return snapshot
+
+    def modify(self, key: str, function: Callable[[Any], Any]) -> DeviceStateSnapshot:
+        """
+        Commit function(current value) as the new resource value, the
+        writers of the key in between cannot be lost
+        """
+        with self._write_lock:
+            snapshot, subscribers = self._commit({key: function(self._snapshot.get(key))})
+        self._notify(snapshot, subscribers)
+        return snapshot
+
+    def _commit(self, changes: Mapping[str, Any]) -> tuple:
+        """
+        Publish the changed values (write lock must be held), return the
+        snapshot and the subscribers to notify
+        """
+        current = self._snapshot
+        changed = [
+            key
+            for key, value in changes.items()
+            if key not in current.values or current.values[key] != value
+        ]
+        if not changed:
+            self.counters["unchanged"] += 1
+            return current, []
+
+        version = current.version + 1
+        values = dict(current.values)
+        key_versions = dict(current.key_versions)
+        for key in changed:
+            values[key] = changes[key]
+            key_versions[key] = version
+        snapshot = DeviceStateSnapshot(version, values, key_versions, self.clock())
+        self._snapshot = snapshot
+        self.counters["commits"] += 1
+        subscribers = [
+            (key, callback) for key in changed for callback in self._subscribers.get(key, ())
+        ]
+        return snapshot, subscribers
+
+    def _notify(self, snapshot: DeviceStateSnapshot, subscribers: list):
+        """Call the subscribers outside the lock, a subscriber may commit"""
+        for key, callback in subscribers:
+            try:
+                callback(key, snapshot.values[key], snapshot)
+            except Exception as e:
+                self.counters["callback_errors"] += 1
+                logger.error(f"Error in device state {key} subscriber: {e}")
+
+    def subscribe(self, key: str, callback: Callable[[str, Any, DeviceStateSnapshot], None]):
+        """Add a callback(key, value, snapshot) called when the key value changes"""
+        with self._write_lock:
+            # Copy on write, a notification in progress keeps the old list
+            self._subscribers[key] = self._subscribers.get(key, []) + [callback]
+
+    def get_metrics(self) -> dict:
+        """Return the store version and counters"""
+        snapshot = self._snapshot
+        metrics = dict(self.counters)
+        metrics["version"] = snapshot.version
+        metrics["key_versions"] = dict(snapshot.key_versions)
+        metrics["subscribers"] = {key: len(callbacks) for key, callbacks in self._subscribers.items()}
+        return metrics
+
+
+device_state_store: DeviceStateStore = DeviceStateStore()
+""" Device state store singleton"""
+
+
+def state_property(key: str, doc: str = None) -> property:
+    """Service attribute kept in the device state store under key"""
+
+    def getter(_):
+        return device_state_store.get(key)
+
+    def setter(_, value):
+        device_state_store.set(key, value)
+
+    return property(getter, setter, doc=doc)
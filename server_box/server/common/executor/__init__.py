@@ -0,0 +1,2 @@
+"""Keyed executor package"""
+from .service import KeyedExecutor
@@ -0,0 +1,166 @@
+"""
+Keyed executor service, bounded worker pool that keeps the submission
+order of the tasks sharing the same key
+"""
+import heapq
+import itertools
+import logging
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+
+logger = logging.getLogger(__name__)
+
+
+class _Task:
+    """Task waiting in a key lane"""
+
+    __slots__ = ("fn", "args", "kwargs", "future", "priority", "enqueued_at")
+
+    def __init__(self, fn: callable, args, kwargs, priority: int):
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.future = Future()
+        self.priority = priority
+        self.enqueued_at = time.monotonic()
+
+
+class KeyedExecutor:
+    """
+    Bounded worker pool. Tasks with the same key run one at a time in
+    submission order, tasks with different keys run concurrently.
+    Lanes are served by priority (lower value first)
+    """
+
+    def __init__(self, max_workers: int, max_queue_size: int = 0, name: str = "KeyedExecutor"):
+        self.max_workers = max_workers
+        self.max_queue_size = max_queue_size
+        self.name = name
+
+        self._condition = threading.Condition()
+        self._lanes = {}
+        self._active_keys = set()
+        self._scheduled_keys = set()
+        self._ready_keys = []
+        self._sequence = itertools.count()
+        self._queue_depth = 0
+        self._running = True
+
+        # Executor metrics
+        self._metrics = {
+            "submitted": 0,
+            "completed": 0,
+            "failed": 0,
+            "rejected": 0,
+            "max_queue_depth": 0,
+            "max_wait_time_in_secs": 0.0,
+            "max_run_time_in_secs": 0.0,
+        }
+        self._total_wait_time_in_secs = 0.0
+        self._total_run_time_in_secs = 0.0
+
+        self._workers = []
+        for idx in range(max_workers):
+            worker = threading.Thread(target=self._work, name=f"{name}_{idx}", daemon=True)
+            worker.start()
+            self._workers.append(worker)
+
+    def submit(self, key, fn: callable, *args, priority: int = 0, **kwargs) -> Future:
+        """Submit a task in the key lane, raise queue.Full if the executor is full"""
+        task = _Task(fn, args, kwargs, priority)
+        with self._condition:
+            if not self._running:
+                raise RuntimeError(f"{self.name} is shut down")
+            if self.max_queue_size and self._queue_depth >= self.max_queue_size:
+                self._metrics["rejected"] += 1
+                raise queue.Full(f"{self.name} queue is full")
+
+            self._lanes.setdefault(key, deque()).append(task)
+            self._queue_depth += 1
+            self._metrics["submitted"] += 1
+            self._metrics["max_queue_depth"] = max(
+                self._metrics["max_queue_depth"], self._queue_depth
+            )
+
+            # Schedule the lane if it is not already running or waiting
+            if key not in self._active_keys and key not in self._scheduled_keys:
+                self._schedule(key)
+        return task.future
+
+    def shutdown(self, wait: bool = True):
+        """Stop the workers once the submitted tasks are done"""
+        with self._condition:
+            self._running = False
+            self._condition.notify_all()
+        if wait:
+            for worker in self._workers:
+                worker.join()
+
+    def get_metrics(self) -> dict:
+        """Return executor metrics"""
+        with self._condition:
+            metrics = dict(self._metrics)
+            metrics["queue_depth"] = self._queue_depth
+            metrics["active_lanes"] = len(self._active_keys)
+            done = metrics["completed"] + metrics["failed"]
+            metrics["avg_wait_time_in_secs"] = (
+                self._total_wait_time_in_secs / done if done else 0.0
+            )
+            metrics["avg_run_time_in_secs"] = (
+                self._total_run_time_in_secs / done if done else 0.0
+            )
+        return metrics
+
+    def _schedule(self, key):
+        """Put the lane in the ready heap (lock must be held)"""
+        priority = self._lanes[key][0].priority
+        heapq.heappush(self._ready_keys, (priority, next(self._sequence), key))
+        self._scheduled_keys.add(key)
+        self._condition.notify()
+
+    def _work(self):
+        """Worker loop"""
+        while True:
+            with self._condition:
+                while not self._ready_keys and self._running:
+                    self._condition.wait()
+                if not self._ready_keys:
+                    return
+                _, _, key = heapq.heappop(self._ready_keys)
+                self._scheduled_keys.discard(key)
+                task = self._lanes[key].popleft()
+                self._queue_depth -= 1
+                self._active_keys.add(key)
+
+            started_at = time.monotonic()
+            failed = False
+            if task.future.set_running_or_notify_cancel():
+                try:
+                    task.future.set_result(task.fn(*task.args, **task.kwargs))
+                except BaseException as e:
+                    logger.error(f"{self.name} task failed for key {key}: {e}")
+                    task.future.set_exception(e)
+                    failed = True
+            finished_at = time.monotonic()
+
+            with self._condition:
+                self._active_keys.discard(key)
+                if self._lanes[key]:
+                    self._schedule(key)
+                else:
+                    del self._lanes[key]
+
+                wait_time = started_at - task.enqueued_at
+                run_time = finished_at - started_at
+                self._metrics["failed" if failed else "completed"] += 1
+                self._total_wait_time_in_secs += wait_time
+                self._total_run_time_in_secs += run_time
+                self._metrics["max_wait_time_in_secs"] = max(
+                    self._metrics["max_wait_time_in_secs"], wait_time
+                )
+                self._metrics["max_run_time_in_secs"] = max(
+                    self._metrics["max_run_time_in_secs"], run_time
+                )
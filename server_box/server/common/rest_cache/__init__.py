@@ -0,0 +1,2 @@
+"""REST read-through cache package"""
+from .service import rest_cache_service, RestCache, WIFI_STATUS_READING, WIFI_STATIONS_READING
@@ -0,0 +1,84 @@
+"""
+REST read-through cache, the GET endpoints serve a recent reading instead
+of querying the devices on every request
+"""
+import logging
+import threading
+from flask import Flask
+from server.common.scheduler import scheduler_service, SharedResultCache
+from server.common.device_state import device_state_store, WIFI_STATUS
+
+logger = logging.getLogger(__name__)
+
+# Readings names, the wifi status reading is the one of the polling jobs
+WIFI_STATUS_READING = "wifi_status"
+WIFI_STATIONS_READING = "wifi_stations"
+
+
+class RestCache:
+    """
+    Readings cache of the REST endpoints, shared with the scheduled jobs.
+    Concurrent requests of a missing reading wait for a single device
+    query, fresh requests drop the cached reading first
+    """
+
+    result_cache: SharedResultCache
+    max_age_in_secs: float
+    # {reading name: max age}, endpoints with their own max age
+    max_ages: dict
+
+    def __init__(self, result_cache: SharedResultCache):
+        self.result_cache = result_cache
+        self.max_age_in_secs = 0
+        self.max_ages = {}
+        self._lock = threading.Lock()
+        self.counters = {"requests": 0, "fresh_requests": 0, "invalidations": 0}
+
+    def init_app(self, app: Flask) -> None:
+        """Initialize RestCache"""
+        if app is not None:
+            logger.info("initializing the RestCache")
+            self.max_age_in_secs = app.config["REST_CACHE_MAX_AGE_IN_SECS"]
+            self.max_ages = {
+                WIFI_STATIONS_READING: app.config["REST_CACHE_STATIONS_MAX_AGE_IN_SECS"]
+            }
+
+            # The wifi status reading is outdated once a change is recorded
+            device_state_store.subscribe(
+                WIFI_STATUS, lambda *_: self.invalidate(WIFI_STATUS_READING)
+            )
+
+    def get(self, name: str, read: callable, key: str = None, fresh: bool = False):
+        """
+        Return a reading younger than the name max age, call read if needed.
+        key distinguishes the readings of a parametrized endpoint
+        """
+        cache_key = name if key is None else f"{name}/{key}"
+        with self._lock:
+            self.counters["requests"] += 1
+            if fresh:
+                self.counters["fresh_requests"] += 1
+        if fresh:
+            self.result_cache.invalidate(cache_key)
+        return self.result_cache.get(
+            key=cache_key,
+            max_age_in_secs=self.max_ages.get(name, self.max_age_in_secs),
+            read=read,
+        )
+
+    def invalidate(self, name: str, key: str = None):
+        """Drop a cached reading"""
+        with self._lock:
+            self.counters["invalidations"] += 1
+        self.result_cache.invalidate(name if key is None else f"{name}/{key}")
+
+    def get_metrics(self) -> dict:
+        """Return the REST cache counters and the shared readings cache metrics"""
+        with self._lock:
+            metrics = dict(self.counters)
+        metrics["result_cache"] = self.result_cache.get_metrics()
+        return metrics
+
+
+rest_cache_service: RestCache = RestCache(result_cache=scheduler_service.result_cache)
+""" REST cache service singleton"""
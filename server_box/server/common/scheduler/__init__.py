@@ -0,0 +1,3 @@
+"""Jobs scheduler package"""
+from .service import scheduler_service
+from .cache import SharedResultCache
@@ -0,0 +1,72 @@
+"""
+Shared result cache, lets the jobs reading the same resource share a
+single reading
+"""
+import logging
+import threading
+import time
+from concurrent.futures import Future
+
+logger = logging.getLogger(__name__)
+
+
+class SharedResultCache:
+    """
+    Thread safe cache of resource readings. A reading younger than max_age
+    is reused, concurrent callers of a missing key wait for the same reading
+    """
+
+    def __init__(self):
+        # {key: (result, read_at)}
+        self._results = {}
+        self._in_flight = {}
+        self._lock = threading.Lock()
+        self._metrics = {"hits": 0, "misses": 0, "shared": 0}
+
+    def get(self, key: str, max_age_in_secs: float, read: callable):
+        """Return a reading of key younger than max_age, call read if needed"""
+        with self._lock:
+            cached = self._results.get(key)
+            if cached is not None and time.monotonic() - cached[1] <= max_age_in_secs:
+                self._metrics["hits"] += 1
+                return cached[0]
+
+            # Wait for the reading already running
+            future = self._in_flight.get(key)
+            if future is not None:
+                self._metrics["shared"] += 1
+                owner = False
+            else:
+                self._metrics["misses"] += 1
+                future = Future()
+                self._in_flight[key] = future
+                owner = True
+
+        if not owner:
+            return future.result()
+
+        try:
+            result = read()
+        except BaseException as e:
+            with self._lock:
+                del self._in_flight[key]
+            future.set_exception(e)
+            raise
+
+        with self._lock:
+            del self._in_flight[key]
+            # Failed readings (None) are not cached
+            if result is not None:
+                self._results[key] = (result, time.monotonic())
+        future.set_result(result)
+        return result
+
+    def invalidate(self, key: str):
+        """Forget the cached reading of key"""
+        with self._lock:
+            self._results.pop(key, None)
+
+    def get_metrics(self) -> dict:
+        """Return cache metrics"""
+        with self._lock:
+            return dict(self._metrics)
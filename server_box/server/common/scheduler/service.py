@@ -0,0 +1,182 @@
+"""
+Jobs scheduler service, a single asyncio loop times all the periodic jobs
+and runs them in a bounded worker pool
+"""
+import asyncio
+import logging
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from flask import Flask
+from .cache import SharedResultCache
+
+logger = logging.getLogger(__name__)
+
+
+class Job:
+    """Periodic job and its timing stats"""
+
+    def __init__(self, name: str, function: callable, interval_in_secs: float, jitter_in_secs: float):
+        self.name = name
+        self.function = function
+        self.interval_in_secs = interval_in_secs
+        self.jitter_in_secs = jitter_in_secs
+        self.running = False
+        self.stats = {
+            "runs": 0,
+            "failures": 0,
+            "overruns_skipped": 0,
+            "coalesced": 0,
+            "last_duration_in_secs": 0.0,
+            "max_duration_in_secs": 0.0,
+            "total_duration_in_secs": 0.0,
+        }
+
+    def get_stats(self) -> dict:
+        """Return job timing stats"""
+        stats = dict(self.stats)
+        total_duration = stats.pop("total_duration_in_secs")
+        stats["avg_duration_in_secs"] = total_duration / stats["runs"] if stats["runs"] else 0.0
+        stats["interval_in_secs"] = self.interval_in_secs
+        stats["running"] = self.running
+        return stats
+
+
+class Scheduler:
+    """
+    Single scheduler for the periodic jobs. A job is skipped while its
+    previous run is active and the missed periods are coalesced in one run
+    """
+
+    def __init__(self, app: Flask = None) -> None:
+        self.jobs = {}
+        self.result_cache = SharedResultCache()
+        self.loop = None
+        self.executor = None
+        self.default_jitter_in_secs = 0
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app: Flask) -> None:
+        """Initialize Scheduler"""
+        if app is not None:
+            logger.info("initializing the Scheduler")
+            self.default_jitter_in_secs = app.config["SCHEDULER_DEFAULT_JITTER_IN_SECS"]
+            self.start(max_workers=app.config["SCHEDULER_MAX_WORKERS"])
+
+    def start(self, max_workers: int):
+        """Start the scheduler loop in a dedicated thread"""
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="SchedulerJob"
+        )
+        self.loop = asyncio.new_event_loop()
+        thread = threading.Thread(target=self.loop.run_forever, name="Scheduler", daemon=True)
+        thread.start()
+
+        # Schedule the jobs registered before start
+        with self._lock:
+            for job in self.jobs.values():
+                self._schedule(job)
+
+    def job(self, interval: timedelta, jitter_in_secs: float = None, name: str = None):
+        """Decorator registering a periodic job, Timeloop style"""
+
+        def decorator(function: callable):
+            self.add_job(
+                function=function,
+                interval=interval,
+                jitter_in_secs=jitter_in_secs,
+                name=name,
+            )
+            return function
+
+        return decorator
+
+    def add_job(
+        self,
+        function: callable,
+        interval: timedelta,
+        jitter_in_secs: float = None,
+        name: str = None,
+    ) -> Job:
+        """Register a periodic job"""
+        job = Job(
+            name=name or function.__name__,
+            function=function,
+            interval_in_secs=interval.total_seconds(),
+            jitter_in_secs=self.default_jitter_in_secs if jitter_in_secs is None else jitter_in_secs,
+        )
+        with self._lock:
+            if job.name in self.jobs:
+                raise ValueError(f"Job {job.name} already registered")
+            self.jobs[job.name] = job
+            if self.loop is not None:
+                self._schedule(job)
+        logger.info(f"Job {job.name} registered, interval: {job.interval_in_secs}s")
+        return job
+
+    def get_jobs_stats(self) -> dict:
+        """Return the timing stats of the jobs"""
+        with self._lock:
+            return {name: job.get_stats() for name, job in self.jobs.items()}
+
+    def get_metrics(self) -> dict:
+        """Return jobs stats and shared result cache metrics"""
+        return {
+            "jobs": self.get_jobs_stats(),
+            "result_cache": self.result_cache.get_metrics(),
+        }
+
+    def _schedule(self, job: Job):
+        """Create the job timing task in the loop"""
+        self.loop.call_soon_threadsafe(self.loop.create_task, self._run_periodically(job))
+
+    async def _run_periodically(self, job: Job):
+        """Job timing task"""
+        next_run = time.monotonic() + job.interval_in_secs
+        while True:
+            # Jitter spreads the runs of the jobs sharing the same interval
+            run_at = next_run + random.uniform(0, job.jitter_in_secs)
+            await asyncio.sleep(max(0.0, run_at - time.monotonic()))
+
+            if job.running:
+                job.stats["overruns_skipped"] += 1
+                logger.warning(f"Job {job.name} still running, run skipped")
+            else:
+                job.running = True
+                try:
+                    self.loop.run_in_executor(self.executor, self._execute, job)
+                except RuntimeError:
+                    # Executor shut down at interpreter exit
+                    return
+
+            # Coalesce the periods missed in a single run
+            next_run += job.interval_in_secs
+            now = time.monotonic()
+            if next_run <= now:
+                missed = int((now - next_run) // job.interval_in_secs) + 1
+                job.stats["coalesced"] += missed
+                next_run += missed * job.interval_in_secs
+
+    def _execute(self, job: Job):
+        """Run the job in a worker and record its timing"""
+        start = time.monotonic()
+        try:
+            job.function()
+        except Exception as e:
+            job.stats["failures"] += 1
+            logger.exception(f"Job {job.name} failed: {e}")
+        finally:
+            duration = time.monotonic() - start
+            job.stats["runs"] += 1
+            job.stats["last_duration_in_secs"] = duration
+            job.stats["total_duration_in_secs"] += duration
+            job.stats["max_duration_in_secs"] = max(job.stats["max_duration_in_secs"], duration)
+            job.running = False
+
+
+scheduler_service: Scheduler = Scheduler()
+""" Scheduler service singleton"""
@@ -1,2 +1,3 @@
 """Alimelo interface package"""
 from .service import AlimeloSerialCom as AlimeloInterface
+from .codec import ENCODERS, JSON as JSON_ENCODING
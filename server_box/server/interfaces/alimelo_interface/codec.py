@@ -0,0 +1,144 @@
+"""
+Alimelo wire encodings of the LiveObjects payloads
+
+The compact encoding (version 1) must match the Alimelo firmware decoder.
+A frame starts with its type:
+    S{flags:2}{ep:1}{us}  status, flags and ep are base64url digits
+    A{alarm}...           alarms, one digit or ~{name}; per alarm occurrence
+    J{json}               any other payload
+Status flags bits: 0-4 values of w, ci, w2, w5, w6, 5-9 the same values
+known, 10 ep known. Use situation is a digit or ~{name}
+"""
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+JSON = "json"
+COMPACT = "compact"
+
+DIGITS = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-_"
+INLINE = "~"
+INLINE_END = ";"
+
+# Schema tables, append only, the indexes are shared with the firmware
+WIFI_FIELDS = ["w", "ci", "w2", "w5", "w6"]
+ELECTRICAL_PANEL_RELAYS = 6
+USE_SITUATIONS = [
+    "PRESENCE_HOME_OFFICE",
+    "PRESENCE_DAY_LOW_CONSUMPTION",
+    "PRESENCE_NIGHT_LOW_CONSUMPTION",
+    "ABSENCE_LOW_CONSUMPTION",
+    "DEEP_SLEEP",
+]
+ALARM_TYPES = ["doorbell", "presence", "emergency_btn", "low_power"]
+
+EP_KNOWN_BIT = 2 * len(WIFI_FIELDS)
+
+
+def encode_json(data: dict) -> str:
+    """Encode payload in JSON without spaces"""
+    return json.dumps(data, separators=(",", ":"))
+
+
+def encode_compact(data: dict) -> str:
+    """Encode payload in the compact encoding, JSON frame if out of schema"""
+    try:
+        if set(data) == {"wf", "ep", "us"}:
+            return encode_status(data)
+        if set(data) == {"al"} and all(
+            type(count) is int and count > 0 for count in data["al"].values()
+        ):
+            return encode_alarms(data["al"])
+    except (ValueError, TypeError, AttributeError) as e:
+        logger.warning(f"Payload out of compact schema, sent as JSON: {e}")
+    return "J" + encode_json(data)
+
+
+def encode_status(data: dict) -> str:
+    """Encode wf/ep/us status"""
+    wifi_status = data["wf"]
+    if set(wifi_status) - set(WIFI_FIELDS):
+        raise ValueError(f"Unknown wifi fields {wifi_status}")
+
+    flags = 0
+    for bit, field in enumerate(WIFI_FIELDS):
+        value = wifi_status.get(field)
+        if value is None:
+            continue
+        if not isinstance(value, bool):
+            raise ValueError(f"Wifi field {field} is not a boolean")
+        flags |= (value << bit) | (1 << (bit + len(WIFI_FIELDS)))
+
+    relays = 0
+    if data["ep"]:
+        if len(data["ep"]) != ELECTRICAL_PANEL_RELAYS or set(data["ep"]) - {"0", "1"}:
+            raise ValueError(f"Invalid electrical panel status {data['ep']}")
+        relays = int(data["ep"][::-1], 2)
+        flags |= 1 << EP_KNOWN_BIT
+
+    return (
+        "S"
+        + DIGITS[flags >> 6]
+        + DIGITS[flags & 0x3F]
+        + DIGITS[relays]
+        + encode_name(data["us"], USE_SITUATIONS)
+    )
+
+
+def encode_alarms(alarms: dict) -> str:
+    """Encode alarms, an alarm type is repeated count times"""
+    return "A" + "".join(
+        encode_name(alarm, ALARM_TYPES) * count for alarm, count in alarms.items()
+    )
+
+
+def encode_name(name: str, table: list) -> str:
+    """Encode a name as its table index, inline if not in the table"""
+    if name in table:
+        return DIGITS[table.index(name)]
+    if INLINE_END in name:
+        raise ValueError(f"Invalid name {name}")
+    return INLINE + name + INLINE_END
+
+
+def decode_compact(frame: str) -> dict:
+    """Decode a compact frame, reference of the firmware decoder"""
+    frame_type, body = frame[0], frame[1:]
+    if frame_type == "J":
+        return json.loads(body)
+    if frame_type == "A":
+        alarms = {}
+        while body:
+            alarm, body = decode_name(body, ALARM_TYPES)
+            alarms[alarm] = alarms.get(alarm, 0) + 1
+        return {"al": alarms}
+    if frame_type == "S":
+        flags = (DIGITS.index(body[0]) << 6) | DIGITS.index(body[1])
+        relays = DIGITS.index(body[2])
+        use_situation, _ = decode_name(body[3:], USE_SITUATIONS)
+        wifi_status = {
+            field: bool(flags >> bit & 1)
+            if flags >> (bit + len(WIFI_FIELDS)) & 1
+            else None
+            for bit, field in enumerate(WIFI_FIELDS)
+        }
+        ep = ""
+        if flags >> EP_KNOWN_BIT & 1:
+            ep = "".join(
+                "1" if relays >> relay & 1 else "0"
+                for relay in range(ELECTRICAL_PANEL_RELAYS)
+            )
+        return {"wf": wifi_status, "ep": ep, "us": use_situation}
+    raise ValueError(f"Unknown frame type {frame_type}")
+
+
+def decode_name(body: str, table: list):
+    """Decode a name, return it and the rest of the body"""
+    if body[0] == INLINE:
+        end = body.index(INLINE_END)
+        return body[1:end], body[end + 1 :]
+    return table[DIGITS.index(body[0])], body[1:]
+
+
+ENCODERS = {JSON: encode_json, COMPACT: encode_compact}
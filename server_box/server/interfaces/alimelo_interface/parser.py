@@ -0,0 +1,133 @@
+"""
+Alimelo serial stream parser
+"""
+import logging
+from typing import List, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Frame kinds
+NOTIFICATION = "NOTIFICATION"
+COMMAND = "COMMAND"
+
+# Parser states
+IDLE = "IDLE"
+
+
+class AlimeloFrameParser:
+    """
+    Single state machine parsing the notifications and commands received
+    from Alimelo. A frame is the lines between the {separator}_BEGINS and
+    {separator}_ENDS lines, joined without their line endings
+    """
+
+    def __init__(
+        self,
+        notification_separator: str,
+        command_separator: str,
+        max_frame_size: int = 4096,
+    ):
+        self.max_frame_size = max_frame_size
+        # {marker: (kind, begins)}
+        self.markers = {
+            f"{notification_separator}_BEGINS": (NOTIFICATION, True),
+            f"{notification_separator}_ENDS": (NOTIFICATION, False),
+            f"{command_separator}_BEGINS": (COMMAND, True),
+            f"{command_separator}_ENDS": (COMMAND, False),
+        }
+        self.state = IDLE
+        self._line = bytearray()
+        self._frame = []
+        self._frame_size = 0
+        self.counters = {
+            "bytes_received": 0,
+            "notifications": 0,
+            "commands": 0,
+            "decode_errors": 0,
+            "oversized_frames": 0,
+            "unterminated_frames": 0,
+            "ignored_lines": 0,
+        }
+
+    def feed(self, data: bytes) -> List[Tuple[str, str]]:
+        """Add received bytes, return the complete (kind, frame) received"""
+        self.counters["bytes_received"] += len(data)
+        self._line += data
+        frames = []
+        start = 0
+        while True:
+            end = self._line.find(b"\n", start)
+            if end < 0:
+                break
+            frame = self._parse_line(bytes(self._line[start:end]))
+            if frame is not None:
+                frames.append(frame)
+            start = end + 1
+        del self._line[:start]
+
+        # A line without end can not be longer than a frame
+        if len(self._line) > self.max_frame_size:
+            self.counters["oversized_frames"] += 1
+            self._line.clear()
+            self._reset_frame()
+        return frames
+
+    def reset(self):
+        """Drop the partial line and frame, on connection restart"""
+        self._line.clear()
+        if self.state != IDLE:
+            self.counters["unterminated_frames"] += 1
+        self._reset_frame()
+
+    def _parse_line(self, raw_line: bytes):
+        """State machine transition for a complete line"""
+        try:
+            line = raw_line.decode("utf-8").strip("\r\n")
+        except UnicodeDecodeError:
+            self.counters["decode_errors"] += 1
+            logger.error(f"Invalid bytes in Alimelo line: {raw_line!r}")
+            return None
+
+        marker = self._find_marker(line)
+        if marker is not None:
+            kind, begins = marker
+            if begins:
+                if self.state != IDLE:
+                    self.counters["unterminated_frames"] += 1
+                    logger.error(f"{self.state} frame not terminated, dropped")
+                self._reset_frame()
+                self.state = kind
+                return None
+            if kind == self.state:
+                frame = (kind, "".join(self._frame))
+                self.counters["notifications" if kind == NOTIFICATION else "commands"] += 1
+                self._reset_frame()
+                return frame
+
+        if self.state == IDLE:
+            if line:
+                self.counters["ignored_lines"] += 1
+            return None
+
+        self._frame.append(line)
+        self._frame_size += len(line)
+        if self._frame_size > self.max_frame_size:
+            self.counters["oversized_frames"] += 1
+            logger.error(f"{self.state} frame exceeds {self.max_frame_size} bytes, dropped")
+            self._reset_frame()
+        return None
+
+    def _find_marker(self, line: str):
+        """Return the (kind, begins) of the marker in line, None if no marker"""
+        if "_BEGINS" not in line and "_ENDS" not in line:
+            return None
+        for marker, kind_and_begins in self.markers.items():
+            if marker in line:
+                return kind_and_begins
+        return None
+
+    def _reset_frame(self):
+        """Back to idle state"""
+        self.state = IDLE
+        self._frame = []
+        self._frame_size = 0
@@ -5,6 +5,7 @@ import logging
 import threading
 import serial
 import time
+from .parser import AlimeloFrameParser, NOTIFICATION
 
 logger = logging.getLogger(__name__)
 
@@ -24,16 +25,27 @@ class AlimeloSerialCom(threading.Thread):
         serial_port: str,
         notification_separator: str,
         command_separator: str,
-        serial_connection_restart_timeout_in_secs: int,
+        read_timeout_in_secs: float,
+        reconnect_min_delay_in_secs: float,
+        reconnect_max_delay_in_secs: float,
     ):
         self.serial_port = serial_port
         self.notification_separator = notification_separator
         self.command_separator = command_separator
-        self.conn_restart_timeout_in_secs = serial_connection_restart_timeout_in_secs
+        self.read_timeout_in_secs = read_timeout_in_secs
+        self.reconnect_min_delay_in_secs = reconnect_min_delay_in_secs
+        self.reconnect_max_delay_in_secs = reconnect_max_delay_in_secs
+        self.reconnect_delay_in_secs = reconnect_min_delay_in_secs
         self.serial = None
         self.notification_callback = None
         self.command_callback = None
         self.connected = False
+        self.serial_lock = threading.Lock()
+        self.parser = AlimeloFrameParser(
+            notification_separator=notification_separator,
+            command_separator=command_separator,
+        )
+        self.counters = {"bytes_sent": 0, "reconnections": 0, "connection_errors": 0}
 
         # setup thread network
         self.setup_serial_communication()
@@ -46,76 +58,53 @@ class AlimeloSerialCom(threading.Thread):
         self.setDaemon(True)
 
     def run(self):
-        """Run thread"""
-        notification_separator_start = self.notification_separator + "_BEGINS"
-        notification_separator_end = self.notification_separator + "_ENDS"
-        notification_received = ""
-        commannd_separator_start = self.command_separator + "_BEGINS"
-        command_separator_end = self.command_separator + "_ENDS"
-        command_received = ""
+        """Run thread, blocks on the serial port until bytes are received"""
         while self.running:
+            if not self.connected:
+                logger.error("Serial connection is down")
+                self.restart_serial_connection()
+                continue
             try:
-                if self.connected:
-                    serial_read = self.serial.readline().decode("utf-8")
-                    if len(serial_read) > 10:
-                        # Notification reception managment
-                        if notification_separator_start in serial_read:
-                            reading_notification = True
-                            while reading_notification:
-                                notification_segment_received = (
-                                    self.serial.readline().decode("utf-8")
-                                )
-                                if (
-                                    notification_separator_end
-                                    in notification_segment_received
-                                ):
-                                    reading_notification = False
-                                    if self.notification_callback is None:
-                                        logger.error(
-                                            "Notification reception callback is None"
-                                        )
-                                        break
-                                    self.notification_callback(
-                                        notification_received.replace("\r\n", "")
-                                    )
-                                    notification_received = ""
-                                    continue
-                                notification_received += notification_segment_received
-
-                        # Command reception managment
-                        elif commannd_separator_start in serial_read:
-                            reading_command = True
-                            while reading_command:
-                                command_segment_received = (
-                                    self.serial.readline().decode("utf-8")
-                                )
-                                if command_separator_end in command_segment_received:
-                                    reading_command = False
-                                    if self.command_callback is None:
-                                        logger.error(
-                                            "Command reception callback is None"
-                                        )
-                                        break
-                                    self.command_callback(
-                                        command_received.replace("\r\n", "")
-                                    )
-                                    command_received = ""
-                                    continue
-                                command_received += command_segment_received
-                else:
-                    logger.error("Serial connection is down")
-                    self.restart_serial_connection()
-            except (
-                serial.SerialException,
-                AttributeError,
-                Exception,
-            ) as e:
+                # Wait for at least one byte, then take all the bytes received
+                data = self.serial.read(max(1, self.serial.in_waiting))
+            except (serial.SerialException, OSError, AttributeError) as e:
                 logger.error("Exception in serial connection")
                 logger.error(e)
-                self.restart_serial_connection()
+                self.connected = False
+                self.counters["connection_errors"] += 1
+                continue
+            if not data:
+                continue
+
+            # The link works, next reconnection starts with the min delay
+            self.reconnect_delay_in_secs = self.reconnect_min_delay_in_secs
+            for kind, frame in self.parser.feed(data):
+                self.dispatch_frame(kind, frame)
+
         logger.info("End of Alimelo serial communication")
         self.serial.close()
 
+    def dispatch_frame(self, kind: str, frame: str):
+        """Call the notification or command callback"""
+        callback = (
+            self.notification_callback if kind == NOTIFICATION else self.command_callback
+        )
+        if callback is None:
+            logger.error(f"{kind} reception callback is None")
+            return
+        try:
+            callback(frame)
+        except Exception as e:
+            logger.error(f"Error in {kind} reception callback: {e}")
+
+    def get_counters(self) -> dict:
+        """Return link and parser counters"""
+        counters = dict(self.counters)
+        counters.update(self.parser.counters)
+        counters["connected"] = self.connected
+        counters["reconnect_delay_in_secs"] = self.reconnect_delay_in_secs
+        return counters
+
     def set_notification_reception_callback(self, callback: callable):
         """Set Serial notification reception callback"""
         self.notification_callback = callback
@@ -135,7 +124,7 @@ class AlimeloSerialCom(threading.Thread):
                 parity=serial.PARITY_NONE,
                 stopbits=serial.STOPBITS_ONE,
                 bytesize=serial.EIGHTBITS,
-                timeout=0,
+                timeout=self.read_timeout_in_secs,
             )
             self.serial.flushInput()
             self.serial.flushOutput()
@@ -151,33 +140,43 @@ class AlimeloSerialCom(threading.Thread):
             logger.info("Connected to: " + self.serial.portstr)
 
     def restart_serial_connection(self):
-        """Restart serial connection"""
-        # Sleep time
-        time.sleep(self.conn_restart_timeout_in_secs)
+        """Restart serial connection, the delay doubles after each failure"""
+        time.sleep(self.reconnect_delay_in_secs)
+        self.reconnect_delay_in_secs = min(
+            self.reconnect_delay_in_secs * 2, self.reconnect_max_delay_in_secs
+        )
         logger.error("Restarting serial connection")
-        try:
-            self.connected = False
-            self.serial.close()
-        except (
-            serial.SerialException,
-            AttributeError,
-        ) as e:
-            logger.error("Exception in serial connection")
-            logger.error(e)
-        self.setup_serial_communication()
+        self.counters["reconnections"] += 1
+        with self.serial_lock:
+            try:
+                self.connected = False
+                self.serial.close()
+            except (
+                serial.SerialException,
+                AttributeError,
+            ) as e:
+                logger.error("Exception in serial connection")
+                logger.error(e)
+            self.parser.reset()
+            self.setup_serial_communication()
 
     def send_data_to_live_objects(self, data_to_send: str):
         """Send data to liveobjects"""
         logger.info(f"Sending data to liveobjects: {data_to_send}")
-        try:
-            if self.connected:
-                self.serial.write(data_to_send.encode())
-            else:
-                logger.error("Serial connection is down")
-        except (
-            serial.SerialException,
-            AttributeError,
-        ) as e:
-            logger.error("Exception in serial connection")
-            logger.error(e)
-            self.restart_serial_connection()
+        data = data_to_send.encode()
+        with self.serial_lock:
+            try:
+                if self.connected:
+                    self.serial.write(data)
+                    self.counters["bytes_sent"] += len(data)
+                else:
+                    logger.error("Serial connection is down")
+            except (
+                serial.SerialException,
+                AttributeError,
+            ) as e:
+                logger.error("Exception in serial connection")
+                logger.error(e)
+                # The reader thread restarts the connection
+                self.connected = False
+                self.counters["connection_errors"] += 1
@@ -1,2 +1,3 @@
 """Box interface (SSH) package"""
 from .service import SshClient as box_ssh_interface
+from .pool import SshConnectionPool as box_ssh_connection_pool
@@ -0,0 +1,190 @@
+"""
+SSH connection pool service
+"""
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from .service import SshClient
+from server.common import ServerBoxException, ErrorCode
+
+logger = logging.getLogger(__name__)
+
+
+class SshConnectionPool:
+    """Thread safe pool of long-lived authenticated SSH sessions to a host"""
+
+    def __init__(
+        self,
+        host: str,
+        port: int = 22,
+        user: str = None,
+        password: str = None,
+        timeout_in_secs: float = 5,
+        max_sessions: int = 2,
+        idle_timeout_in_secs: float = 120,
+    ):
+        self.host = host
+        self.port = port
+        self.user = user
+        self.password = password
+        self.timeout_in_secs = timeout_in_secs
+        self.max_sessions = max_sessions
+        self.idle_timeout_in_secs = idle_timeout_in_secs
+
+        # Idle sessions, most recently used at the end: [(SshClient, last_used)]
+        self._idle_sessions = []
+        self._sessions_in_use = 0
+        self._condition = threading.Condition()
+
+        # Pool metrics
+        self._metrics = {
+            "sessions_created": 0,
+            "sessions_reused": 0,
+            "sessions_closed_idle": 0,
+            "sessions_closed_unhealthy": 0,
+            "reconnections": 0,
+            "acquire_waits": 0,
+            "acquire_timeouts": 0,
+        }
+
+    def create_session(self) -> SshClient:
+        """Create a new authenticated ssh session"""
+        client = SshClient(
+            host=self.host,
+            port=self.port,
+            user=self.user,
+            password=self.password,
+            timeout_in_secs=self.timeout_in_secs,
+        )
+        if client.connection is None:
+            raise ServerBoxException(ErrorCode.SSH_CONNECTION_ERROR)
+        # Open the session now so that the handshake is not paid by the first command
+        client.open()
+        with self._condition:
+            self._metrics["sessions_created"] += 1
+        logger.info(f"SSH session created with host: {self.host}")
+        return client
+
+    def acquire(self) -> SshClient:
+        """Get a healthy session from the pool, create it if needed"""
+        deadline = time.monotonic() + self.timeout_in_secs
+        with self._condition:
+            while True:
+                self._close_idle_sessions()
+
+                # Reuse the most recently used idle session
+                while self._idle_sessions:
+                    client, _ = self._idle_sessions.pop()
+                    if client.is_alive():
+                        self._sessions_in_use += 1
+                        self._metrics["sessions_reused"] += 1
+                        return client
+                    logger.info("Discarding unhealthy SSH session")
+                    self._metrics["sessions_closed_unhealthy"] += 1
+                    self._close_quietly(client)
+
+                # Open a new session if the pool is not full
+                if self._sessions_in_use < self.max_sessions:
+                    self._sessions_in_use += 1
+                    break
+
+                # Wait for a session to be released
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._metrics["acquire_timeouts"] += 1
+                    logger.error("Timeout waiting for a free SSH session")
+                    raise ServerBoxException(ErrorCode.SSH_CONNECTION_ERROR)
+                self._metrics["acquire_waits"] += 1
+                self._condition.wait(remaining)
+
+        # Handshake outside the lock, other threads can keep using the pool
+        try:
+            return self.create_session()
+        except Exception:
+            with self._condition:
+                self._sessions_in_use -= 1
+                self._condition.notify()
+            raise
+
+    def release(self, client: SshClient, broken: bool = False):
+        """Give a session back to the pool, close it if broken"""
+        with self._condition:
+            self._sessions_in_use -= 1
+            if broken or not client.is_alive():
+                self._metrics["sessions_closed_unhealthy"] += 1
+                self._close_quietly(client)
+            else:
+                self._idle_sessions.append((client, time.monotonic()))
+            self._condition.notify()
+
+    def reconnect(self, client: SshClient) -> SshClient:
+        """Replace a broken session by a new one keeping the pool slot"""
+        with self._condition:
+            self._metrics["reconnections"] += 1
+        self._close_quietly(client)
+        return self.create_session()
+
+    @contextmanager
+    def session(self):
+        """Context manager that borrows a session from the pool"""
+        holder = [self.acquire()]
+        try:
+            yield _PooledSession(self, holder)
+        finally:
+            self.release(holder[0])
+
+    def close_all(self):
+        """Close all the idle sessions"""
+        with self._condition:
+            while self._idle_sessions:
+                client, _ = self._idle_sessions.pop()
+                self._close_quietly(client)
+
+    def get_metrics(self) -> dict:
+        """Return pool usage metrics"""
+        with self._condition:
+            metrics = dict(self._metrics)
+            metrics["max_sessions"] = self.max_sessions
+            metrics["sessions_in_use"] = self._sessions_in_use
+            metrics["sessions_idle"] = len(self._idle_sessions)
+        return metrics
+
+    def _close_idle_sessions(self):
+        """Close the sessions unused for more than the idle timeout (lock must be held)"""
+        expiration = time.monotonic() - self.idle_timeout_in_secs
+        still_idle = []
+        for client, last_used in self._idle_sessions:
+            if last_used < expiration:
+                logger.info("Closing idle SSH session")
+                self._metrics["sessions_closed_idle"] += 1
+                self._close_quietly(client)
+            else:
+                still_idle.append((client, last_used))
+        self._idle_sessions = still_idle
+
+    def _close_quietly(self, client: SshClient):
+        """Close session ignoring errors"""
+        try:
+            client.close()
+        except ServerBoxException:
+            pass
+
+
+class _PooledSession:
+    """Session borrowed from the pool, reconnects once if the command fails"""
+
+    def __init__(self, pool: SshConnectionPool, holder: list):
+        self._pool = pool
+        self._holder = holder
+
+    def send_command(self, command: str) -> str:
+        """Send command to SSH host, retry on a fresh session if the session is broken"""
+        try:
+            return self._holder[0].send_command(command)
+        except ServerBoxException:
+            if self._holder[0].is_alive():
+                raise
+            logger.info("SSH session lost, reconnecting")
+            self._holder[0] = self._pool.reconnect(self._holder[0])
+            return self._holder[0].send_command(command)
@@ -46,6 +46,27 @@ class SshClient:
 
         return connection
 
+    def open(self):
+        """Open the ssh session (TCP connection and authentication)"""
+        try:
+            if not self.connection:
+                logger.error("SSH connection not stablished")
+                raise ServerBoxException(ErrorCode.SSH_CONNECTION_ERROR)
+            self.connection.open()
+        except ServerBoxException:
+            raise
+        except Exception as e:
+            logger.error(e)
+            raise ServerBoxException(ErrorCode.SSH_CONNECTION_ERROR)
+        logger.debug("SSH connection opened with host: %s", self.host)
+
+    def is_alive(self) -> bool:
+        """Check if the ssh session transport is still active"""
+        try:
+            return self.connection is not None and self.connection.is_connected
+        except Exception:
+            return False
+
     def close(self):
         try:
             if not self.connection:
@@ -55,7 +76,7 @@ class SshClient:
         except Exception:
             logger.error("Error in SSH connection")
             raise ServerBoxException(ErrorCode.SSH_CONNECTION_ERROR)
-        logger.debug(f"SSH connection closed with host: %s", self.host)
+        logger.debug("SSH connection closed with host: %s", self.host)
 
 
     def send_command(self, command: str) -> str:
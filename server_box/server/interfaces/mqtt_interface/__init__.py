@@ -4,3 +4,7 @@
 
 from .client import MQTTClient as mqtt_client_interface
 from .model import SingleRelayStatus, RelaysStatus
+from .topic_trie import TopicTrie
+from .dispatcher import MessageDispatcher
+from .supervisor import ConnectionSupervisor
+from .codec import serialize, deserialize
@@ -0,0 +1,103 @@
+"""
+MQTT payloads codec, an encoder and a decoder per message type. The
+payloads stay JSON, orjson is used when installed
+"""
+import json
+import logging
+from typing import Any
+from .model import Msg, SingleRelayStatus, RelaysStatus, parse_timestamp
+
+logger = logging.getLogger(__name__)
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def dumps(data: Any) -> bytes:
+    """Encode data in JSON"""
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, separators=(",", ":")).encode()
+
+
+def loads(payload: bytes) -> Any:
+    """Decode JSON payload"""
+    if orjson is not None:
+        return orjson.loads(payload)
+    return json.loads(payload)
+
+
+# Encoders
+def encode_relays_status(msg: RelaysStatus) -> dict:
+    """Return RelaysStatus json dict"""
+    relays_mask, status_mask, powered_mask = msg.relays_mask, msg.status_mask, msg.powered_mask
+    return {
+        "relay_statuses": [
+            {
+                "relay_number": relay_number,
+                "status": status_mask >> relay_number & 1 == 1,
+                "powered": powered_mask >> relay_number & 1 == 1,
+            }
+            for relay_number in range(relays_mask.bit_length())
+            if relays_mask >> relay_number & 1
+        ],
+        "timestamp": msg.timestamp.isoformat(),
+        "command": msg.command,
+    }
+
+
+def encode_single_relay_status(msg: SingleRelayStatus) -> dict:
+    """Return SingleRelayStatus json dict"""
+    return {"relay_number": msg.relay_number, "status": msg.status, "powered": msg.powered}
+
+
+# Decoders
+def decode_relays_status(data: dict) -> RelaysStatus:
+    """Return RelaysStatus from json dict, without intermediate relay objects"""
+    relays_mask = status_mask = powered_mask = 0
+    for relay in data["relay_statuses"]:
+        bit = 1 << relay["relay_number"]
+        relays_mask |= bit
+        if relay["status"]:
+            status_mask |= bit
+        if relay["powered"]:
+            powered_mask |= bit
+    return RelaysStatus.from_masks(
+        relays_mask,
+        status_mask,
+        powered_mask,
+        command=data["command"],
+        timestamp=parse_timestamp(data["timestamp"]),
+    )
+
+
+# {message type: encoder}
+ENCODERS = {
+    dict: lambda msg: msg,
+    RelaysStatus: encode_relays_status,
+    SingleRelayStatus: encode_single_relay_status,
+}
+
+# [(discriminating key, decoder)], payloads without known key are kept as dict
+DECODERS = [
+    ("relay_statuses", decode_relays_status),
+]
+
+
+def serialize(msg: Msg) -> bytes:
+    """Serialize MQTT message"""
+    encoder = ENCODERS.get(type(msg))
+    data = encoder(msg) if encoder is not None else msg.to_json()
+    return dumps(data)
+
+
+def deserialize(payload: bytes) -> Msg:
+    """Deserialize MQTT message"""
+    data = loads(payload)
+    if isinstance(data, dict):
+        for key, decoder in DECODERS:
+            if key in data:
+                return decoder(data)
+    return data
@@ -0,0 +1,88 @@
+"""
+MQTT messages dispatcher, runs the callbacks out of the paho network thread
+"""
+import logging
+import queue
+import threading
+import time
+from typing import Callable, Iterable, List
+from server.common.executor import KeyedExecutor
+from .topic_trie import TopicTrie
+
+logger = logging.getLogger(__name__)
+
+# Lower value is handled first
+PRIORITY_TOPIC = 0
+DEFAULT_PRIORITY = 1
+
+
+class MessageDispatcher:
+    """
+    Hand the received messages to a bounded worker pool. Messages of the
+    same topic are handled in reception order, the messages of the
+    priority topic filters are handled first
+    """
+
+    def __init__(
+        self,
+        max_workers: int,
+        max_queue_size: int,
+        priority_topics: Iterable[str] = None,
+        name: str = "MQTTDispatcher",
+    ):
+        self.executor = KeyedExecutor(
+            max_workers=max_workers, max_queue_size=max_queue_size, name=name
+        )
+        self._priority_topics = TopicTrie()
+        for topic_filter in priority_topics or []:
+            self._priority_topics.add(topic_filter, PRIORITY_TOPIC)
+        self._lock = threading.Lock()
+        # {topic: {"handled", "failed", "total_latency_in_secs", "max_latency_in_secs"}}
+        self._topics_stats = {}
+        self.dropped = 0
+
+    def dispatch(self, topic: str, callbacks: List[Callable], msg):
+        """Queue the message callbacks, called by the network thread"""
+        priority = PRIORITY_TOPIC if self._priority_topics.match(topic) else DEFAULT_PRIORITY
+        try:
+            self.executor.submit(topic, self._handle, topic, callbacks, msg, priority=priority)
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+            logger.error(f"MQTT dispatcher queue full, message on {topic} dropped")
+
+    def _handle(self, topic: str, callbacks: List[Callable], msg):
+        """Run the message callbacks in a worker"""
+        start = time.monotonic()
+        failed = False
+        for callback in callbacks:
+            try:
+                callback(msg)
+            except Exception as e:
+                failed = True
+                logger.exception(f"Message processing failed on topic {topic}: {e}")
+        latency = time.monotonic() - start
+
+        with self._lock:
+            stats = self._topics_stats.setdefault(
+                topic,
+                {"handled": 0, "failed": 0, "total_latency_in_secs": 0.0, "max_latency_in_secs": 0.0},
+            )
+            stats["handled"] += 1
+            stats["failed"] += failed
+            stats["total_latency_in_secs"] += latency
+            stats["max_latency_in_secs"] = max(stats["max_latency_in_secs"], latency)
+
+    def get_metrics(self) -> dict:
+        """Return queue metrics and handlers latency per topic"""
+        with self._lock:
+            topics = {}
+            for topic, stats in self._topics_stats.items():
+                topics[topic] = {
+                    "handled": stats["handled"],
+                    "failed": stats["failed"],
+                    "avg_latency_in_secs": stats["total_latency_in_secs"] / stats["handled"],
+                    "max_latency_in_secs": stats["max_latency_in_secs"],
+                }
+            dropped = self.dropped
+        return {"dropped": dropped, "topics": topics, "executor": self.executor.get_metrics()}
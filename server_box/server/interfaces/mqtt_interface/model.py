@@ -2,38 +2,31 @@
 MQTT messages model
 """
 
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Iterable, TypeVar
-import json
+from typing import Iterable, Iterator, Optional, Tuple, TypeVar
 import dateutil.parser
 
 Msg = TypeVar("Msg")
 
 
-def serialize(msg: Msg) -> bytes:
-    """serialize MQTT message"""
-    if type(msg) is dict:
-        data_to_send = msg
-    else:
-        data_to_send = msg.to_json()
-    return json.dumps(data_to_send)
+def parse_timestamp(timestamp: str) -> datetime:
+    """Parse ISO 8601 timestamp, dateutil only for the formats unknown to datetime"""
+    try:
+        return datetime.fromisoformat(timestamp)
+    except ValueError:
+        return dateutil.parser.isoparse(timestamp)
 
 
-def deserialize(payload: bytes) -> Msg:
-    """deserialize MQTT message"""
-    # TODO: review for other messages
-    data = json.loads(payload)
-    if "relay_statuses" in data:
-        return RelaysStatus.from_json(data)
-    else:
-        return data
+@dataclass(frozen=True)
+class SingleRelayStatus:
+    """Single relay status, immutable"""
 
+    __slots__ = ("relay_number", "status", "powered")
 
-class SingleRelayStatus:
-    def __init__(self, relay_number: int, status: bool, powered: bool):
-        self.relay_number = relay_number
-        self.status = status
-        self.powered = powered
+    relay_number: int
+    status: bool
+    powered: bool
 
     def __str__(self):
         """String representation of the SingleRelayStatus instance"""
@@ -55,12 +48,130 @@ class SingleRelayStatus:
 
 
 class RelaysStatus:
+    """
+    Relays status snapshot, immutable so it can be shared between threads.
+    The relays are stored in bitmasks indexed by relay number
+    """
+
+    __slots__ = (
+        "relays_mask",
+        "status_mask",
+        "powered_mask",
+        "command",
+        "timestamp",
+        "_relay_statuses",
+    )
+
     def __init__(
         self, relay_statuses: Iterable[SingleRelayStatus], command: bool, timestamp: datetime = None
     ):
-        self.relay_statuses = relay_statuses
-        self.command = command
-        self.timestamp = datetime.now() if timestamp is None else timestamp
+        relays_mask = status_mask = powered_mask = 0
+        for relay_status in relay_statuses:
+            bit = 1 << relay_status.relay_number
+            relays_mask |= bit
+            if relay_status.status:
+                status_mask |= bit
+            if relay_status.powered:
+                powered_mask |= bit
+        self._set(relays_mask, status_mask, powered_mask, command, timestamp)
+
+    @classmethod
+    def from_masks(
+        cls,
+        relays_mask: int,
+        status_mask: int,
+        powered_mask: int,
+        command: bool,
+        timestamp: datetime = None,
+    ) -> "RelaysStatus":
+        """Return RelaysStatus instance from relays bitmasks"""
+        relays_status = cls.__new__(cls)
+        relays_status._set(relays_mask, status_mask, powered_mask, command, timestamp)
+        return relays_status
+
+    def _set(self, relays_mask, status_mask, powered_mask, command, timestamp):
+        """Initialize the slots, only at creation"""
+        object.__setattr__(self, "relays_mask", relays_mask)
+        object.__setattr__(self, "status_mask", status_mask & relays_mask)
+        object.__setattr__(self, "powered_mask", powered_mask & relays_mask)
+        object.__setattr__(self, "command", command)
+        object.__setattr__(self, "timestamp", datetime.now() if timestamp is None else timestamp)
+        object.__setattr__(self, "_relay_statuses", None)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"RelaysStatus is immutable, cannot set {name}")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"RelaysStatus is immutable, cannot delete {name}")
+
+    def _key(self) -> tuple:
+        return (self.relays_mask, self.status_mask, self.powered_mask, self.command, self.timestamp)
+
+    def __eq__(self, other):
+        if not isinstance(other, RelaysStatus):
+            return NotImplemented
+        return self._key() == other._key()
+
+    def __hash__(self):
+        return hash(self._key())
+
+    def relay_numbers(self) -> Iterator[int]:
+        """Iterate over the relay numbers in ascending order"""
+        relays_mask = self.relays_mask
+        return (
+            relay_number
+            for relay_number in range(relays_mask.bit_length())
+            if relays_mask >> relay_number & 1
+        )
+
+    @property
+    def relay_statuses(self) -> Tuple[SingleRelayStatus, ...]:
+        """Relays statuses by ascending relay number, built on first access"""
+        relay_statuses = self._relay_statuses
+        if relay_statuses is None:
+            relay_statuses = tuple(
+                SingleRelayStatus(
+                    relay_number,
+                    bool(self.status_mask >> relay_number & 1),
+                    bool(self.powered_mask >> relay_number & 1),
+                )
+                for relay_number in self.relay_numbers()
+            )
+            object.__setattr__(self, "_relay_statuses", relay_statuses)
+        return relay_statuses
+
+    def get(self, relay_number: int) -> Optional[SingleRelayStatus]:
+        """Return the relay status, None if the relay is unknown"""
+        if relay_number < 0 or not self.relays_mask >> relay_number & 1:
+            return None
+        return SingleRelayStatus(
+            relay_number,
+            bool(self.status_mask >> relay_number & 1),
+            bool(self.powered_mask >> relay_number & 1),
+        )
+
+    def with_relay(
+        self, relay_number: int, status: bool, powered: bool = None, timestamp: datetime = None
+    ) -> "RelaysStatus":
+        """Return a copy with a relay status changed, powered is kept if None"""
+        bit = 1 << relay_number
+        status_mask = self.status_mask | bit if status else self.status_mask & ~bit
+        powered_mask = self.powered_mask
+        if powered is not None:
+            powered_mask = powered_mask | bit if powered else powered_mask & ~bit
+        return RelaysStatus.from_masks(
+            self.relays_mask | bit,
+            status_mask,
+            powered_mask,
+            self.command,
+            self.timestamp if timestamp is None else timestamp,
+        )
+
+    def with_timestamp(self, timestamp: datetime) -> "RelaysStatus":
+        """Return a copy with another timestamp"""
+        return RelaysStatus.from_masks(
+            self.relays_mask, self.status_mask, self.powered_mask, self.command, timestamp
+        )
 
     def __str__(self):
         """String representation of the RelaysStatus instance"""
@@ -88,5 +199,5 @@ class RelaysStatus:
                 for single_relay_dict in dictionary["relay_statuses"]
             ],
             command=dictionary["command"],
-            timestamp=dateutil.parser.isoparse(dictionary["timestamp"]),
+            timestamp=parse_timestamp(dictionary["timestamp"]),
         )
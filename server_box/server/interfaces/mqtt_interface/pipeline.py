@@ -0,0 +1,236 @@
+"""
+MQTT publish pipeline, publishes without waiting for the PUBACK of the
+previous messages
+"""
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+import paho.mqtt.client as mqtt
+
+logger = logging.getLogger(__name__)
+
+# Period of the acknowledgment timeouts check
+SWEEP_PERIOD_IN_SECS = 0.5
+
+
+class _Publication:
+    """Message waiting for publication or acknowledgment"""
+
+    __slots__ = ("topic", "payload", "qos", "future", "attempts", "published_at", "late")
+
+    def __init__(self, topic: str, payload: bytes, qos: int):
+        self.topic = topic
+        self.payload = payload
+        self.qos = qos
+        self.future = Future()
+        self.attempts = 0
+        self.published_at = None
+        self.late = False
+
+
+class PublishPipeline:
+    """
+    Publish messages in a window of max_in_flight unacknowledged messages.
+    The messages exceeding the window or published while disconnected wait
+    in a bounded queue, a queued message can be cancelled with its future.
+    A message accepted by paho is never published again: paho keeps it and
+    sends it again on reconnection, a late acknowledgment is only counted.
+    A message refused by paho is queued again until max_attempts
+    """
+
+    def __init__(
+        self,
+        client: mqtt.Client,
+        max_in_flight: int,
+        max_queue_size: int,
+        ack_timeout_in_secs: float,
+        max_attempts: int,
+    ):
+        self.client = client
+        self.max_in_flight = max_in_flight
+        self.max_queue_size = max_queue_size
+        self.ack_timeout_in_secs = ack_timeout_in_secs
+        self.max_attempts = max_attempts
+
+        self._lock = threading.Lock()
+        self._queue = deque()
+        # {mid: _Publication}
+        self._in_flight = {}
+        # {mid: received_at} acknowledgments received before the publication was registered
+        self._early_acks = {}
+        # Messages are kept in the queue while disconnected
+        self._paused = True
+        self.counters = {
+            "submitted": 0,
+            "acknowledged": 0,
+            "retried": 0,
+            "late": 0,
+            "cancelled": 0,
+            "failed": 0,
+            "rejected": 0,
+            "max_in_flight": 0,
+            "max_queue_depth": 0,
+        }
+
+        self._sweeper = threading.Thread(
+            target=self._sweep, name="MQTTPublishSweeper", daemon=True
+        )
+        self._sweeper.start()
+
+    def submit(self, topic: str, payload: bytes, qos: int) -> Future:
+        """Queue a message, the future result is True once acknowledged"""
+        publication = _Publication(topic, payload, qos)
+        with self._lock:
+            self.counters["submitted"] += 1
+            if len(self._queue) >= self.max_queue_size:
+                # Make room, the callers stopped waiting for the cancelled messages
+                queue = deque(p for p in self._queue if not p.future.cancelled())
+                self.counters["cancelled"] += len(self._queue) - len(queue)
+                self._queue = queue
+            if len(self._queue) >= self.max_queue_size:
+                self.counters["rejected"] += 1
+                logger.error(f"MQTT publish queue full, message to {topic} rejected")
+                publication.future.set_result(False)
+                return publication.future
+            self._queue.append(publication)
+            self.counters["max_queue_depth"] = max(
+                self.counters["max_queue_depth"], len(self._queue)
+            )
+        self._pump()
+        return publication.future
+
+    def on_publish(self, mid: int):
+        """Acknowledgment callback, called by the network thread"""
+        with self._lock:
+            publication = self._in_flight.pop(mid, None)
+            if publication is None:
+                self._early_acks[mid] = time.monotonic()
+                return
+            self.counters["acknowledged"] += 1
+        publication.future.set_result(True)
+        self._pump()
+
+    def pause(self):
+        """Keep the new messages in the queue, on disconnection"""
+        with self._lock:
+            self._paused = True
+
+    def resume(self):
+        """Publish the queued messages, on connection"""
+        with self._lock:
+            self._paused = False
+        self._pump()
+
+    def get_metrics(self) -> dict:
+        """Return the pipeline counters"""
+        with self._lock:
+            metrics = dict(self.counters)
+            metrics["in_flight"] = len(self._in_flight)
+            metrics["queue_depth"] = len(self._queue)
+            metrics["paused"] = self._paused
+        return metrics
+
+    def _pump(self):
+        """Publish queued messages while the window is not full"""
+        while True:
+            with self._lock:
+                if (
+                    self._paused
+                    or not self._queue
+                    or len(self._in_flight) >= self.max_in_flight
+                ):
+                    return
+                publication = self._queue.popleft()
+                # A cancelled message is dropped, a running one can no longer be cancelled
+                if (
+                    publication.attempts == 0
+                    and not publication.future.set_running_or_notify_cancel()
+                ):
+                    self.counters["cancelled"] += 1
+                    continue
+                # Keep the slot until the mid is known
+                slot = object()
+                self._in_flight[slot] = publication
+
+            # Publish outside the lock, paho calls on_publish holding its own locks
+            publication.attempts += 1
+            publication.published_at = time.monotonic()
+            try:
+                info = self.client.publish(
+                    publication.topic, publication.payload, publication.qos
+                )
+                rc, mid = info.rc, info.mid
+            except (ValueError, RuntimeError) as e:
+                logger.error(f"Error publishing on topic {publication.topic}: {e}")
+                rc, mid = mqtt.MQTT_ERR_UNKNOWN, None
+
+            with self._lock:
+                del self._in_flight[slot]
+                # QoS>0 messages published while disconnected are sent by paho on reconnection
+                accepted = rc == mqtt.MQTT_ERR_SUCCESS or (
+                    rc == mqtt.MQTT_ERR_NO_CONN and publication.qos > 0
+                )
+                if accepted and self._early_acks.pop(mid, None) is not None:
+                    self.counters["acknowledged"] += 1
+                    acknowledged = True
+                else:
+                    acknowledged = False
+                    if accepted:
+                        self._in_flight[mid] = publication
+                        self.counters["max_in_flight"] = max(
+                            self.counters["max_in_flight"], len(self._in_flight)
+                        )
+
+            if acknowledged:
+                publication.future.set_result(True)
+            elif not accepted:
+                logger.error(f"Publish on topic {publication.topic} refused rc: {rc}")
+                self._retry_or_fail(publication)
+                return
+
+    def _retry_or_fail(self, publication: _Publication):
+        """Queue the message again, resolve it as failed after max attempts"""
+        with self._lock:
+            if publication.attempts < self.max_attempts:
+                self.counters["retried"] += 1
+                # Retried before the newer messages
+                self._queue.appendleft(publication)
+                return
+            self.counters["failed"] += 1
+        logger.error(f"Message to {publication.topic} not published after {publication.attempts} attempts")
+        publication.future.set_result(False)
+
+    def _sweep(self):
+        """Count the messages not acknowledged in time, forget the stale early acks"""
+        while True:
+            time.sleep(SWEEP_PERIOD_IN_SECS)
+            self.sweep(time.monotonic())
+            # Retry the refused messages
+            self._pump()
+
+    def sweep(self, now: float):
+        """
+        Report the messages not acknowledged in time. They stay in flight
+        under their mid, publishing them again would duplicate them
+        """
+        deadline = now - self.ack_timeout_in_secs
+        with self._lock:
+            # Acknowledgments never matched by a publication, mids are reused
+            for mid, received_at in list(self._early_acks.items()):
+                if now - received_at > SWEEP_PERIOD_IN_SECS:
+                    del self._early_acks[mid]
+
+            late = [
+                publication
+                for mid, publication in self._in_flight.items()
+                if isinstance(mid, int)
+                and not publication.late
+                and publication.published_at < deadline
+            ]
+            for publication in late:
+                publication.late = True
+                self.counters["late"] += 1
+        for publication in late:
+            logger.warning(f"Message to {publication.topic} not acknowledged in time")
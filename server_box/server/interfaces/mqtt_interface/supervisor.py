@@ -0,0 +1,116 @@
+"""
+MQTT connection supervisor, runs the paho network loop and reconnects to
+the broker in background
+"""
+import logging
+import random
+import threading
+from typing import Callable
+import paho.mqtt.client as mqtt
+
+logger = logging.getLogger(__name__)
+
+# Network loop wait for socket activity
+LOOP_TIMEOUT_IN_SECS = 1.0
+
+
+class ConnectionSupervisor:
+    """
+    Dedicated network thread. The broker connection is opened and restored
+    with a jittered exponential backoff, the callers never wait for it
+    """
+
+    def __init__(
+        self,
+        client: mqtt.Client,
+        connect: Callable[[], None],
+        min_delay_in_secs: float,
+        max_delay_in_secs: float,
+        name: str = "MQTTSupervisor",
+    ):
+        self.client = client
+        self.connect = connect
+        self.min_delay_in_secs = min_delay_in_secs
+        self.max_delay_in_secs = max_delay_in_secs
+        self.delay_in_secs = min_delay_in_secs
+        self.connected = False
+        self._state_callbacks = []
+        self._condition = threading.Condition()
+        self._stopped = threading.Event()
+        self.counters = {"connection_attempts": 0, "connections": 0, "disconnections": 0}
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+
+    def start(self):
+        """Start the network thread"""
+        self._thread.start()
+
+    def stop(self):
+        """Stop the network thread"""
+        self._stopped.set()
+
+    def add_state_callback(self, callback: Callable[[bool], None]):
+        """Add a callback(connected) called on connection and disconnection"""
+        self._state_callbacks.append(callback)
+
+    def wait_for_connection(self, timeout_in_secs: float = None) -> bool:
+        """Wait until connected, return the connection status"""
+        with self._condition:
+            return self._condition.wait_for(lambda: self.connected, timeout_in_secs)
+
+    def set_connected(self, connected: bool):
+        """Connection state change, called from the paho callbacks"""
+        with self._condition:
+            if connected == self.connected:
+                return
+            self.connected = connected
+            if connected:
+                self.counters["connections"] += 1
+                # A successful connection resets the backoff
+                self.delay_in_secs = self.min_delay_in_secs
+            else:
+                self.counters["disconnections"] += 1
+            self._condition.notify_all()
+
+        for callback in self._state_callbacks:
+            try:
+                callback(connected)
+            except Exception as e:
+                logger.error(f"Error in MQTT connection state callback: {e}")
+
+    def get_metrics(self) -> dict:
+        """Return connection state and counters"""
+        with self._condition:
+            metrics = dict(self.counters)
+            metrics["connected"] = self.connected
+            metrics["reconnection_delay_in_secs"] = self.delay_in_secs
+        return metrics
+
+    def _run(self):
+        """Network loop"""
+        while not self._stopped.is_set():
+            self.counters["connection_attempts"] += 1
+            try:
+                self.connect()
+            except (OSError, ValueError) as e:
+                logger.error(f"Connection to broker unsuccessful: {e}")
+                self._backoff()
+                continue
+
+            # Process the network traffic until the connection is lost
+            rc = mqtt.MQTT_ERR_SUCCESS
+            while rc == mqtt.MQTT_ERR_SUCCESS and not self._stopped.is_set():
+                rc = self.client.loop(timeout=LOOP_TIMEOUT_IN_SECS)
+            self.set_connected(False)
+            if not self._stopped.is_set():
+                logger.error(f"Connection to broker lost rc: {rc}")
+                self._backoff()
+
+    def _backoff(self):
+        """Wait before the next attempt, the delay doubles up to the max"""
+        with self._condition:
+            delay = self.delay_in_secs
+            self.delay_in_secs = min(self.delay_in_secs * 2, self.max_delay_in_secs)
+        # Jitter spreads the reconnections of the clients after a broker restart
+        delay = random.uniform(delay / 2, delay)
+        logger.info(f"Reconnecting to broker in {delay:.1f}s")
+        self._stopped.wait(delay)
@@ -0,0 +1,118 @@
+"""
+MQTT topic filters trie, matches a topic against the subscribed filters
+with the + and # wildcards
+"""
+import logging
+import threading
+from typing import Callable, List
+
+logger = logging.getLogger(__name__)
+
+SINGLE_LEVEL = "+"
+MULTI_LEVEL = "#"
+
+
+class _Node:
+    """Topic level node"""
+
+    __slots__ = ("children", "handlers")
+
+    def __init__(self):
+        self.children = {}
+        self.handlers = []
+
+
+def validate_filter(topic_filter: str):
+    """Raise ValueError if the topic filter is not valid"""
+    if not topic_filter:
+        raise ValueError("Empty topic filter")
+    levels = topic_filter.split("/")
+    for idx, level in enumerate(levels):
+        if MULTI_LEVEL in level and (level != MULTI_LEVEL or idx != len(levels) - 1):
+            raise ValueError(f"# must be the last level of {topic_filter}")
+        if SINGLE_LEVEL in level and level != SINGLE_LEVEL:
+            raise ValueError(f"+ must be a whole level of {topic_filter}")
+
+
+class TopicTrie:
+    """
+    Subscriptions by topic filter, several handlers per filter. A topic is
+    matched level by level, in O(depth) for filters without wildcards
+    """
+
+    def __init__(self):
+        self._root = _Node()
+        self._filters = {}
+        self._lock = threading.Lock()
+
+    def add(self, topic_filter: str, handler: Callable):
+        """Add a handler for topic filter, return True if the filter is new"""
+        validate_filter(topic_filter)
+        with self._lock:
+            node = self._root
+            for level in topic_filter.split("/"):
+                node = node.children.setdefault(level, _Node())
+            if handler not in node.handlers:
+                # Copy on write, a matching in progress keeps the old list
+                node.handlers = node.handlers + [handler]
+            new_filter = topic_filter not in self._filters
+            self._filters[topic_filter] = node
+            return new_filter
+
+    def remove(self, topic_filter: str, handler: Callable = None):
+        """Remove a handler, or all the handlers, of topic filter"""
+        with self._lock:
+            node = self._filters.get(topic_filter)
+            if node is None:
+                return
+            if handler is None:
+                node.handlers = []
+            else:
+                node.handlers = [h for h in node.handlers if h != handler]
+            if not node.handlers:
+                del self._filters[topic_filter]
+                self._prune(topic_filter)
+
+    def match(self, topic: str) -> List[Callable]:
+        """Return the handlers of the filters matching topic"""
+        levels = topic.split("/")
+        handlers = []
+        with self._lock:
+            # (node, index of the next level)
+            stack = [(self._root, 0)]
+            while stack:
+                node, idx = stack.pop()
+                # Topics starting with $ are not matched by a first level wildcard
+                wildcards = not (idx == 0 and topic.startswith("$"))
+
+                multi_level = node.children.get(MULTI_LEVEL)
+                if multi_level is not None and wildcards:
+                    handlers.extend(multi_level.handlers)
+
+                if idx == len(levels):
+                    handlers.extend(node.handlers)
+                    continue
+
+                child = node.children.get(levels[idx])
+                if child is not None:
+                    stack.append((child, idx + 1))
+                single_level = node.children.get(SINGLE_LEVEL)
+                if single_level is not None and wildcards:
+                    stack.append((single_level, idx + 1))
+        return handlers
+
+    def get_filters(self) -> List[str]:
+        """Return the subscribed topic filters"""
+        with self._lock:
+            return list(self._filters)
+
+    def _prune(self, topic_filter: str):
+        """Remove the nodes left without handlers nor children"""
+        path = [self._root]
+        levels = topic_filter.split("/")
+        for level in levels:
+            path.append(path[-1].children[level])
+        for level, parent, node in zip(reversed(levels), reversed(path[:-1]), reversed(path[1:])):
+            if node.handlers or node.children:
+                break
+            del parent.children[level]
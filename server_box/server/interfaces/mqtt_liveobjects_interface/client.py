@@ -1,10 +1,12 @@
 import logging
 from typing import Callable
-import time
-from socket import error as socket_error
-from socket import timeout as socket_timeout
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
 import paho.mqtt.client as mqtt
 from server.interfaces.mqtt_liveobjects_interface.model import Msg, serialize, deserialize
+from server.interfaces.mqtt_interface.topic_trie import TopicTrie
+from server.interfaces.mqtt_interface.pipeline import PublishPipeline
+from server.interfaces.mqtt_interface.dispatcher import MessageDispatcher
+from server.interfaces.mqtt_interface.supervisor import ConnectionSupervisor
 
 logger = logging.getLogger(__name__)
 
@@ -17,10 +19,16 @@ class MQTTClient:
         broker_address: str,
         client_id: str,
         live_objects_api_key: str = None,
-        subscriptions: dict = {},
+        subscriptions: dict = None,
         qos: int = 1,
-        reconnection_timeout_in_secs: int = 5,
-        max_reconnection_attemps: int = 5,
+        reconnection_min_delay_in_secs: float = 1,
+        reconnection_max_delay_in_secs: float = 60,
+        max_in_flight: int = 20,
+        max_publish_queue_size: int = 100,
+        max_publish_attempts: int = 3,
+        callback_max_workers: int = 2,
+        callback_queue_size: int = 100,
+        priority_topics: list = None,
         publish_timeout_in_secs: int = 5,
         application=False,
     ):
@@ -29,36 +37,49 @@ class MQTTClient:
         self.broker_address = broker_address
         self.client_id = client_id
         self.live_objects_api_key = live_objects_api_key
-        self.subscriptions = subscriptions
         self.qos = qos
-        self._callbacks = {}
+        # Callbacks by topic filter, wildcards allowed, run by the dispatcher workers
+        self._topic_trie = TopicTrie()
+        self.dispatcher = MessageDispatcher(
+            max_workers=callback_max_workers,
+            max_queue_size=callback_queue_size,
+            priority_topics=priority_topics,
+        )
+        for topic, callback in (subscriptions or {}).items():
+            self._topic_trie.add(topic, callback)
         self.connected = False
-        self.reconnection_timeout_in_secs = reconnection_timeout_in_secs
-        self.max_reconnection_attemps = max_reconnection_attemps
         self.publish_timeout_in_secs = publish_timeout_in_secs
 
-        self._client = mqtt.Client(client_id=self.client_id, reconnect_on_failure=True)
+        self._client = mqtt.Client(client_id=self.client_id)
         if live_objects_api_key:
             self._client.username_pw_set(username=self.username, password=self.live_objects_api_key)
 
         self._client.tls_set(certfile=None, keyfile=None)
 
-        def on_connect(client, userdata, flags, rc, qos=1):
+        def on_connect(client, userdata, flags, rc):
             """When connection is established"""
 
+            if rc != mqtt.CONNACK_ACCEPTED:
+                logger.error(f"MQTT Client connection refused rc: {rc}")
+                return
             logger.info("MQTT Client connection established")
-            if len(self.subscriptions) > 0:
-                for topic, callback in self.subscriptions.items():
-                    self.subscribe(topic, callback, qos)
-                    logger.info(f"Subscribed to topic: {topic} qos: {qos}")
+            # Set before the re-subscription, a concurrent subscribe is not missed
             self.connected = True
+            # Subscribe again to the topic filters, the session may be new
+            for topic in self._topic_trie.get_filters():
+                client.subscribe(topic, self.qos)
+                logger.info(f"Subscribed to topic: {topic} qos: {self.qos}")
+            self.publish_pipeline.resume()
+            self.supervisor.set_connected(True)
 
         def on_disconnect(client, userdata, reasonCode):
             """Stop reading and notify upon disconnecting"""
 
             logger.info(f"MQTT Client disconnected reasonCode: {reasonCode}")
             self.connected = False
-            self.loop_stop()
+            # Keep the new messages until reconnection by the supervisor
+            self.publish_pipeline.pause()
+            self.supervisor.set_connected(False)
 
         def on_subscribe(client, userdata, mid, granted_qos):
             """Notify upon subscription"""
@@ -72,20 +93,41 @@ class MQTTClient:
             logger.debug(f"   mid : {message.mid}")
             logger.debug(f"   duplicated : {message.dup}")
             logger.debug(f"   qos : {message.qos}")
-            callback = self._callbacks[message.topic]
-            if callback:
-                try:
-                    msg = deserialize(message.payload)
-                    logger.info(f"Message : {str(msg)}")
-                    callback(msg)
-                except Exception:
-                    logger.error("Message processing failed")
-                    raise
+            callbacks = self._topic_trie.match(message.topic)
+            if not callbacks:
+                logger.warning(f"No callback for topic {message.topic}")
+                return
+            try:
+                msg = deserialize(message.payload)
+            except Exception as e:
+                logger.error(f"Message deserialization failed: {e}")
+                return
+            logger.info(f"Message : {str(msg)}")
+            self.dispatcher.dispatch(message.topic, callbacks, msg)
 
         def on_publish(client, userdata, mid):
             """Notify upon publishing message on queue"""
 
             logger.debug("Message puback received for message mid: %s", str(mid))
+            self.publish_pipeline.on_publish(mid)
+
+        # Publish without waiting for the previous acknowledgments
+        self._client.max_inflight_messages_set(max_in_flight)
+        self.publish_pipeline = PublishPipeline(
+            client=self._client,
+            max_in_flight=max_in_flight,
+            max_queue_size=max_publish_queue_size,
+            ack_timeout_in_secs=publish_timeout_in_secs,
+            max_attempts=max_publish_attempts,
+        )
+
+        # Broker connection restored in background
+        self.supervisor = ConnectionSupervisor(
+            client=self._client,
+            connect=lambda: self._client.connect(self.broker_address, port=8883),
+            min_delay_in_secs=reconnection_min_delay_in_secs,
+            max_delay_in_secs=reconnection_max_delay_in_secs,
+        )
 
         self._client.on_connect = on_connect
         self._client.on_disconnect = on_disconnect
@@ -93,94 +135,83 @@ class MQTTClient:
         self._client.on_message = on_message
         self._client.on_publish = on_publish
 
-    def connect(self, remaining_attempts: int) -> bool:
-        """Connect to broker, retry if connection unsuccessful"""
-        if remaining_attempts > 0:
-            try:
-                self._client.connect(self.broker_address, port=8883)
-                time.sleep(1)
-                return True
-            except (socket_error, socket_timeout):
-                self.connected = False
-                logger.error("Connection to broker unsuccessful")
-                logger.info("Retrying connection ...")
-                time.sleep(self.reconnection_timeout_in_secs)
-                return self.connect(remaining_attempts - 1)
-        else:
-            return False
+    def start(self):
+        """Connect to broker in background, the connection is restored if lost"""
+        self.supervisor.start()
+
+    def wait_for_connection(self, timeout_in_secs: float = None) -> bool:
+        """Wait for the broker connection, return True if connected"""
+        return self.supervisor.wait_for_connection(timeout_in_secs)
+
+    def add_connection_state_callback(self, callback: Callable[[bool], None]):
+        """Add a callback(connected) called on connection and disconnection"""
+        self.supervisor.add_state_callback(callback)
 
     def disconnect(self):
         """Send disconnection message to broker"""
 
         logger.info("Disconnect from broker")
+        self.supervisor.stop()
         self._client.disconnect()
 
-    def publish(self, topic: str, message: Msg, qos=1) -> bool:
+    def publish_async(self, topic: str, message: Msg, qos=1) -> Future:
         """
-        Try to publish a message to the broker, if error in publish launch reconnection
+        Queue a message for publication, the future result is True once
+        the message is acknowledged, False if it could not be published
         """
 
         logger.info(f"Publish on topic {topic}  message: {str(message)}")
-        message_publish_info = self._client.publish(topic, serialize(message))
-        ret_code = message_publish_info.rc
-        if ret_code == mqtt.MQTT_ERR_SUCCESS:
-            logger.info(f"Published")
-        if ret_code == mqtt.MQTT_ERR_NO_CONN:
-            logger.info(f"Not connected")
-
-        logger.debug("trying to publish message mid: %s", str(message_publish_info.mid))
+        return self.publish_pipeline.submit(topic, serialize(message), qos)
+
+    def publish(self, topic: str, message: Msg, qos=1) -> bool:
+        """
+        Publish a message and wait for its acknowledgment. Return False if
+        the message is still queued after publish_timeout_in_secs, a message
+        already handed to paho is waited for until acknowledged or failed
+        """
+
+        future = self.publish_async(topic, message, qos)
         try:
-            message_publish_info.wait_for_publish(timeout=self.publish_timeout_in_secs)
-        except Exception as e :
-            logger.error(
-                f"Error when tryng to publish message mid: {message_publish_info.mid} launching"
-                " reconnection procedure"
-            )
-        if not message_publish_info._published:
-            logger.error(f"The message mid: {message_publish_info.mid} could not be published")
-            logger.error(f"Launching reconnection procedure")
-            if self.connect(self.max_reconnection_attemps):
-                logger.error(f"Succefully reconnected")
-                return self.publish(topic, message)
-            else:
-                logger.error(f"Reconnection imposible, message not published")
-                return False
-        return True
+            return future.result(timeout=self.publish_timeout_in_secs)
+        except FutureTimeoutError:
+            pass
+        if future.cancel():
+            # Still queued while disconnected: dropped, the caller keeps it
+            logger.error(f"Message to {topic} not published in time, cancelled")
+            return False
+        # paho delivers it at QoS1, returning False would make the caller
+        # send it again
+        logger.warning(f"Message to {topic} not acknowledged in time, waiting for paho")
+        return future.result()
+
+    def get_publish_metrics(self) -> dict:
+        """Return the publish pipeline metrics"""
+        return self.publish_pipeline.get_metrics()
+
+    def get_connection_metrics(self) -> dict:
+        """Return the connection supervisor metrics"""
+        return self.supervisor.get_metrics()
+
+    def get_dispatch_metrics(self) -> dict:
+        """Return the received messages dispatcher metrics"""
+        return self.dispatcher.get_metrics()
 
     def subscribe(self, topic: str, callback: Callable[[Msg], None], qos=1):
-        """Subscribe to a topic"""
+        """
+        Subscribe to a topic filter, + and # wildcards allowed. When
+        disconnected, the subscription is sent on connection
+        """
 
         logger.info(f"Subscribe to topic {topic}")
-        if self.connected:
-            self._callbacks[topic] = callback
+        new_filter = self._topic_trie.add(topic, callback)
+        if self.connected and new_filter:
             self._client.subscribe(topic, qos)
-            self.subscriptions[topic] = callback
-            return True
-        else:
-            logger.info(f"Impossible to subscribe to topic, MQTT interface not connected")
-            if self.connect(self.max_reconnection_attemps):
-                logger.error(f"Succefully reconnected")
-                self._client.subscribe(topic, qos)
-                self.subscriptions[topic] = callback
-                return True
-            else:
-                logger.error(f"Reconnection imposible not subscribed")
-                return False
-
-    def loop_forever(self):
-        """Run loop forever"""
-
-        logger.info("Run infinite loop")
-        self._client.loop_forever()
-
-    def loop_start(self):
-        """Run loop in dedicated thread"""
-
-        logger.info("Start loop in dedicated thread")
-        return self._client.loop_start()
-
-    def loop_stop(self):
-        """Stop running loop"""
-
-        logger.info("Stop loop")
-        return self._client.loop_stop()
+        return True
+
+    def unsubscribe(self, topic: str, callback: Callable[[Msg], None] = None):
+        """Remove a callback, or all the callbacks, of a topic filter"""
+
+        logger.info(f"Unsubscribe from topic {topic}")
+        self._topic_trie.remove(topic, callback)
+        if self.connected and topic not in self._topic_trie.get_filters():
+            self._client.unsubscribe(topic)
@@ -2,8 +2,8 @@
 MQTT messages model
 """
 
-from typing import TypeVar 
-import json
+from typing import TypeVar
+from server.interfaces.mqtt_interface.codec import dumps, loads
 
 Msg = TypeVar("Msg")
 
@@ -16,10 +16,9 @@ def serialize(msg: Msg) -> bytes:
         data_to_send = {"data":msg}
     else:
         data_to_send = msg.to_json()
-    return json.dumps(data_to_send)
+    return dumps(data_to_send)
 
 
 def deserialize(payload: bytes) -> Msg:
     """deserialize MQTT message"""
-    data = json.loads(payload)
-    return data
+    return loads(payload)
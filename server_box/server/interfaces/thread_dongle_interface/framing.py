@@ -0,0 +1,90 @@
+"""
+Thread dongle serial frames decoder
+"""
+import logging
+from typing import List
+
+logger = logging.getLogger(__name__)
+
+
+class FrameDecoder:
+    """
+    Incremental delimiter based frame decoder. Bytes are accumulated in a
+    reused buffer and each complete frame is returned as soon as its
+    delimiter is received
+    """
+
+    def __init__(self, delimiter: bytes = b"\n", max_frame_size: int = 1024, strip: bytes = b"\r"):
+        if not delimiter:
+            raise ValueError("Frame delimiter can not be empty")
+        self.delimiter = delimiter
+        self.max_frame_size = max_frame_size
+        self.strip = strip
+        self._buffer = bytearray()
+        # Start of the undecoded bytes and position to resume the delimiter search
+        self._start = 0
+        self._search_from = 0
+        # True while skipping the end of an oversized frame
+        self._discarding = False
+        self.counters = {
+            "frames": 0,
+            "empty_frames": 0,
+            "oversized_frames": 0,
+            "discarded_bytes": 0,
+        }
+
+    def feed(self, data: bytes) -> List[bytes]:
+        """Add received bytes, return the complete frames"""
+        self._buffer += data
+        frames = []
+        while True:
+            end = self._buffer.find(self.delimiter, self._search_from)
+            if end < 0:
+                break
+            frame = bytes(self._buffer[self._start:end]).strip(self.strip)
+            self._start = end + len(self.delimiter)
+            self._search_from = self._start
+            if self._discarding:
+                self._discarding = False
+                self.counters["discarded_bytes"] += len(frame)
+                continue
+            if not frame:
+                self.counters["empty_frames"] += 1
+                continue
+            if len(frame) > self.max_frame_size:
+                self.counters["oversized_frames"] += 1
+                self.counters["discarded_bytes"] += len(frame)
+                continue
+            self.counters["frames"] += 1
+            frames.append(frame)
+
+        # Resume the search where it stopped, the delimiter may be split
+        self._search_from = max(self._start, len(self._buffer) - len(self.delimiter) + 1)
+
+        # Drop a partial frame too long to be valid
+        pending = len(self._buffer) - self._start
+        if pending > self.max_frame_size:
+            if not self._discarding:
+                logger.error(f"Frame exceeds {self.max_frame_size} bytes, discarding")
+                self.counters["oversized_frames"] += 1
+                self._discarding = True
+            self.counters["discarded_bytes"] += pending
+            self._start = self._search_from = len(self._buffer)
+
+        self._compact()
+        return frames
+
+    def reset(self):
+        """Discard the partial frame"""
+        self.counters["discarded_bytes"] += len(self._buffer) - self._start
+        self._buffer.clear()
+        self._start = self._search_from = 0
+        self._discarding = False
+
+    def _compact(self):
+        """Release the consumed bytes, the buffer memory is kept"""
+        if self._start == 0:
+            return
+        del self._buffer[: self._start]
+        self._search_from -= self._start
+        self._start = 0
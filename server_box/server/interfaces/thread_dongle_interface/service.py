@@ -1,10 +1,11 @@
 """
 Thread interface service
 """
-import time
 import logging
 import threading
+import time
 import serial
+from .framing import FrameDecoder
 
 logger = logging.getLogger(__name__)
 
@@ -16,17 +17,37 @@ class ThreadServerDongle(threading.Thread):
     msg_callback: callable
     keep_alive_callback: callable
 
-    def __init__(self, thread_serial_port: str, serial_speed: int = 115200):
+    def __init__(
+        self,
+        thread_serial_port: str,
+        serial_speed: int = 115200,
+        frame_delimiter: str = "\n",
+        read_timeout_in_secs: float = 1,
+        reconnect_min_delay_in_secs: float = 1,
+        reconnect_max_delay_in_secs: float = 30,
+    ):
         self.msg_callback = None
         self.keep_alive_callback = None
 
         self.thread_serial_port = thread_serial_port
+        self.serial_speed = serial_speed
+        self.read_timeout_in_secs = read_timeout_in_secs
+        self.reconnect_min_delay_in_secs = reconnect_min_delay_in_secs
+        self.reconnect_max_delay_in_secs = reconnect_max_delay_in_secs
+        self.reconnect_delay_in_secs = reconnect_min_delay_in_secs
+        self.frame_decoder = FrameDecoder(delimiter=frame_delimiter.encode("utf-8"))
+        self.counters = {
+            "bytes_received": 0,
+            "messages_received": 0,
+            "keep_alives_received": 0,
+            "decode_errors": 0,
+            "read_errors": 0,
+            "reconnections": 0,
+        }
 
         # Run Thread interface dedicated thread
         logger.info(f"Creatting serial interface object...")
-        self.serial_interface = serial.Serial(
-            self.thread_serial_port, serial_speed, stopbits=serial.STOPBITS_ONE
-        )
+        self.serial_interface = self.open_serial_port()
         super(ThreadServerDongle, self).__init__(name="ThreadServerDongleThread")
         self.setDaemon(True)
 
@@ -41,28 +62,98 @@ class ThreadServerDongle(threading.Thread):
     def run(self):
         """Run thread"""
         while True:
-            if self.serial_interface.inWaiting() > 0:
+            # Block until data is received, then take all the pending bytes
+            try:
                 received_data = self.serial_interface.read(
-                    self.serial_interface.inWaiting()
+                    max(1, self.serial_interface.in_waiting)
                 )
-                msg = received_data.decode("utf-8")
-                msg = str(msg[: len(msg) - 1])
-
-                logger.info(f"Thread Message received: {msg}")
-                if msg.startswith("ka"):
-                    node = msg.split("_")[1]
-                    logger.info(f"Keep alive message received for node {node}")
-                    if self.keep_alive_callback is None:
-                        logger.error("Keep alive reception callback is None")
-                    else:
-                        self.keep_alive_callback(node_id=node)
-                    continue
+            except serial.SerialException as e:
+                logger.error(f"Error reading Thread dongle serial port: {e}")
+                self.counters["read_errors"] += 1
+                self.frame_decoder.reset()
+                self.restart_serial_port()
+                continue
+            if not received_data:
+                continue
+            # The port works, next reconnection starts with the min delay
+            self.reconnect_delay_in_secs = self.reconnect_min_delay_in_secs
+            self.counters["bytes_received"] += len(received_data)
 
-                if self.msg_callback is None:
-                    logger.error("Message reception callback is None")
+            for frame in self.frame_decoder.feed(received_data):
+                try:
+                    msg = frame.decode("utf-8")
+                except UnicodeDecodeError:
+                    logger.error(f"Invalid Thread frame received: {frame}")
+                    self.counters["decode_errors"] += 1
                     continue
-                self.msg_callback(msg)
-            time.sleep(0.1)
+                try:
+                    self.process_message(msg)
+                except Exception as e:
+                    logger.error(f"Error processing Thread message {msg}: {e}")
+
+    def open_serial_port(self) -> serial.Serial:
+        """Open the dongle serial port"""
+        return serial.Serial(
+            self.thread_serial_port,
+            self.serial_speed,
+            stopbits=serial.STOPBITS_ONE,
+            timeout=self.read_timeout_in_secs,
+        )
+
+    def restart_serial_port(self):
+        """Reopen the serial port, the delay doubles after each failure"""
+        time.sleep(self.reconnect_delay_in_secs)
+        self.reconnect_delay_in_secs = min(
+            self.reconnect_delay_in_secs * 2, self.reconnect_max_delay_in_secs
+        )
+        logger.error("Reopening Thread dongle serial port")
+        self.counters["reconnections"] += 1
+        try:
+            self.serial_interface.close()
+        except serial.SerialException as e:
+            logger.error(f"Error closing Thread dongle serial port: {e}")
+        try:
+            self.serial_interface = self.open_serial_port()
+        except serial.SerialException as e:
+            # Still closed, the next read fails and retries after a longer delay
+            logger.error(f"Error opening Thread dongle serial port: {e}")
+
+    def process_message(self, msg: str):
+        """Dispatch a received message"""
+        logger.info(f"Thread Message received: {msg}")
+        self.counters["messages_received"] += 1
+        if msg.startswith("ka"):
+            # ka_<node>[_<rssi>]
+            fields = msg.split("_")
+            if len(fields) < 2 or not fields[1]:
+                logger.error(f"Invalid keep alive received: {msg}")
+                self.counters["decode_errors"] += 1
+                return
+            node = fields[1]
+            rssi = None
+            if len(fields) > 2:
+                try:
+                    rssi = int(fields[2])
+                except ValueError:
+                    logger.error(f"Invalid RSSI in keep alive: {msg}")
+            logger.info(f"Keep alive message received for node {node}")
+            self.counters["keep_alives_received"] += 1
+            if self.keep_alive_callback is None:
+                logger.error("Keep alive reception callback is None")
+            else:
+                self.keep_alive_callback(node_id=node, rssi=rssi)
+            return
+
+        if self.msg_callback is None:
+            logger.error("Message reception callback is None")
+            return
+        self.msg_callback(msg)
+
+    def get_counters(self) -> dict:
+        """Return reception and framing counters"""
+        counters = dict(self.counters)
+        counters.update(self.frame_decoder.counters)
+        return counters
 
     def set_msg_reception_callback(self, callback: callable):
         """Set Thread message reception callback"""
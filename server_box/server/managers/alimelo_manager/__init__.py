@@ -1,3 +1,4 @@
 """Alimelo managment package"""
 from .service import alimelo_manager_service
 from .model import AlimeloRessources
+from .telemetry import RESOLUTIONS as TELEMETRY_RESOLUTIONS
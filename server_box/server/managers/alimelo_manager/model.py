@@ -1,5 +1,21 @@
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
 class AlimeloRessources:
-    """Alimelo ressources model"""
+    """Alimelo ressources model, immutable snapshot"""
+
+    __slots__ = (
+        "busvoltage",
+        "shuntvoltage",
+        "loadvoltage",
+        "current_mA",
+        "power_mW",
+        "batLevel",
+        "electricSocketIsPowerSupplied",
+        "isPowredByBattery",
+        "isChargingBattery",
+    )
 
     busvoltage: float
     shuntvoltage: float
@@ -10,25 +26,3 @@ class AlimeloRessources:
     electricSocketIsPowerSupplied: bool
     isPowredByBattery: bool
     isChargingBattery: bool
-
-    def __init__(
-        self,
-        busvoltage: float,
-        shuntvoltage: float,
-        loadvoltage: float,
-        current_mA: float,
-        power_mW: float,
-        batLevel: float,
-        electricSocketIsPowerSupplied: bool,
-        isPowredByBattery: bool,
-        isChargingBattery: bool,
-    ):
-        self.busvoltage = busvoltage
-        self.shuntvoltage = shuntvoltage
-        self.loadvoltage = loadvoltage
-        self.current_mA = current_mA
-        self.power_mW = power_mW
-        self.batLevel = batLevel
-        self.electricSocketIsPowerSupplied = electricSocketIsPowerSupplied
-        self.isPowredByBattery = isPowredByBattery
-        self.isChargingBattery = isChargingBattery
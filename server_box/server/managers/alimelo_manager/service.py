@@ -1,8 +1,14 @@
 import logging
 from flask import Flask
 import json
-from server.interfaces.alimelo_interface import AlimeloInterface
+from server.interfaces.alimelo_interface import (
+    AlimeloInterface,
+    ENCODERS,
+    JSON_ENCODING,
+)
+from server.common.device_state import state_property, ALIMELO_RESSOURCES
 from .model import AlimeloRessources
+from .telemetry import TelemetryHistory, FIELDS as TELEMETRY_FIELDS
 
 logger = logging.getLogger(__name__)
 
@@ -11,7 +17,11 @@ class AlimeloManager:
     """Manager for Alimelo interface"""
 
     alimelo_interface: AlimeloInterface
-    alimelo_ressources: AlimeloRessources
+    alimelo_ressources: AlimeloRessources = state_property(
+        ALIMELO_RESSOURCES, "Last ressources notification"
+    )
+    encode: callable
+    telemetry: TelemetryHistory
 
     def __init__(self, app: Flask = None) -> None:
         if app is not None:
@@ -27,17 +37,32 @@ class AlimeloManager:
                 serial_port=app.config["ALIMELO_SERIAL_PORT"],
                 notification_separator=app.config["ALIMELO_NOTIFICATION_SEPARATOR"],
                 command_separator=app.config["ALIMELO_COMMAND_SEPARATOR"],
-                serial_connection_restart_timeout_in_secs=app.config[
-                    "ALIMELO_SERIAL_CONNECTION_RESTART_TIMEOUT_IN_SECS"
+                read_timeout_in_secs=app.config["ALIMELO_SERIAL_READ_TIMEOUT_IN_SECS"],
+                reconnect_min_delay_in_secs=app.config[
+                    "ALIMELO_SERIAL_RECONNECT_MIN_DELAY_IN_SECS"
+                ],
+                reconnect_max_delay_in_secs=app.config[
+                    "ALIMELO_SERIAL_RECONNECT_MAX_DELAY_IN_SECS"
                 ],
             )
+
+            # Payloads encoding, must be supported by the Alimelo firmware
+            wire_encoding = app.config["ALIMELO_WIRE_ENCODING"]
+            if wire_encoding not in ENCODERS:
+                logger.error(f"Unknown Alimelo wire encoding {wire_encoding}, using JSON")
+                wire_encoding = JSON_ENCODING
+            self.encode = ENCODERS[wire_encoding]
+
             try:
                 self.alimelo_interface.start()
             except Exception as e:
                 logger.error(e)
 
-            # Init ressources
+            # Init ressources and their history
             self.alimelo_ressources = None
+            self.telemetry = TelemetryHistory(
+                memory_budget_in_kb=app.config["ALIMELO_TELEMETRY_MEMORY_BUDGET_IN_KB"]
+            )
 
             # set ressources notification callback
             self.alimelo_interface.set_notification_reception_callback(
@@ -66,9 +91,21 @@ class AlimeloManager:
         )
         logger.info(f"alim: {alimelo_notification_dict}")
 
-    def send_data_to_live_objects(self, data: str):
-        """Send data to LiveObjects"""
-        self.alimelo_interface.send_data_to_live_objects(data)
+        # Record power telemetry sample
+        self.telemetry.record(
+            {
+                field: getattr(self.alimelo_ressources, field)
+                for field in TELEMETRY_FIELDS
+            }
+        )
+
+    def get_link_counters(self) -> dict:
+        """Return Alimelo serial link and parser counters"""
+        return self.alimelo_interface.get_counters()
+
+    def send_data_to_live_objects(self, data: dict):
+        """Encode and send data to LiveObjects"""
+        self.alimelo_interface.send_data_to_live_objects(self.encode(data))
 
     def get_battery_level(self):
         """Get alimelo batery level in percentage"""
@@ -0,0 +1,218 @@
+"""
+Alimelo power telemetry history, fixed size ring buffers at several
+resolutions
+"""
+import logging
+import threading
+import time
+from array import array
+
+logger = logging.getLogger(__name__)
+
+# Recorded Alimelo ressources fields
+FIELDS = ["busvoltage", "shuntvoltage", "loadvoltage", "current_mA", "power_mW", "batLevel"]
+POWER_FIELD = "power_mW"
+
+# Resolutions: name, bucket duration in secs (0 for raw samples), share of the memory budget
+RAW = "raw"
+RESOLUTIONS = [(RAW, 0, 0.5), ("1min", 60, 0.25), ("15min", 900, 0.25)]
+
+ITEM_SIZE = array("d").itemsize
+
+
+class RingBuffer:
+    """Preallocated columns of doubles, the oldest row is overwritten when full"""
+
+    def __init__(self, columns: list, capacity: int):
+        self.capacity = capacity
+        self.columns = {column: array("d", [0.0]) * capacity for column in columns}
+        self.next = 0
+        self.count = 0
+
+    def append(self, row: dict):
+        """Write a row {column: value}"""
+        for column, values in self.columns.items():
+            values[self.next] = row[column]
+        self.next = (self.next + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+
+    def get_column(self, column: str, start: int = 0) -> array:
+        """Return the column values in time order, from the start-th oldest row"""
+        values = self.columns[column]
+        first = (self.next - self.count) % self.capacity
+        if first + self.count <= self.capacity:
+            return values[first + start : first + self.count]
+        return (values[first:] + values[: self.next])[start:]
+
+    def find_start(self, column: str, minimum: float) -> int:
+        """Index of the first row with column >= minimum, rows sorted by column"""
+        low, high = 0, self.count
+        values = self.columns[column]
+        first = (self.next - self.count) % self.capacity
+        while low < high:
+            middle = (low + high) // 2
+            if values[(first + middle) % self.capacity] < minimum:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+
+class Bucket:
+    """Samples aggregation in progress for a resolution"""
+
+    def __init__(self, start: float):
+        self.start = start
+        self.count = 0
+        self.total = dict.fromkeys(FIELDS, 0.0)
+        self.min = {}
+        self.max = {}
+
+    def add(self, sample: dict):
+        """Aggregate a sample"""
+        self.count += 1
+        for field in FIELDS:
+            value = sample[field]
+            self.total[field] += value
+            self.min[field] = min(self.min.get(field, value), value)
+            self.max[field] = max(self.max.get(field, value), value)
+
+    def to_row(self) -> dict:
+        """Ring buffer row of the bucket"""
+        row = {"timestamp": self.start, "count": self.count}
+        for field in FIELDS:
+            row[f"{field}_mean"] = self.total[field] / self.count
+            row[f"{field}_min"] = self.min[field]
+            row[f"{field}_max"] = self.max[field]
+        return row
+
+
+class TelemetryHistory:
+    """
+    Alimelo samples history. Raw samples and per bucket mean/min/max are
+    kept in ring buffers sized from the memory budget
+    """
+
+    def __init__(self, memory_budget_in_kb: int, clock: callable = time.time):
+        self.clock = clock
+        self.buffers = {}
+        self.bucket_durations = {}
+        self.buckets = {}
+        self._lock = threading.Lock()
+
+        for name, bucket_duration, budget_share in RESOLUTIONS:
+            if bucket_duration:
+                columns = ["timestamp", "count"] + [
+                    f"{field}_{stat}" for field in FIELDS for stat in ("mean", "min", "max")
+                ]
+            else:
+                columns = ["timestamp"] + FIELDS
+            row_size = len(columns) * ITEM_SIZE
+            capacity = max(1, int(memory_budget_in_kb * 1024 * budget_share) // row_size)
+            self.buffers[name] = RingBuffer(columns=columns, capacity=capacity)
+            self.bucket_durations[name] = bucket_duration
+            self.buckets[name] = None
+            logger.info(f"Telemetry {name} history: {capacity} rows")
+
+    def record(self, sample: dict):
+        """Record a sample {field: value} at the current time"""
+        timestamp = self.clock()
+        with self._lock:
+            self.buffers[RAW].append({"timestamp": timestamp, **sample})
+            for name, bucket_duration in self.bucket_durations.items():
+                if not bucket_duration:
+                    continue
+                start = timestamp - timestamp % bucket_duration
+                bucket = self.buckets[name]
+                if bucket is not None and bucket.start != start:
+                    self.buffers[name].append(bucket.to_row())
+                    bucket = None
+                if bucket is None:
+                    bucket = self.buckets[name] = Bucket(start)
+                bucket.add(sample)
+
+    def query(self, resolution: str, since_in_secs: float = None) -> dict:
+        """Return the columns of resolution recorded in the last since_in_secs"""
+        with self._lock:
+            buffer = self._get_buffer(resolution)
+            start = self._find_start(buffer, since_in_secs)
+            return {
+                column: buffer.get_column(column, start).tolist()
+                for column in buffer.columns
+            }
+
+    def aggregate(self, resolution: str, since_in_secs: float = None) -> dict:
+        """Return min/max/mean per field and energy in mWh over the window"""
+        with self._lock:
+            buffer = self._get_buffer(resolution)
+            start = self._find_start(buffer, since_in_secs)
+            timestamps = buffer.get_column("timestamp", start)
+            if not timestamps:
+                return {"samples": 0}
+
+            if self.bucket_durations[resolution]:
+                counts = buffer.get_column("count", start)
+                samples = int(sum(counts))
+                stats = {
+                    field: {
+                        "min": min(buffer.get_column(f"{field}_min", start)),
+                        "max": max(buffer.get_column(f"{field}_max", start)),
+                        "mean": sum(
+                            map(float.__mul__, buffer.get_column(f"{field}_mean", start), counts)
+                        )
+                        / samples,
+                    }
+                    for field in FIELDS
+                }
+                power = buffer.get_column(f"{POWER_FIELD}_mean", start)
+            else:
+                samples = len(timestamps)
+                stats = {}
+                for field in FIELDS:
+                    values = buffer.get_column(field, start)
+                    stats[field] = {
+                        "min": min(values),
+                        "max": max(values),
+                        "mean": sum(values) / samples,
+                    }
+                power = buffer.get_column(POWER_FIELD, start)
+
+        return {
+            "samples": samples,
+            "from": timestamps[0],
+            "to": timestamps[-1],
+            "fields": stats,
+            "energy_mWh": self.integrate(timestamps, power) / 3600,
+        }
+
+    @staticmethod
+    def integrate(timestamps: array, values: array) -> float:
+        """Trapezoidal integral of values over timestamps in secs"""
+        return sum(
+            (v0 + v1) * (t1 - t0) / 2
+            for t0, t1, v0, v1 in zip(timestamps, timestamps[1:], values, values[1:])
+        )
+
+    def get_metrics(self) -> dict:
+        """Return rows count and capacity per resolution"""
+        with self._lock:
+            return {
+                name: {
+                    "rows": buffer.count,
+                    "capacity": buffer.capacity,
+                    "memory_in_kb": buffer.capacity * len(buffer.columns) * ITEM_SIZE / 1024,
+                }
+                for name, buffer in self.buffers.items()
+            }
+
+    def _get_buffer(self, resolution: str) -> RingBuffer:
+        """Return the resolution buffer, raise ValueError if unknown"""
+        if resolution not in self.buffers:
+            raise ValueError(f"Unknown resolution {resolution}")
+        return self.buffers[resolution]
+
+    def _find_start(self, buffer: RingBuffer, since_in_secs: float) -> int:
+        """First row of the window"""
+        if since_in_secs is None:
+            return 0
+        return buffer.find_start("timestamp", self.clock() - since_in_secs)
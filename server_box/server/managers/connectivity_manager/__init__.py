@@ -0,0 +1,2 @@
+"""Internet connectivity manager package"""
+from .service import connectivity_manager_service
@@ -0,0 +1,157 @@
+import logging
+import threading
+import time
+import http.client as httplib
+from typing import Iterable
+from flask import Flask
+
+logger = logging.getLogger(__name__)
+
+
+class ConnectivityManager:
+    """
+    Manager for internet connectivity. A background thread probes the
+    connection and keeps a cached status, readers never do network I/O
+    """
+
+    check_host: str
+    check_period_in_secs: float
+    offline_check_period_in_secs: float
+    check_timeout_in_secs: float
+    status_ttl_in_secs: float
+    connected: bool = False
+    last_check: float = None
+    connectivity_change_callbacks: Iterable[callable]
+
+    def __init__(self, app: Flask = None) -> None:
+        self.connectivity_change_callbacks = []
+        self.condition = threading.Condition()
+        self.check_requested = threading.Event()
+        self.metrics = {
+            "checks": 0,
+            "connections": 0,
+            "disconnections": 0,
+            "stale_reads": 0,
+        }
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app: Flask) -> None:
+        """Initialize ConnectivityManager"""
+        if app is not None:
+            logger.info("initializing the ConnectivityManager")
+            # Initialize configuration
+            self.check_host = app.config["INTERNET_CHECK_HOST"]
+            self.check_period_in_secs = app.config["INTERNET_CHECK_PERIOD_IN_SECS"]
+            self.offline_check_period_in_secs = app.config[
+                "INTERNET_OFFLINE_CHECK_PERIOD_IN_SECS"
+            ]
+            self.check_timeout_in_secs = app.config["INTERNET_CHECK_TIMEOUT_IN_SECS"]
+            self.status_ttl_in_secs = app.config["INTERNET_STATUS_TTL_IN_SECS"]
+
+            # Get the initial status before the other services start
+            self.update_connectivity_status()
+
+            # Start connectivity monitor
+            self.monitor_thread = threading.Thread(
+                target=self.monitor, name="ConnectivityMonitor", daemon=True
+            )
+            self.monitor_thread.start()
+
+    def probe(self) -> bool:
+        """Check internet connection with a network request"""
+        conn = httplib.HTTPSConnection(
+            self.check_host, timeout=self.check_timeout_in_secs
+        )
+        try:
+            conn.request("HEAD", "/")
+            return True
+        except Exception:
+            return False
+        finally:
+            conn.close()
+
+    def update_connectivity_status(self) -> bool:
+        """Probe the connection, update the cached status and notify changes"""
+        connected = self.probe()
+        with self.condition:
+            changed = connected != self.connected
+            self.connected = connected
+            self.last_check = time.monotonic()
+            self.metrics["checks"] += 1
+            if changed:
+                self.metrics["connections" if connected else "disconnections"] += 1
+            self.condition.notify_all()
+
+        if changed:
+            logger.info(f"Internet connectivity changed, connected: {connected}")
+            for callback in list(self.connectivity_change_callbacks):
+                try:
+                    callback(connected)
+                except Exception as e:
+                    logger.error(f"Error in connectivity change callback: {e}")
+        return connected
+
+    def monitor(self):
+        """Connectivity monitor loop"""
+        while True:
+            period = (
+                self.check_period_in_secs
+                if self.connected
+                else self.offline_check_period_in_secs
+            )
+            self.check_requested.wait(timeout=period)
+            self.check_requested.clear()
+            self.update_connectivity_status()
+
+    def request_check(self):
+        """Ask the monitor for an immediate check"""
+        self.check_requested.set()
+
+    def is_connected_to_internet(self) -> bool:
+        """Return the cached internet connection status"""
+        with self.condition:
+            stale = (
+                self.last_check is None
+                or time.monotonic() - self.last_check > self.status_ttl_in_secs
+            )
+            if stale:
+                self.metrics["stale_reads"] += 1
+        if stale:
+            self.request_check()
+        return self.connected
+
+    def wait_for_connection(self, timeout_in_secs: float) -> bool:
+        """Wait until internet is reachable, return False on timeout"""
+        deadline = time.monotonic() + timeout_in_secs
+        with self.condition:
+            if self.connected:
+                return True
+            # Check now, then the monitor checks at the offline period
+            self.request_check()
+            while not self.connected:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self.condition.wait(remaining)
+            return True
+
+    def add_connectivity_change_callback(self, callback: callable):
+        """Add a callback called with the new status when connectivity changes"""
+        self.connectivity_change_callbacks.append(callback)
+
+    def get_metrics(self) -> dict:
+        """Return connectivity monitor metrics"""
+        with self.condition:
+            metrics = dict(self.metrics)
+            metrics["connected"] = self.connected
+            metrics["last_check_age_in_secs"] = (
+                None
+                if self.last_check is None
+                else round(time.monotonic() - self.last_check, 3)
+            )
+        return metrics
+
+
+connectivity_manager_service: ConnectivityManager = ConnectivityManager()
+""" Connectivity manager service singleton"""
@@ -3,13 +3,10 @@ from typing import Iterable
 from flask import Flask
 from server.managers.mqtt_manager import mqtt_manager_service
 from datetime import datetime
-from timeloop import Timeloop
 from server.interfaces.mqtt_interface import SingleRelayStatus, RelaysStatus
 from datetime import timedelta
 from server.common import ServerBoxException, ErrorCode
-
-
-relays_status_timeloop = Timeloop()
+from server.common.device_state import state_property, ELECTRICAL_PANEL_RELAYS
 
 logger = logging.getLogger(__name__)
 
@@ -19,7 +16,9 @@ class ElectricalPanelManager:
 
     mqtt_command_relays_topic: str
     mqtt_relays_status_topic: str
-    last_relays_status_received: RelaysStatus = None
+    last_relays_status_received: RelaysStatus = state_property(
+        ELECTRICAL_PANEL_RELAYS, "Last relays status received"
+    )
 
     def __init__(self, app: Flask = None) -> None:
         if app is not None:
@@ -55,10 +54,10 @@ class ElectricalPanelManager:
         if self.last_relays_status_received is None:
             raise ServerBoxException(ErrorCode.RELAYS_STATUS_NOT_RECEIVED)
 
-        for relay_status in self.last_relays_status_received.relay_statuses:
-            if relay_status.relay_number == relay_number:
-                return relay_status
-        raise ServerBoxException(ErrorCode.RELAYS_STATUS_NOT_RECEIVED)
+        relay_status = self.last_relays_status_received.get(relay_number)
+        if relay_status is None:
+            raise ServerBoxException(ErrorCode.RELAYS_STATUS_NOT_RECEIVED)
+        return relay_status
 
     def receive_relays_statuses(self, relays_status: RelaysStatus):
         """Callback for relays/status topic"""
@@ -66,8 +65,7 @@ class ElectricalPanelManager:
         logger.info(f"{relays_status.to_json()}")
 
         # Update relays last status received
-        relays_status.timestamp = datetime.now()
-        self.last_relays_status_received = relays_status
+        self.last_relays_status_received = relays_status.with_timestamp(datetime.now())
 
     def publish_mqtt_relays_status_command(self, relays_status: RelaysStatus):
         """publish MQTT relays status command"""
@@ -1,5 +1,4 @@
 import logging
-import time
 from flask import Flask
 from server.interfaces.mqtt_liveobjects_interface import mqtt_liveobjects_client_interface
 
@@ -14,9 +13,15 @@ class MQTTManager:
     client_id: str
     live_objects_api_key: str
     qos: int
-    reconnection_timeout_in_secs: int
-    max_reconnection_attemps: int
+    reconnection_min_delay_in_secs: float
+    reconnection_max_delay_in_secs: float
     publish_timeout_in_secs: int
+    max_in_flight: int
+    max_publish_queue_size: int
+    max_publish_attempts: int
+    callback_max_workers: int
+    callback_queue_size: int
+    priority_topics: list
 
 
     def __init__(self, app: Flask = None) -> None:
@@ -32,9 +37,15 @@ class MQTTManager:
             self.client_id = app.config["MQTT_LIVE_OBJECTS_CLIENTID"]
             self.live_objects_api_key = app.config["MQTT_LIVE_OBJECTS_API_KEY"]
             self.qos = app.config["MQTT_LIVE_OBJECTS_QOS"]
-            self.reconnection_timeout_in_secs = app.config["MQTT_LIVE_OBJECTS_RECONNECTION_TIMEOUT_IN_SEG"]
-            self.max_reconnection_attemps = app.config["MQTT_LIVE_OBJECTS_MAX_RECONNECTION_ATTEMPS"]
+            self.reconnection_min_delay_in_secs = app.config["MQTT_LIVE_OBJECTS_RECONNECTION_MIN_DELAY_IN_SECS"]
+            self.reconnection_max_delay_in_secs = app.config["MQTT_LIVE_OBJECTS_RECONNECTION_MAX_DELAY_IN_SECS"]
             self.publish_timeout_in_secs = app.config["MQTT_LIVE_OBJECTS_MSG_PUBLISH_TIMEOUT_IN_SECS"]
+            self.max_in_flight = app.config["MQTT_LIVE_OBJECTS_MAX_IN_FLIGHT"]
+            self.max_publish_queue_size = app.config["MQTT_LIVE_OBJECTS_PUBLISH_QUEUE_SIZE"]
+            self.max_publish_attempts = app.config["MQTT_LIVE_OBJECTS_MAX_PUBLISH_ATTEMPTS"]
+            self.callback_max_workers = app.config["MQTT_LIVE_OBJECTS_CALLBACK_MAX_WORKERS"]
+            self.callback_queue_size = app.config["MQTT_LIVE_OBJECTS_CALLBACK_QUEUE_SIZE"]
+            self.priority_topics = app.config["MQTT_LIVE_OBJECTS_PRIORITY_TOPICS"]
 
             # Connect to MQTT broker
             self.init_mqtt_service()
@@ -43,9 +54,30 @@ class MQTTManager:
         """Subscribe to MQTT topic"""
         return self.mqtt_client.subscribe(topic=topic, callback=callback)
 
-    def publish_message(self, topic: str, message: str) -> bool:
-        """Publish message to topic"""
-        return self.mqtt_client.publish(topic=topic, message=message)
+    def publish_message(self, topic: str, message: str, wait: bool = False):
+        """
+        Publish message to topic, return a Future[bool] resolved on
+        acknowledgment. With wait, block and return the bool
+        """
+        if wait:
+            return self.mqtt_client.publish(topic=topic, message=message, qos=self.qos)
+        return self.mqtt_client.publish_async(topic=topic, message=message, qos=self.qos)
+
+    def get_publish_metrics(self) -> dict:
+        """Return the publish pipeline metrics"""
+        return self.mqtt_client.get_publish_metrics()
+
+    def add_connection_state_callback(self, callback: callable):
+        """Add a callback(connected) called on broker connection and disconnection"""
+        self.mqtt_client.add_connection_state_callback(callback)
+
+    def get_connection_metrics(self) -> dict:
+        """Return the broker connection metrics"""
+        return self.mqtt_client.get_connection_metrics()
+
+    def get_dispatch_metrics(self) -> dict:
+        """Return the received messages dispatcher metrics"""
+        return self.mqtt_client.get_dispatch_metrics()
 
     def init_mqtt_service(self):
         """Connect to MQTT broker"""
@@ -54,16 +86,18 @@ class MQTTManager:
             broker_address=self.broker_address,
             client_id=self.client_id,
             live_objects_api_key=self.live_objects_api_key,
-            reconnection_timeout_in_secs=self.reconnection_timeout_in_secs,
-            max_reconnection_attemps=self.max_reconnection_attemps,
+            reconnection_min_delay_in_secs=self.reconnection_min_delay_in_secs,
+            reconnection_max_delay_in_secs=self.reconnection_max_delay_in_secs,
             publish_timeout_in_secs=self.publish_timeout_in_secs,
+            max_in_flight=self.max_in_flight,
+            max_publish_queue_size=self.max_publish_queue_size,
+            max_publish_attempts=self.max_publish_attempts,
+            callback_max_workers=self.callback_max_workers,
+            callback_queue_size=self.callback_queue_size,
+            priority_topics=self.priority_topics,
         )
-
-        if self.mqtt_client.connect(self.max_reconnection_attemps):
-            self.mqtt_client.loop_start()
-            time.sleep(5)
-        else:
-            logger.error("Impossible to connect to MQTT broker")
+        # Connection opened and restored in background, messages are queued meanwhile
+        self.mqtt_client.start()
 
 
 mqtt_liveobjects_manager_service: MQTTManager = MQTTManager()
@@ -4,6 +4,7 @@ from server.managers.thread_manager import thread_manager_service
 from datetime import datetime
 from server.interfaces.mqtt_interface import SingleRelayStatus, RelaysStatus
 from server.common import ServerBoxException, ErrorCode
+from server.common.device_state import device_state_store, state_property, POWER_STRIP_RELAYS
 
 
 logger = logging.getLogger(__name__)
@@ -12,7 +13,7 @@ logger = logging.getLogger(__name__)
 class PowerStripManager:
     """Manager for connected power strip"""
 
-    relays_status: RelaysStatus = None
+    relays_status: RelaysStatus = state_property(POWER_STRIP_RELAYS, "Current relays status")
 
     def __init__(self, app: Flask = None) -> None:
         if app is not None:
@@ -40,10 +41,10 @@ class PowerStripManager:
         if self.relays_status is None:
             raise ServerBoxException(ErrorCode.RELAYS_STATUS_NOT_RECEIVED)
 
-        for relay_status in self.relays_status.relay_statuses:
-            if relay_status.relay_number == relay_number:
-                return relay_status
-        raise ServerBoxException(ErrorCode.RELAYS_STATUS_NOT_RECEIVED)
+        relay_status = self.relays_status.get(relay_number)
+        if relay_status is None:
+            raise ServerBoxException(ErrorCode.RELAYS_STATUS_NOT_RECEIVED)
+        return relay_status
 
 
     def set_single_relay_status(self, relay_number: int, new_status: bool):
@@ -52,16 +53,17 @@ class PowerStripManager:
         if relay_number not in range(1, 5):
             raise ServerBoxException(ErrorCode.INVALID_RELAY_NUMBER)
 
-        if self.relays_status is None:
-            raise ServerBoxException(ErrorCode.RELAYS_STATUS_NOT_RECEIVED)
+        def apply(relays_status: RelaysStatus) -> RelaysStatus:
+            if relays_status is None or relays_status.get(relay_number) is None:
+                raise ServerBoxException(ErrorCode.RELAYS_STATUS_NOT_RECEIVED)
+            # New snapshot, the readers of the previous one are not affected
+            return relays_status.with_relay(relay_number, new_status)
 
-        for relay_status in self.relays_status.relay_statuses:
-            if relay_status.relay_number == relay_number:
-                relay_status.status = new_status
-                # Notify new status to thread dongle
-                thread_manager_service.update_power_strip_status_in_dongle(power_strip_relay_statuses=self.relays_status)
-                return relay_status
-        raise ServerBoxException(ErrorCode.RELAYS_STATUS_NOT_RECEIVED)
+        # Applied on the current value, a status received meanwhile is kept
+        relays_status = device_state_store.modify(POWER_STRIP_RELAYS, apply)[POWER_STRIP_RELAYS]
+        # Notify new status to thread dongle
+        thread_manager_service.update_power_strip_status_in_dongle(power_strip_relay_statuses=relays_status)
+        return relays_status.get(relay_number)
 
     def set_relays_statuses(self, relays_status: RelaysStatus):
         """Set relays status"""
@@ -69,8 +71,7 @@ class PowerStripManager:
         logger.info(f"{relays_status.to_json()}")
 
         # Update relays last status received
-        relays_status.timestamp = datetime.now()
-        self.relays_status = relays_status
+        self.relays_status = relays_status.with_timestamp(datetime.now())
 
         # Notify new status to thread dongle
         thread_manager_service.update_power_strip_status_in_dongle(power_strip_relay_statuses=self.relays_status)
@@ -1,2 +1,3 @@
 """Thread managment package"""
 from .service import thread_manager_service
+from .registry import NODE_JOINED, NODE_LEFT
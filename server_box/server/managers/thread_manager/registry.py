@@ -0,0 +1,216 @@
+"""
+Thread nodes presence registry, the nodes are indexed by expiry time
+"""
+import heapq
+import logging
+import threading
+import time
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+# Node events
+NODE_JOINED = "JOINED"
+NODE_LEFT = "LEFT"
+
+LAST_SEEN_FORMAT = "%H:%M:%S"
+
+
+class NodeStats:
+    """Keep alive and RSSI stats of a node"""
+
+    __slots__ = (
+        "node_id",
+        "first_seen",
+        "last_seen",
+        "last_seen_str",
+        "expires_at",
+        "keep_alives",
+        "interval_min",
+        "interval_max",
+        "interval_total",
+        "rssi",
+        "rssi_min",
+        "rssi_max",
+    )
+
+    def __init__(self, node_id: str, now: float, wall_clock: datetime):
+        self.node_id = node_id
+        self.first_seen = now
+        self.last_seen = now
+        self.last_seen_str = wall_clock.strftime(LAST_SEEN_FORMAT)
+        self.expires_at = None
+        self.keep_alives = 1
+        self.interval_min = None
+        self.interval_max = None
+        self.interval_total = 0.0
+        self.rssi = None
+        self.rssi_min = None
+        self.rssi_max = None
+
+    def record_keep_alive(self, now: float, wall_clock: datetime):
+        """Record a keep alive received at now"""
+        interval = now - self.last_seen
+        self.interval_min = interval if self.interval_min is None else min(self.interval_min, interval)
+        self.interval_max = interval if self.interval_max is None else max(self.interval_max, interval)
+        self.interval_total += interval
+        self.keep_alives += 1
+        self.last_seen = now
+        # Formatted once per keep alive, not per request
+        self.last_seen_str = wall_clock.strftime(LAST_SEEN_FORMAT)
+
+    def record_rssi(self, rssi: int):
+        """Record the RSSI of the last keep alive"""
+        self.rssi = rssi
+        self.rssi_min = rssi if self.rssi_min is None else min(self.rssi_min, rssi)
+        self.rssi_max = rssi if self.rssi_max is None else max(self.rssi_max, rssi)
+
+    def to_dict(self) -> dict:
+        """Return node stats"""
+        intervals = self.keep_alives - 1
+        return {
+            "id": self.node_id,
+            "last_seen": self.last_seen_str,
+            "keep_alives": self.keep_alives,
+            "keep_alive_interval_in_secs": {
+                "avg": self.interval_total / intervals if intervals else None,
+                "min": self.interval_min,
+                "max": self.interval_max,
+            },
+            "rssi": {"last": self.rssi, "min": self.rssi_min, "max": self.rssi_max},
+        }
+
+
+class NodeRegistry:
+    """
+    Connected Thread nodes. Each keep alive pushes the node expiry in a
+    heap, a timer thread pops the expired nodes. Stale heap entries are
+    skipped, so a keep alive and an expiry cost O(log n)
+    """
+
+    def __init__(self, timeout_in_secs: float, clock: callable = time.monotonic):
+        self.timeout_in_secs = timeout_in_secs
+        self.clock = clock
+        self.nodes = {}
+        # (expires_at, node_id), an entry is stale if the node expiry moved
+        self._expiry_heap = []
+        self._event_callbacks = []
+        self._snapshot = {}
+        self._nodes_list = []
+        self._dirty = False
+        self._condition = threading.Condition()
+        self._timer = None
+        self.counters = {"joined": 0, "left": 0, "keep_alives": 0}
+
+    def start(self):
+        """Run the expiry timer in a dedicated thread"""
+        self._timer = threading.Thread(
+            target=self._run_timer, name="ThreadNodesExpiry", daemon=True
+        )
+        self._timer.start()
+
+    def add_event_callback(self, callback: callable):
+        """Add a callback(event, node_id) called on node join and leave"""
+        self._event_callbacks.append(callback)
+
+    def record_keep_alive(self, node_id: str, rssi: int = None):
+        """Record a node keep alive, emit a join event for a new node"""
+        now = self.clock()
+        wall_clock = datetime.now()
+        with self._condition:
+            self.counters["keep_alives"] += 1
+            node = self.nodes.get(node_id)
+            joined = node is None
+            if joined:
+                node = NodeStats(node_id, now, wall_clock)
+                self.nodes[node_id] = node
+                self.counters["joined"] += 1
+            else:
+                node.record_keep_alive(now, wall_clock)
+            if rssi is not None:
+                node.record_rssi(rssi)
+            node.expires_at = now + self.timeout_in_secs
+            heapq.heappush(self._expiry_heap, (node.expires_at, node_id))
+            self._dirty = True
+
+            # Drop the stale entries when they outnumber the nodes
+            if len(self._expiry_heap) > 2 * len(self.nodes) + 64:
+                self._expiry_heap = [
+                    (stats.expires_at, stats.node_id) for stats in self.nodes.values()
+                ]
+                heapq.heapify(self._expiry_heap)
+            # Wake up the timer if the heap head changed
+            if self._expiry_heap[0][1] == node_id:
+                self._condition.notify()
+
+        if joined:
+            logger.info(f"Thread node {node_id} joined")
+            self._emit(NODE_JOINED, node_id)
+
+    def expire(self) -> list:
+        """Remove the nodes timed out, return their ids"""
+        now = self.clock()
+        expired = []
+        with self._condition:
+            while self._expiry_heap and self._expiry_heap[0][0] <= now:
+                expires_at, node_id = heapq.heappop(self._expiry_heap)
+                node = self.nodes.get(node_id)
+                if node is None or node.expires_at != expires_at:
+                    continue
+                del self.nodes[node_id]
+                self.counters["left"] += 1
+                expired.append(node_id)
+            if expired:
+                self._dirty = True
+
+        for node_id in expired:
+            logger.info(f"Thread node {node_id} left")
+            self._emit(NODE_LEFT, node_id)
+        return expired
+
+    def get_snapshot(self) -> dict:
+        """Return {node_id: last seen HH:MM:SS}, rebuilt only after a change"""
+        with self._condition:
+            self._refresh_snapshot()
+            return self._snapshot
+
+    def get_nodes(self) -> list:
+        """Return the connected nodes and their stats"""
+        with self._condition:
+            self._refresh_snapshot()
+            return self._nodes_list
+
+    def get_metrics(self) -> dict:
+        """Return registry counters"""
+        with self._condition:
+            metrics = dict(self.counters)
+            metrics["connected"] = len(self.nodes)
+            metrics["expiry_heap_size"] = len(self._expiry_heap)
+        return metrics
+
+    def _refresh_snapshot(self):
+        """Rebuild the snapshots, new objects so the returned ones are never mutated"""
+        if not self._dirty:
+            return
+        self._snapshot = {node_id: node.last_seen_str for node_id, node in self.nodes.items()}
+        self._nodes_list = [node.to_dict() for node in self.nodes.values()]
+        self._dirty = False
+
+    def _emit(self, event: str, node_id: str):
+        """Call the event callbacks"""
+        for callback in self._event_callbacks:
+            try:
+                callback(event, node_id)
+            except Exception as e:
+                logger.error(f"Error in Thread node {event} callback: {e}")
+
+    def _run_timer(self):
+        """Expiry timer loop, sleeps until the earliest expiry"""
+        while True:
+            with self._condition:
+                if self._expiry_heap:
+                    timeout = max(0.0, self._expiry_heap[0][0] - self.clock())
+                    self._condition.wait(timeout)
+                else:
+                    self._condition.wait()
+            self.expire()
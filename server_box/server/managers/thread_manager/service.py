@@ -1,21 +1,21 @@
 import logging
-from datetime import datetime, timedelta
 from flask import Flask
-from timeloop import Timeloop
 from server.interfaces.thread_dongle_interface import ThreadInterface
 from server.interfaces.mqtt_interface import SingleRelayStatus, RelaysStatus
 from server.common import ServerBoxException, ErrorCode
+from server.common.device_state import device_state_store, THREAD_NODES
+from .status_writer import DongleStatusWriter
+from .registry import NodeRegistry
 
 logger = logging.getLogger(__name__)
 
-thread_network_info_timeloop = Timeloop()
-
 
 class ThreadManager:
     """Manager for thread interface"""
 
     thread_dongle_interface: ThreadInterface
-    nodes_ka_dict: dict
+    dongle_status_writer: DongleStatusWriter
+    node_registry: NodeRegistry
 
     def __init__(self, app: Flask = None) -> None:
         if app is not None:
@@ -28,12 +28,32 @@ class ThreadManager:
 
             self.serial_interface = app.config["THREAD_SERIAL_INTERFACE"]
             self.serial_speed = app.config["THREAD_SERIAL_SPEED"]
-            self.nodes_ka_dict = {}
+            self.frame_delimiter = app.config["THREAD_SERIAL_FRAME_DELIMITER"]
+            self.read_timeout_in_secs = app.config[
+                "THREAD_SERIAL_READ_TIMEOUT_IN_SECS"
+            ]
+            self.reconnect_min_delay_in_secs = app.config[
+                "THREAD_SERIAL_RECONNECT_MIN_DELAY_IN_SECS"
+            ]
+            self.reconnect_max_delay_in_secs = app.config[
+                "THREAD_SERIAL_RECONNECT_MAX_DELAY_IN_SECS"
+            ]
+
+            # Connected nodes, removed after the keep alive timeout
+            self.node_registry = NodeRegistry(
+                timeout_in_secs=app.config["THREAD_NODE_TIMEOUT_IN_SECS"]
+            )
+            self.node_registry.add_event_callback(self.record_connected_nodes)
+            self.node_registry.start()
 
             # setup thread interface
             self.thread_dongle_interface = ThreadInterface(
                 thread_serial_port=self.serial_interface,
                 serial_speed=self.serial_speed,
+                frame_delimiter=self.frame_delimiter,
+                read_timeout_in_secs=self.read_timeout_in_secs,
+                reconnect_min_delay_in_secs=self.reconnect_min_delay_in_secs,
+                reconnect_max_delay_in_secs=self.reconnect_max_delay_in_secs,
             )
 
             # Set keep alive callback
@@ -44,31 +64,45 @@ class ThreadManager:
             # Run thread donfgle interface in dedicated thread
             self.thread_dongle_interface.run_dedicated_thread()
 
+            # Single writer of the status frames
+            self.dongle_status_writer = DongleStatusWriter(
+                write=self.thread_dongle_interface.write_message_to_dongle,
+                refresh_period_in_secs=app.config[
+                    "THREAD_DONGLE_STATUS_REFRESH_PERIOD_IN_SECS"
+                ],
+            )
+
     def set_msg_reception_callback(self, callback: callable):
         """Set message reception callback"""
         self.thread_dongle_interface.set_msg_reception_callback(callback)
 
-    def keep_alive_reception_callback(self, node_id: str):
+    def get_dongle_counters(self) -> dict:
+        """Return Thread dongle reception, framing, status writer and nodes counters"""
+        return {
+            "reception": self.thread_dongle_interface.get_counters(),
+            "status_writer": self.dongle_status_writer.get_counters(),
+            "nodes": self.node_registry.get_metrics(),
+        }
+
+    def keep_alive_reception_callback(self, node_id: str, rssi: int = None):
         """Callback for node keep alive reception"""
-        self.nodes_ka_dict[node_id] = datetime.now()
+        self.node_registry.record_keep_alive(node_id=node_id, rssi=rssi)
 
-    def get_connected_nodes(self):
-        """Return the connected nodes and the last time seen"""
-        return self.nodes_ka_dict
+    def add_node_event_callback(self, callback: callable):
+        """Add a callback(event, node_id) called when a node joins or leaves"""
+        self.node_registry.add_event_callback(callback)
 
-    def update_connected_nodes(self):
-        """Update connected nodes"""
-        nodes_to_delete = []
-        now = datetime.now()
+    def record_connected_nodes(self, event: str, node_id: str):
+        """Commit the connected nodes to the device state on join and leave"""
+        device_state_store.set(THREAD_NODES, frozenset(self.node_registry.get_snapshot()))
 
-        # Get nodes to delete
-        for node in self.nodes_ka_dict:
-            if self.nodes_ka_dict[node] < (now - timedelta(minutes=1)):
-                nodes_to_delete.append(node)
+    def get_connected_nodes(self) -> dict:
+        """Return the connected nodes and the last time seen (HH:MM:SS)"""
+        return self.node_registry.get_snapshot()
 
-        # Update connected nodes dictionary
-        for node_to_delete_id in nodes_to_delete:
-            del self.nodes_ka_dict[node_to_delete_id]
+    def get_connected_nodes_stats(self) -> list:
+        """Return the connected nodes with their keep alive and RSSI stats"""
+        return self.node_registry.get_nodes()
 
     def update_status_in_dongle(
         self,
@@ -94,17 +128,15 @@ class ThreadManager:
         # Get presence status from us
         presence = "PRESENCE" in use_situation
 
-        # Get power strip status
-        msg_power_strip = self.power_strip_relays_to_str(power_strip_relays_statuses)
-
-        # Build message
-        msg_wifi = "wifi:1" if wifi_status else "wifi:0"
-        msg_prs = "prs:1" if presence else "prs:0"
-        msg_ele = "ele:1" if electrycity_status else "ele:0"
-        message = msg_wifi + msg_prs + msg_ele + msg_power_strip
-        logger.info(f"MSG: {message}")
-        if not self.thread_dongle_interface.write_message_to_dongle(message):
-            logger.error(f"Error sending status to dongle")
+        # Merge status in the next frame sent to the dongle
+        status = {
+            "wifi": "1" if wifi_status else "0",
+            "prs": "1" if presence else "0",
+            "ele": "1" if electrycity_status else "0",
+        }
+        if power_strip_relays_statuses is not None:
+            status["outlet"] = self.power_strip_relays_to_str(power_strip_relays_statuses)
+        self.dongle_status_writer.update(**status)
 
     def update_power_strip_status_in_dongle(
         self,
@@ -118,12 +150,10 @@ class ThreadManager:
         if power_strip_relay_statuses is None:
             raise ServerBoxException(ErrorCode.RELAYS_STATUS_NOT_RECEIVED)
 
-        # Format relays status to str
-        msg_power_strip = self.power_strip_relays_to_str(power_strip_relay_statuses)
-
-        logger.info(f"MSG: {msg_power_strip}")
-        if not self.thread_dongle_interface.write_message_to_dongle(msg_power_strip):
-            logger.error(f"Error sending status to dongle")
+        # Merge relays status in the next frame sent to the dongle
+        self.dongle_status_writer.update(
+            outlet=self.power_strip_relays_to_str(power_strip_relay_statuses)
+        )
 
     def power_strip_relays_to_str(self, power_strip_relay_statuses: RelaysStatus):
         """Convert relays status to str to send message to thread dongle"""
@@ -147,8 +177,8 @@ class ThreadManager:
                 r4_status = '1' if relay_status.status else '0'
                 continue
 
-        # Concatenate message to send
-        return f"outlet:{r1_status}{r2_status}{r3_status}{r4_status}"
+        # Concatenate outlet status to send
+        return f"{r1_status}{r2_status}{r3_status}{r4_status}"
 
 thread_manager_service: ThreadManager = ThreadManager()
 """ Thread manager service singleton"""
@@ -0,0 +1,113 @@
+"""
+Thread dongle status writer, single writer of the status frames sent to
+the dongle
+"""
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Status fields in frame order
+STATUS_FIELDS = ["wifi", "prs", "ele", "outlet"]
+
+# Wait for the updates sent together before writing
+COALESCE_DELAY_IN_SECS = 0.05
+
+
+class DongleStatusWriter:
+    """
+    Merge the status updates in a single frame and write it from a
+    dedicated thread. A frame identical to the last written one is sent
+    again only at the refresh period
+    """
+
+    def __init__(self, write: callable, refresh_period_in_secs: float):
+        self.write = write
+        self.refresh_period_in_secs = refresh_period_in_secs
+        self.status = dict.fromkeys(STATUS_FIELDS)
+        self.last_written_frame = None
+        # Time of the next write even without update, None before the first write
+        self.refresh_at = None
+        self.pending = False
+        self.condition = threading.Condition()
+        self.counters = {
+            "updates": 0,
+            "updates_merged": 0,
+            "frames_written": 0,
+            "frames_suppressed": 0,
+            "refreshes": 0,
+            "write_errors": 0,
+        }
+        self.thread = threading.Thread(
+            target=self.run, name="ThreadDongleStatusWriter", daemon=True
+        )
+        self.thread.start()
+
+    def update(self, **fields):
+        """Merge status fields {wifi, prs, ele, outlet} in the next frame"""
+        with self.condition:
+            self.counters["updates"] += 1
+            if self.pending:
+                self.counters["updates_merged"] += 1
+            self.status.update(fields)
+            self.pending = True
+            self.condition.notify()
+
+    def build_frame(self) -> str:
+        """Build frame from the known status fields"""
+        return "".join(
+            f"{field}:{self.status[field]}"
+            for field in STATUS_FIELDS
+            if self.status[field] is not None
+        )
+
+    def run(self):
+        """Writer loop"""
+        while True:
+            with self.condition:
+                while not self.pending:
+                    if self.refresh_at is None:
+                        self.condition.wait()
+                        continue
+                    timeout = self.refresh_at - time.monotonic()
+                    if timeout <= 0:
+                        break
+                    self.condition.wait(timeout)
+
+            # Let the updates sent together be merged
+            time.sleep(COALESCE_DELAY_IN_SECS)
+
+            with self.condition:
+                frame = self.build_frame()
+                refresh = not self.pending
+                self.pending = False
+                if frame == self.last_written_frame and time.monotonic() < self.refresh_at:
+                    self.counters["frames_suppressed"] += 1
+                    continue
+
+            try:
+                written = self.write(frame)
+            except Exception as e:
+                logger.error(f"Error writing to dongle: {e}")
+                written = False
+
+            with self.condition:
+                self.refresh_at = time.monotonic() + self.refresh_period_in_secs
+                if written:
+                    self.last_written_frame = frame
+                    self.counters["frames_written"] += 1
+                    if refresh:
+                        self.counters["refreshes"] += 1
+                else:
+                    logger.error(f"Error sending status to dongle, frame: {frame}")
+                    self.counters["write_errors"] += 1
+                    # Not suppressed at the next update, retried at next refresh
+                    self.last_written_frame = None
+
+    def get_counters(self) -> dict:
+        """Return writer counters"""
+        with self.condition:
+            counters = dict(self.counters)
+            counters["last_written_frame"] = self.last_written_frame
+        return counters
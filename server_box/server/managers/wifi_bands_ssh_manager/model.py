@@ -1,19 +1,27 @@
 """Data model for Wifi manager package"""
 from dataclasses import dataclass
-from typing import Iterable
+from typing import Iterable, Tuple
 
 
-@dataclass
+@dataclass(frozen=True)
 class WifiBandStatus:
     """Model for wifi band status"""
 
+    __slots__ = ("band", "status")
+
     band: str
     status: bool
 
 
-@dataclass
+@dataclass(frozen=True)
 class WifiStatus:
-    """Model for wifi status"""
+    """Model for wifi status, immutable snapshot"""
+
+    __slots__ = ("status", "bands_status")
 
     status: bool
-    bands_status: Iterable[WifiBandStatus]
+    bands_status: Tuple[WifiBandStatus, ...]
+
+    def __init__(self, status: bool, bands_status: Iterable[WifiBandStatus]):
+        object.__setattr__(self, "status", status)
+        object.__setattr__(self, "bands_status", tuple(bands_status))
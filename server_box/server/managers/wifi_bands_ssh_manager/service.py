@@ -1,14 +1,20 @@
 import logging
-import http.client as httplib
 from typing import Iterable
 from flask import Flask
 import yaml
 import time
-from datetime import datetime, timedelta
-from server.interfaces.box_interface_ssh import box_ssh_interface
+from concurrent.futures import Future
+from datetime import datetime
+from server.interfaces.box_interface_ssh import (
+    box_ssh_interface,
+    box_ssh_connection_pool,
+)
 from server.interfaces.mqtt_interface import RelaysStatus
 from server.managers.mqtt_manager import mqtt_manager_service
+from server.managers.connectivity_manager import connectivity_manager_service
 from server.common import ServerBoxException, ErrorCode
+from server.common.executor import KeyedExecutor
+from server.common.device_state import device_state_store, state_property, WIFI_STATUS
 from .model import WifiBandStatus, WifiStatus
 
 
@@ -16,6 +22,11 @@ logger = logging.getLogger(__name__)
 
 BANDS = ["2.4GHz", "5GHz", "6GHz"]
 STATUS_CHANGE_TIMEOUT_IN_SECS = 15
+STATUS_POLLING_INITIAL_DELAY_IN_SECS = 0.1
+STATUS_POLLING_MAX_DELAY_IN_SECS = 2
+BATCH_OUTPUT_DELIMITER = "__SERVER_BOX_BATCH__"
+# Status change executor key of the general wifi status, the bands are keyed by band
+WIFI_STATUS_CHANGE_KEY = "wifi"
 
 
 class WifiBandsManager:
@@ -26,8 +37,11 @@ class WifiBandsManager:
     livebox_login: str = None
     livebox_password: str = None
     ssh_timeout_in_secs: float = 5
+    ssh_pool: box_ssh_connection_pool = None
+    batched_status_query: bool = False
+    status_change_executor: KeyedExecutor = None
     commands = {}
-    wifi_status: WifiStatus = None
+    wifi_status: WifiStatus = state_property(WIFI_STATUS, "Last known wifi status")
     mqtt_wifi_status_relays_topic: str
     last_counter_rxbytes: int
     last_counter_txbytes: int
@@ -52,8 +66,26 @@ class WifiBandsManager:
             self.mqtt_wifi_status_relays_topic = app.config[
                 "MQTT_WIFI_STATUS_RELAYS_TOPIC"
             ]
+            self.batched_status_query = app.config["SSH_BATCHED_STATUS_QUERY"]
             self.load_commands(app.config["LIVEBOX_SSH_COMMANDS"])
 
+            # Create persistent ssh sessions pool
+            self.ssh_pool = box_ssh_connection_pool(
+                host=self.livebox_ip_address,
+                port=self.livebox_ssh_port,
+                user=self.livebox_login,
+                password=self.livebox_password,
+                timeout_in_secs=self.ssh_timeout_in_secs,
+                max_sessions=app.config["SSH_POOL_MAX_SESSIONS"],
+                idle_timeout_in_secs=app.config["SSH_POOL_IDLE_TIMEOUT_IN_SECS"],
+            )
+
+            # Workers for asynchronous status changes, one per band, the
+            # changes of the same band are applied in submission order
+            self.status_change_executor = KeyedExecutor(
+                max_workers=len(BANDS), name="WifiStatusChange"
+            )
+
     def create_ssh_connection(self) -> box_ssh_interface:
         """Create wifi ssh interface object for commands"""
         # Create ssh connection
@@ -75,18 +107,14 @@ class WifiBandsManager:
             except yaml.YAMLError as exc:
                 raise ServerBoxException(ErrorCode.COMMANDS_FILE_ERROR)
 
-    def execute_commands(self, dictionary_keys: Iterable[str], station_mac: str=None):
-        """
-        Create a ssh connection and execute a command or a group of commands
-        in ssh host
-        """
-        # Retreive commands
+    def get_commands(self, dictionary_keys: Iterable[str]):
+        """Retrieve a command or a group of commands from the commands dict"""
         new_element = self.commands
         for key in dictionary_keys:
             try:
                 new_element = new_element[key]
             except:
-                logger.error("Item not found in commands: ", str[dictionary_keys])
+                logger.error(f"Item not found in commands: {dictionary_keys}")
                 raise ServerBoxException(ErrorCode.COMMAND_NOT_FOUND)
 
         commands = new_element
@@ -95,9 +123,26 @@ class WifiBandsManager:
         if not isinstance(commands, (str, list)):
             raise ServerBoxException(ErrorCode.COMMAND_NOT_FOUND)
 
-        # create ssh connection
-        ssh_connection = self.create_ssh_connection()
+        return commands
+
+    def execute_commands(
+        self, dictionary_keys: Iterable[str], station_mac: str = None, ssh_connection=None
+    ):
+        """
+        Execute a command or a group of commands in ssh host, use the given ssh
+        session or borrow one from the pool
+        """
+        # Retreive commands
+        commands = self.get_commands(dictionary_keys)
+
+        # Borrow ssh session from the pool
+        if ssh_connection is None:
+            with self.ssh_pool.session() as ssh_connection:
+                return self.send_commands(ssh_connection, commands, station_mac)
+        return self.send_commands(ssh_connection, commands, station_mac)
 
+    def send_commands(self, ssh_connection, commands, station_mac: str = None):
+        """Send a command or a group of commands in a ssh session"""
         if isinstance(commands, str):
             # replace station mac if needed
             if station_mac and "STATION" in commands:
@@ -115,16 +160,89 @@ class WifiBandsManager:
                 command_output = ssh_connection.send_command(command=command)
                 output.append(command_output)
 
-        # Close ssh connection
-        ssh_connection.close()
-
         # return command.s output
         return output
 
-    def get_wifi_status(self):
+    def execute_batched_commands(self, commands: Iterable[str]) -> dict:
+        """
+        Execute a group of commands in a single remote shell invocation,
+        return a dict with the output of each command
+        """
+        # Remove duplicated commands keeping the order
+        unique_commands = list(dict.fromkeys(commands))
+
+        # Build the remote script, each command output is preceded by a delimiter
+        script = "; ".join(
+            f"echo {BATCH_OUTPUT_DELIMITER}{idx}; {command}"
+            for idx, command in enumerate(unique_commands)
+        )
+        script += f"; echo {BATCH_OUTPUT_DELIMITER}end"
+
+        # Execute script in a single ssh exec
+        with self.ssh_pool.session() as ssh_connection:
+            script_output = ssh_connection.send_command(script)
+
+        # Split the script output
+        outputs = {}
+        current_idx = None
+        current_lines = []
+        completed = False
+        for line in script_output.splitlines():
+            if line.startswith(BATCH_OUTPUT_DELIMITER):
+                if current_idx is not None:
+                    outputs[unique_commands[current_idx]] = "\n".join(current_lines)
+                marker = line[len(BATCH_OUTPUT_DELIMITER):]
+                if marker == "end":
+                    completed = True
+                    break
+                current_idx = int(marker)
+                current_lines = []
+                continue
+            current_lines.append(line)
+
+        if not completed or len(outputs) != len(unique_commands):
+            logger.error("Incomplete output for batched commands")
+            raise ServerBoxException(ErrorCode.SSH_CONNECTION_ERROR)
+
+        return outputs
+
+    def get_wifi_status_batched(self) -> WifiStatus:
+        """
+        Retrieve wifi general and bands status with a single ssh exec
+        merging the status commands of the commands file
+        """
+        wifi_status_commands = self.get_commands(["WIFI", "status"])
+        if isinstance(wifi_status_commands, str):
+            wifi_status_commands = [wifi_status_commands]
+        bands_status_commands = {
+            band: self.get_commands(["WIFI", "bands", band, "status"]) for band in BANDS
+        }
+
+        try:
+            outputs = self.execute_batched_commands(
+                wifi_status_commands + list(bands_status_commands.values())
+            )
+        except ServerBoxException as e:
+            logger.error(e.message)
+            return None
+
+        # Parse wifi status, same rules as in get_wifi_status and get_band_status
+        status = "up" in [outputs[command] for command in wifi_status_commands]
+        bands_status = []
+        for band, command in bands_status_commands.items():
+            band_output = outputs[command]
+            bands_status.append(
+                WifiBandStatus(band=band, status=bool(band_output) and "up" in band_output)
+            )
+
+        return WifiStatus(status=status, bands_status=bands_status)
+
+    def get_wifi_status(self, ssh_connection=None):
         """Execute get wifi status command in the livebox using ssh service"""
         try:
-            commands_response = self.execute_commands(["WIFI", "status"])
+            commands_response = self.execute_commands(
+                ["WIFI", "status"], ssh_connection=ssh_connection
+            )
         except Exception as e:
             return None
 
@@ -134,46 +252,72 @@ class WifiBandsManager:
     def set_wifi_status(self, status: bool):
         """Execute set wifi status command in the livebox using ssh service"""
 
-        # set max duration timmer
-        start = datetime.now()
-        status_change_timeout = start + timedelta(seconds=STATUS_CHANGE_TIMEOUT_IN_SECS)
+        try:
+            # Use a single ssh session for the check and the change
+            with self.ssh_pool.session() as ssh_connection:
+                # check if requested status is already satisfied
+                current_wifi_status = self.get_wifi_status(ssh_connection=ssh_connection)
+                if current_wifi_status is None:
+                    return None
+                if current_wifi_status == status:
+                    return current_wifi_status
 
-        # check if requested status is already satisfied
-        current_wifi_status = self.get_wifi_status()
-        if current_wifi_status is None:
-            return None
-        if current_wifi_status == status:
-            return current_wifi_status
+                # execute wifi status change command
+                self.execute_commands(["WIFI", status], ssh_connection=ssh_connection)
 
-        # execute wifi status change command
-        try:
-            self.execute_commands(["WIFI", status])
-        except ServerBoxException:
+            # Wait for the status change, the session is borrowed per poll only
+            current_wifi_status = self.wait_for_status_change(
+                get_status=self.get_wifi_status, status=status
+            )
+        except ServerBoxException as e:
+            logger.error(e.message)
             return None
 
-        # set max duration timmer
-        now = datetime.now()
-        status_change_timeout = now + timedelta(seconds=STATUS_CHANGE_TIMEOUT_IN_SECS)
+        if current_wifi_status is None:
+            raise ServerBoxException(ErrorCode.STATUS_CHANGE_TIMER)
+        self.record_wifi_status(status=current_wifi_status)
+        return current_wifi_status
+
+    def record_wifi_status(self, status: bool):
+        """Update the known wifi status after a general status change"""
+
+        def apply(wifi_status: WifiStatus) -> WifiStatus:
+            if wifi_status is None:
+                return None
+            return WifiStatus(
+                status=status,
+                bands_status=[
+                    WifiBandStatus(band=band_status.band, status=status)
+                    for band_status in wifi_status.bands_status
+                ],
+            )
 
-        # Waiting loop
-        status_change_trys = 0
-        while now < status_change_timeout:
-            current_wifi_status = self.get_wifi_status()
-            if current_wifi_status is status:
-                return current_wifi_status
-            time.sleep(0.2)
-            now = datetime.now()
-            status_change_trys += 1
+        # Applied on the current value, the concurrent changes are kept
+        device_state_store.modify(WIFI_STATUS, apply)
 
-        raise ServerBoxException(ErrorCode.STATUS_CHANGE_TIMER)
+    def set_wifi_status_async(self, status: bool, callback: callable = None) -> Future:
+        """
+        Launch wifi status change in a dedicated worker, return a future with
+        the set_wifi_status result. The optional callback receives the future
+        when the status change is done
+        """
+        future = self.status_change_executor.submit(
+            WIFI_STATUS_CHANGE_KEY, self.set_wifi_status, status
+        )
+        future.add_done_callback(self.log_status_change_error)
+        if callback is not None:
+            future.add_done_callback(callback)
+        return future
 
-    def get_band_status(self, band: str):
+    def get_band_status(self, band: str, ssh_connection=None):
         """Execute get wifi band status command in the livebox using ssh service"""
         # Check if band number exists
         if band not in BANDS:
             raise ServerBoxException(ErrorCode.UNKNOWN_BAND_WIFI)
         try:
-            commands_response = self.execute_commands(["WIFI", "bands", band, "status"])
+            commands_response = self.execute_commands(
+                ["WIFI", "bands", band, "status"], ssh_connection=ssh_connection
+            )
         except ServerBoxException as e:
             logger.error(e.message)
             return None
@@ -190,39 +334,100 @@ class WifiBandsManager:
         if band not in BANDS:
             raise ServerBoxException(ErrorCode.UNKNOWN_BAND_WIFI)
 
-        # set max duration timmer
-        start = datetime.now()
-        status_change_timeout = start + timedelta(seconds=STATUS_CHANGE_TIMEOUT_IN_SECS)
+        try:
+            # Use a single ssh session for the check and the change
+            with self.ssh_pool.session() as ssh_connection:
+                # check if requested status is already satisfied
+                current_band_status = self.get_band_status(
+                    band, ssh_connection=ssh_connection
+                )
+                if current_band_status is None:
+                    logger.error("Error when getting band status")
+                    return None
+                if current_band_status == status:
+                    return current_band_status
 
-        # check if requested status is already satisfied
-        current_band_status = self.get_band_status(band)
-        if current_band_status is None:
-            logger.error("Error when getting band status")
-            return None
-        if current_band_status == status:
-            return current_band_status
+                # execute wifi status change command
+                self.execute_commands(
+                    ["WIFI", "bands", band, status], ssh_connection=ssh_connection
+                )
 
-        # execute wifi status change command
-        try:
-            self.execute_commands(["WIFI", "bands", band, status])
+            # Wait for the status change, the session is borrowed per poll only
+            current_band_status = self.wait_for_status_change(
+                get_status=lambda: self.get_band_status(band), status=status
+            )
         except ServerBoxException as e:
             logger.error(e.message)
             return None
 
-        # set max duration timmer
-        now = datetime.now()
-        status_change_timeout = now + timedelta(seconds=STATUS_CHANGE_TIMEOUT_IN_SECS)
-
-        # Waiting loop
-        status_change_trys = 0
-        while now < status_change_timeout:
-            current_band_status = self.get_band_status(band)
-            if current_band_status is status:
-                return current_band_status
-            time.sleep(0.2)
-            now = datetime.now()
-            status_change_trys += 1
-        logger.error(f"Wifi status change is taking too long, verify wifi status")
+        if current_band_status is None:
+            logger.error(f"Wifi status change is taking too long, verify wifi status")
+            return None
+        self.record_band_status(band=band, status=current_band_status)
+        return current_band_status
+
+    def record_band_status(self, band: str, status: bool):
+        """Update the known wifi status after a band status change"""
+
+        def apply(wifi_status: WifiStatus) -> WifiStatus:
+            if wifi_status is None:
+                return None
+            bands_status = [
+                WifiBandStatus(band=band, status=status)
+                if band_status.band == band
+                else band_status
+                for band_status in wifi_status.bands_status
+            ]
+            return WifiStatus(
+                status=any(band_status.status for band_status in bands_status),
+                bands_status=bands_status,
+            )
+
+        # Applied on the current value, the other bands changes are kept
+        device_state_store.modify(WIFI_STATUS, apply)
+
+    def set_band_status_async(
+        self, band: str, status: bool, callback: callable = None
+    ) -> Future:
+        """
+        Launch wifi band status change in a dedicated worker, return a future
+        with the set_band_status result. The optional callback receives the
+        future when the status change is done
+        """
+        # Check if the band exists
+        if band not in BANDS:
+            raise ServerBoxException(ErrorCode.UNKNOWN_BAND_WIFI)
+
+        future = self.status_change_executor.submit(
+            band, self.set_band_status, band, status
+        )
+        future.add_done_callback(self.log_status_change_error)
+        if callback is not None:
+            future.add_done_callback(callback)
+        return future
+
+    def log_status_change_error(self, future: Future):
+        """Log the exception raised in an asynchronous status change"""
+        exception = future.exception()
+        if exception is not None:
+            logger.error(f"Error in asynchronous wifi status change: {exception}")
+
+    def wait_for_status_change(self, get_status: callable, status: bool):
+        """
+        Poll the status with exponential backoff until it matches the requested
+        one, return None if the status change timeout expires
+        """
+        status_change_timeout = time.monotonic() + STATUS_CHANGE_TIMEOUT_IN_SECS
+        delay = STATUS_POLLING_INITIAL_DELAY_IN_SECS
+        while True:
+            time.sleep(delay)
+            current_status = get_status()
+            if current_status is status:
+                return current_status
+            remaining = status_change_timeout - time.monotonic()
+            if remaining <= 0:
+                return None
+            delay = min(delay * 2, STATUS_POLLING_MAX_DELAY_IN_SECS, remaining)
 
     def get_connected_stations_mac_list(self, band=None) -> Iterable[str]:
         """Execute get connected stations in the livebox using ssh service"""
@@ -266,36 +471,38 @@ class WifiBandsManager:
 
     def update_wifi_status_attribute(self) -> WifiStatus:
         """Retrieve wifi status and update wifi_status attribute"""
+        if self.batched_status_query:
+            wifi_status = self.get_wifi_status_batched()
+            if wifi_status is None:
+                return None
+            self.wifi_status = wifi_status
+            return self.wifi_status
+
         status = self.get_wifi_status()
         if status is None:
             return None
         bands_status = []
 
         for band in BANDS:
-            band_status = WifiBandStatus(
-                band=band, status=wifi_bands_manager_service.get_band_status(band=band)
-            )
+            band_status = self.get_band_status(band=band)
             if band_status is None:
                 return None
-            bands_status.append(band_status)
+            bands_status.append(WifiBandStatus(band=band, status=band_status))
 
         self.wifi_status = WifiStatus(status=status, bands_status=bands_status)
         return self.wifi_status
 
+    def get_ssh_pool_metrics(self) -> dict:
+        """Retrieve ssh sessions pool metrics"""
+        return self.ssh_pool.get_metrics()
+
     def get_current_wifi_status(self) -> WifiStatus:
         """Retrieve current wifi² status"""
         return self.wifi_status
 
     def is_connected_to_internet(self) -> bool:
         """Check internet connection"""
-        conn = httplib.HTTPSConnection("8.8.8.8", timeout=5)
-        try:
-            conn.request("HEAD", "/")
-            return True
-        except Exception:
-            return False
-        finally:
-            conn.close()
+        return connectivity_manager_service.is_connected_to_internet()
 
     def publish_wifi_status_mqtt_relays(self, relays_status: RelaysStatus):
         """publish MQTT relays status command"""
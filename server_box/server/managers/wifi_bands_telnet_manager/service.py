@@ -1,6 +1,5 @@
 import logging
 import subprocess
-import urllib.request
 from typing import Iterable
 from flask import Flask
 import yaml
@@ -10,6 +9,7 @@ from telnetlib import Telnet
 from server.interfaces.box_interface_telnet import box_telnet_interface
 from server.interfaces.mqtt_interface import RelaysStatus
 from server.managers.mqtt_manager import mqtt_manager_service
+from server.managers.connectivity_manager import connectivity_manager_service
 from server.common import ServerBoxException, ErrorCode
 from .model import WifiBandStatus, WifiStatus
 
@@ -303,11 +303,7 @@ class WifiBandsManager:
 
     def is_connected_to_internet(self) -> bool:
         """Check internet connection"""
-        try:
-            urllib.request.urlopen("http://google.com")
-            return True
-        except:
-            return False
+        return connectivity_manager_service.is_connected_to_internet()
 
     def publish_wifi_status_mqtt_relays(self, relays_status: RelaysStatus):
         """publish MQTT relays status command"""
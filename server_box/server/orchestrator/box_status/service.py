@@ -1,7 +1,6 @@
 import logging
-import time
 from server.managers.mqtt_liveobjects_manager import mqtt_liveobjects_manager_service
-from server.managers.wifi_bands_ssh_manager import wifi_bands_manager_service
+from server.managers.connectivity_manager import connectivity_manager_service
 from server.orchestrator.use_situations import orchestrator_use_situations_service
 from server.orchestrator.live_objects import live_objects_service
 from server.common.authentication import ClientsRemoteAuth
@@ -84,14 +83,11 @@ class BoxStatusManager:
 
         # Wait for internet connection
         logger.info(f"Waitting for internet connection ...")
-        start = time.time()
-        elapsed_time = time.time() - start
-        while not wifi_bands_manager_service.is_connected_to_internet():
-            elapsed_time = time.time() - start
-            if elapsed_time > self.internet_connection_timeout_in_secs:
-                logger.error(f"Internet connection timeout")
-                return False
-            time.sleep(0.5)
+        if not connectivity_manager_service.wait_for_connection(
+            timeout_in_secs=self.internet_connection_timeout_in_secs
+        ):
+            logger.error(f"Internet connection timeout")
+            return False
 
         # Publish token in liveobjects
         live_objects_service.publish_data(data_to_send=data_to_send, tags=["token"])
@@ -18,6 +18,7 @@ class OrchestratorCommands:
     # Attributes
     current_commands: dict = {}
     commands_dict: dict = {}
+    command_handlers: dict = {}
 
     def init_commands_module(self, orchestrator_commands_file: str):
         """Initialize the requests callbacks for the orchestrator"""
@@ -25,14 +26,32 @@ class OrchestratorCommands:
         self.commands_dict = {}
         self.current_commands = {}
 
+        # Command handlers by ressource, called with the command argument
+        self.command_handlers = {
+            "wifi": self.execute_wifi_commmand,
+            "wifisw": lambda command: self.execute_wifi_switch_status_commmand(),
+            "wifiswb": self.execute_wifi_switch_band_status_commmand,
+            "ep": self.execute_electrical_pannel_commmand,
+            "epsw": lambda command: self.execute_electrical_pannel_switch_commmand(),
+            "resw": self.execute_relay_switch_commmand,
+            "us": lambda command: self.execute_use_situations_commmand(
+                command.replace("-", "_")
+            ),
+            "prs": lambda command: self.execute_presence_commmand(),
+        }
+
         # Load commands file
         with open(orchestrator_commands_file) as stream:
             try:
                 configuration = yaml.safe_load(stream)
                 for command in configuration["COMMANDS_LIST"]:
+                    # Split once at load, {ressource}_{command}
+                    ressource, _, argument = command["command"].partition("_")
                     self.commands_dict[command["id"]] = {
                         "name": command["name"],
                         "command": command["command"],
+                        "ressource": ressource,
+                        "argument": argument,
                     }
 
                 # Set predefined commands
@@ -57,41 +76,19 @@ class OrchestratorCommands:
             return False
 
         # Retrieve command to execute
-        command = self.current_commands[command_number]["command"]
-        logger.info(f"Executing command: {command}")
+        command = self.current_commands[command_number]
+        logger.info(f"Executing command: {command['command']}")
 
         # Execute command
-        return self.execute_command(command)
+        return self.execute_command(command["ressource"], command["argument"])
 
-    def execute_command(self, msg: str):
-        """Execute a command in the orchestrator"""
-        try:
-            ressource, command = msg.split("_")
-        except:
-            logger.error("Error in command format")
+    def execute_command(self, ressource: str, command: str):
+        """Execute a command for a ressource in the orchestrator"""
+        handler = self.command_handlers.get(ressource)
+        if handler is None:
+            logger.error(f"Error in command format, unknown ressource {ressource}")
             return False
-
-        # Execute command for requested ressource
-        if ressource == "wifi":
-            return self.execute_wifi_commmand(command)
-        if ressource == "wifisw":
-            return self.execute_wifi_switch_status_commmand()
-        if ressource == "wifiswb":
-            return self.execute_wifi_switch_band_status_commmand(command)
-        if ressource == "ep":
-            return self.execute_electrical_pannel_commmand(command)
-        if ressource == "epsw":
-            return self.execute_electrical_pannel_switch_commmand()
-        if ressource == "resw":
-            return self.execute_relay_switch_commmand(command)
-        if ressource == "us":
-            command = command.replace("-", "_")
-            return self.execute_use_situations_commmand(command)
-        if ressource == "prs":
-            return self.execute_presence_commmand()
-
-        logger.error("Error in command format")
-        return False
+        return handler(command)
 
     def execute_wifi_commmand(self, command: str):
         """
@@ -265,6 +262,7 @@ class OrchestratorCommands:
         electrical_panel_manager_service.publish_mqtt_relays_status_command(
             relays_statuses
         )
+        return True
 
     def execute_use_situations_commmand(self, command: str):
         """
@@ -0,0 +1,160 @@
+"""
+LiveObjects publisher, drains the send queue by priority and merges the
+compatible messages before publishing them
+"""
+import hashlib
+import itertools
+import logging
+import threading
+from queue import PriorityQueue, Full, Empty
+from typing import Iterable, List
+
+logger = logging.getLogger(__name__)
+
+# Lower value is sent first
+TAGS_PRIORITY = {"alarm": 0, "token": 1, "status": 2}
+DEFAULT_PRIORITY = 3
+
+
+class LiveObjectsPublisher:
+    """
+    Dedicated publisher thread. Pending alarms are merged in a single
+    {"al": {alarm_type: count}} message, the counts of the same alarm type
+    are summed, and only the latest pending status is sent.
+    publish returns a Future[bool], the failed messages go to overflow
+    """
+
+    def __init__(
+        self,
+        publish: callable,
+        overflow: callable,
+        max_queue_size: int,
+        batch_size: int,
+    ):
+        self.publish = publish
+        self.overflow = overflow
+        self.batch_size = batch_size
+        self.queue = PriorityQueue(maxsize=max_queue_size)
+        self._sequence = itertools.count()
+        self._metrics_lock = threading.Lock()
+        self._metrics = {
+            "queued": 0,
+            "published": 0,
+            "failed": 0,
+            "merged": 0,
+            "coalesced": 0,
+            "overflowed": 0,
+        }
+        self.thread = threading.Thread(
+            target=self.run, name="LiveObjectsPublisher", daemon=True
+        )
+        self.thread.start()
+
+    @staticmethod
+    def get_priority(tags: Iterable[str]) -> int:
+        """Get message priority from its tags"""
+        return min(
+            (TAGS_PRIORITY.get(tag, DEFAULT_PRIORITY) for tag in tags),
+            default=DEFAULT_PRIORITY,
+        )
+
+    def put(self, element: dict):
+        """Queue a message {"topic": str, "data_to_send": {"value": dict, "tags": list}}"""
+        priority = self.get_priority(element["data_to_send"]["tags"])
+        try:
+            self.queue.put_nowait((priority, next(self._sequence), element))
+        except Full:
+            logger.error("Live Objects send queue full")
+            self._count("overflowed")
+            self.overflow(element)
+            return
+        self._count("queued")
+
+    def run(self):
+        """Publisher loop"""
+        while True:
+            batch = [self.queue.get()]
+            # Take what is already pending, without waiting
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except Empty:
+                    break
+
+            # Publish without waiting for the acknowledgments
+            for element in self.merge([element for _, _, element in batch]):
+                try:
+                    future = self.publish(element)
+                except Exception as e:
+                    logger.error(f"Error publishing to Live Objects: {e}")
+                    self.on_published(element, published=False)
+                    continue
+                future.add_done_callback(
+                    lambda future, element=element: self.on_published(
+                        element, published=future.result()
+                    )
+                )
+
+    def on_published(self, element: dict, published: bool):
+        """Count the publication, keep the message in the outbox if failed"""
+        if published:
+            self._count("published")
+        else:
+            self._count("failed")
+            self.overflow(element)
+
+    def merge(self, elements: List[dict]) -> List[dict]:
+        """Merge the alarms and keep only the latest status, other messages are kept"""
+        merged = []
+        alarms_message = None
+        alarms_dedup_keys = []
+        status_message = None
+        for element in elements:
+            tags = element["data_to_send"]["tags"]
+            value = element["data_to_send"]["value"]
+            if "alarm" in tags and set(value) == {"al"}:
+                if alarms_message is None:
+                    alarms_message = {
+                        "topic": element["topic"],
+                        "data_to_send": {"value": {"al": {}}, "tags": list(tags)},
+                    }
+                    merged.append(alarms_message)
+                else:
+                    self._count("merged")
+                    merged_tags = alarms_message["data_to_send"]["tags"]
+                    merged_tags.extend(tag for tag in tags if tag not in merged_tags)
+                if "dedup_key" in element:
+                    alarms_dedup_keys.append(element["dedup_key"])
+                # Same type alarms are counted, none is lost
+                alarms = alarms_message["data_to_send"]["value"]["al"]
+                for alarm_type, count in value["al"].items():
+                    alarms[alarm_type] = alarms.get(alarm_type, 0) + count
+            elif "status" in tags:
+                if status_message is not None:
+                    self._count("coalesced")
+                    merged.remove(status_message)
+                status_message = element
+                merged.append(status_message)
+            else:
+                merged.append(element)
+
+        # The merged alarms identity derives from the identity of its alarms
+        if len(alarms_dedup_keys) == 1:
+            alarms_message["dedup_key"] = alarms_dedup_keys[0]
+        elif alarms_dedup_keys:
+            alarms_message["dedup_key"] = hashlib.sha1(
+                "".join(alarms_dedup_keys).encode()
+            ).hexdigest()
+        return merged
+
+    def get_metrics(self) -> dict:
+        """Return publisher metrics"""
+        with self._metrics_lock:
+            metrics = dict(self._metrics)
+        metrics["queue_depth"] = self.queue.qsize()
+        return metrics
+
+    def _count(self, metric: str):
+        """Increment a metric"""
+        with self._metrics_lock:
+            self._metrics[metric] += 1
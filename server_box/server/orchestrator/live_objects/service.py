@@ -1,28 +1,46 @@
 import logging
-import json
-from queue import Queue
-from datetime import timedelta
-from timeloop import Timeloop
+from uuid import uuid4
 from typing import Iterable
+from concurrent.futures import Future
 from server.managers.wifi_bands_ssh_manager import wifi_bands_manager_service
 from server.managers.mqtt_liveobjects_manager import mqtt_liveobjects_manager_service
 from server.managers.alimelo_manager import alimelo_manager_service
+from server.orchestrator.outbox import notification_outbox_service, ALARM
+from .publisher import LiveObjectsPublisher
 
 logger = logging.getLogger(__name__)
 
-msg_send_timeloop = Timeloop()
+LIVE_OBJECTS_OUTBOX = "live_objects"
 
 class LiveObjects:
     commands_reception_topic: str
     data_send_topic: str
-    sent_queue: Queue
-
-    def init_live_objects_module(self, commands_reception_topic: str, data_send_topic: str) -> None:
+    publisher: LiveObjectsPublisher
+    status_not_sent_callback: callable = None
+
+    def init_live_objects_module(
+        self,
+        commands_reception_topic: str,
+        data_send_topic: str,
+        send_queue_size: int,
+        publish_batch_size: int,
+    ) -> None:
         # Interface to connect to Live Objects
         self.commands_reception_topic = commands_reception_topic
         self.data_send_topic = data_send_topic
-        self.sent_queue = Queue(maxsize = 5)
-        self.schedule_msg_sent_loop()
+
+        # Start messages publisher
+        self.publisher = LiveObjectsPublisher(
+            publish=self.publish_element,
+            overflow=self.store_in_outbox,
+            max_queue_size=send_queue_size,
+            batch_size=publish_batch_size,
+        )
+
+        # Replay the messages kept in the outbox
+        notification_outbox_service.register_sender(
+            destination=LIVE_OBJECTS_OUTBOX, sender=self.send_outbox_message
+        )
 
 
     def set_notifications_reception_callback(self, callback: callable):
@@ -30,6 +48,11 @@ class LiveObjects:
         self.live_objects_interface.set_notification_reception_callback(callback)
 
 
+    def set_status_not_sent_callback(self, callback: callable):
+        """Set callback called when a status message could not be published"""
+        self.status_not_sent_callback = callback
+
+
     def set_commands_reception_callback(self, callback: callable):
         """Set callback for commands reception from alimelo and from mqtt"""
 
@@ -64,31 +87,45 @@ class LiveObjects:
             logger.info("Connected to internet, sending datga via internet")
             # Add protocol used tag
             data_to_send_via_mqtt["tags"].append("livebox")
-            # Add element in sent queue
-            if not self.sent_queue.full():
-                element = {"topic":self.data_send_topic, "data_to_send": data_to_send_via_mqtt}
-                self.sent_queue.put_nowait(element)
-            #mqtt_liveobjects_manager_service.publish_message(topic=self.data_send_topic, message=data_to_send_via_mqtt)
+            # Add element in publisher queue
+            element = {"topic":self.data_send_topic, "data_to_send": data_to_send_via_mqtt}
+            if ALARM in data_to_send_via_mqtt["tags"]:
+                # Alarm event identity, an alarm stored twice is kept once
+                element["dedup_key"] = uuid4().hex
+            self.publisher.put(element)
         else:
             logger.info("Not connected to internet, sending data via Alimelo")
-            data = json.dumps(data_to_send).replace(" ", "")
-            alimelo_manager_service.send_data_to_live_objects(data)
+            alimelo_manager_service.send_data_to_live_objects(data_to_send)
 
-    def schedule_msg_sent_loop(self):
-        """Start msg sent periodic"""
+    def publish_element(self, element: dict) -> Future:
+        """Publish a message of the publisher queue, return a Future[bool]"""
+        return mqtt_liveobjects_manager_service.publish_message(
+            topic=element["topic"], message=element["data_to_send"]
+        )
+
+    def get_publisher_metrics(self) -> dict:
+        """Get Live Objects publisher metrics"""
+        return self.publisher.get_metrics()
+
+    def store_in_outbox(self, element: dict):
+        """Keep a message in the outbox, status messages supersede the previous ones"""
+        tags = element["data_to_send"]["tags"]
+        kind = tags[0] if tags else "data"
+        if kind == "status" and self.status_not_sent_callback is not None:
+            self.status_not_sent_callback()
+        notification_outbox_service.put(
+            destination=LIVE_OBJECTS_OUTBOX,
+            kind=kind,
+            payload=element,
+            coalesce_key="status" if kind == "status" else None,
+            dedup_key=element.get("dedup_key"),
+        )
 
-        # Start wifi status polling service
-        @msg_send_timeloop.job(
-            interval=timedelta(seconds=1)
+    def send_outbox_message(self, element: dict) -> bool:
+        """Publish a message replayed from the outbox, False if it could not be sent"""
+        return mqtt_liveobjects_manager_service.publish_message(
+            topic=element["topic"], message=element["data_to_send"], wait=True
         )
-        def send_messages_in_queue():
-            # Send messages in queue
-            if self.sent_queue.qsize() > 0 :
-                element = self.sent_queue.get_nowait()
-                topic = element["topic"]
-                data_to_send = element["data_to_send"]
-                mqtt_liveobjects_manager_service.publish_message(topic=topic, message=data_to_send)
 
 
-        msg_send_timeloop.start(block=False)
 live_objects_service: LiveObjects = LiveObjects()
@@ -0,0 +1,175 @@
+"""
+HTTP notification dispatcher, posts the cloud notifications from a fixed
+pool of workers sharing keep-alive connections
+"""
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+DROP_OLDEST = "DROP_OLDEST"
+DROP_NEWEST = "DROP_NEWEST"
+OVERFLOW_POLICIES = [DROP_OLDEST, DROP_NEWEST]
+
+
+class _Notification:
+    """Notification waiting in the dispatcher queue"""
+
+    __slots__ = ("url", "data", "critical", "future", "enqueued_at")
+
+    def __init__(self, url: str, data: dict, critical: bool):
+        self.url = url
+        self.data = data
+        self.critical = critical
+        self.future = Future()
+        self.enqueued_at = time.monotonic()
+
+
+class HttpNotificationDispatcher:
+    """
+    Bounded HTTP POST dispatcher. When the queue is full the overflow policy
+    decides which notification is dropped, critical notifications (alarms)
+    are dropped only if the queue holds nothing else
+    """
+
+    def __init__(
+        self,
+        max_workers: int,
+        max_queue_size: int,
+        overflow_policy: str = DROP_OLDEST,
+        timeout_in_secs: float = 2,
+        name: str = "NotificationHttpPost",
+    ):
+        if overflow_policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {overflow_policy}")
+        self.max_workers = max_workers
+        self.max_queue_size = max_queue_size
+        self.overflow_policy = overflow_policy
+        self.timeout_in_secs = timeout_in_secs
+
+        # Keep-alive connections shared by the workers
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=max_workers)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        self._queue = deque()
+        self._condition = threading.Condition()
+        self._running = True
+
+        # Dispatcher metrics
+        self._metrics = {
+            "submitted": 0,
+            "sent": 0,
+            "failed": 0,
+            "dropped": 0,
+            "max_queue_depth": 0,
+            "max_latency_in_secs": 0.0,
+        }
+        self._total_latency_in_secs = 0.0
+
+        self._workers = []
+        for idx in range(max_workers):
+            worker = threading.Thread(target=self._work, name=f"{name}_{idx}", daemon=True)
+            worker.start()
+            self._workers.append(worker)
+
+    def post(self, url: str, data: dict, critical: bool = False) -> Future:
+        """
+        Queue a form encoded HTTP POST, return a future with True if the
+        server answered with a success status
+        """
+        notification = _Notification(url, data, critical)
+        with self._condition:
+            self._metrics["submitted"] += 1
+            if len(self._queue) >= self.max_queue_size:
+                dropped = self._select_dropped(notification)
+                self._metrics["dropped"] += 1
+                logger.error(f"Notification queue full, dropping post to {dropped.url}")
+                dropped.future.set_result(False)
+                if dropped is notification:
+                    return notification.future
+                self._queue.remove(dropped)
+
+            self._queue.append(notification)
+            self._metrics["max_queue_depth"] = max(
+                self._metrics["max_queue_depth"], len(self._queue)
+            )
+            self._condition.notify()
+        return notification.future
+
+    def shutdown(self, wait: bool = True):
+        """Stop the workers once the queued notifications are sent"""
+        with self._condition:
+            self._running = False
+            self._condition.notify_all()
+        if wait:
+            for worker in self._workers:
+                worker.join()
+        self.session.close()
+
+    def get_metrics(self) -> dict:
+        """Return dispatcher metrics"""
+        with self._condition:
+            metrics = dict(self._metrics)
+            metrics["queue_depth"] = len(self._queue)
+            metrics["max_queue_size"] = self.max_queue_size
+            metrics["overflow_policy"] = self.overflow_policy
+            done = metrics["sent"] + metrics["failed"]
+            metrics["avg_latency_in_secs"] = (
+                self._total_latency_in_secs / done if done else 0.0
+            )
+        return metrics
+
+    def _select_dropped(self, notification: _Notification) -> _Notification:
+        """Choose the notification to drop when the queue is full (lock must be held)"""
+        candidates = [queued for queued in self._queue if not queued.critical]
+        if self.overflow_policy == DROP_OLDEST:
+            if candidates:
+                return candidates[0]
+            return notification if not notification.critical else self._queue[0]
+        # DROP_NEWEST
+        if not notification.critical:
+            return notification
+        return candidates[-1] if candidates else self._queue[0]
+
+    def _send(self, notification: _Notification) -> bool:
+        """Post the notification"""
+        try:
+            server_response = self.session.post(
+                notification.url,
+                data=notification.data,
+                headers={"Content-Type": "application/x-www-form-urlencoded"},
+                timeout=self.timeout_in_secs,
+            )
+            logger.info(f"Server response: {server_response.text}")
+            return server_response.ok
+        except Exception as e:
+            logger.error(f"Error when posting to {notification.url}: {e}")
+            return False
+
+    def _work(self):
+        """Worker loop"""
+        while True:
+            with self._condition:
+                while not self._queue and self._running:
+                    self._condition.wait()
+                if not self._queue:
+                    return
+                notification = self._queue.popleft()
+
+            success = self._send(notification)
+            latency = time.monotonic() - notification.enqueued_at
+
+            with self._condition:
+                self._metrics["sent" if success else "failed"] += 1
+                self._total_latency_in_secs += latency
+                self._metrics["max_latency_in_secs"] = max(
+                    self._metrics["max_latency_in_secs"], latency
+                )
+            notification.future.set_result(success)
@@ -1,7 +1,7 @@
 import logging
-import requests
-import threading
 import socket
+from uuid import uuid4
+from concurrent.futures import Future
 from typing import Iterable
 from datetime import datetime
 from server.managers.wifi_bands_ssh_manager.model import WifiBandStatus, WifiStatus
@@ -11,11 +11,15 @@ from server.managers.alimelo_manager import alimelo_manager_service, AlimeloRess
 from server.managers.alimelo_manager import AlimeloRessources
 from server.interfaces.mqtt_interface import SingleRelayStatus, RelaysStatus
 from server.orchestrator.live_objects import live_objects_service
+from server.orchestrator.outbox import notification_outbox_service, ALARM
+from .dispatcher import HttpNotificationDispatcher
+from .snapshot_cache import StatusSnapshotCache
 
 
 logger = logging.getLogger(__name__)
 
-POST_TIMEOUT_IN_SECS = 2
+RPI_CLOUD_OUTBOX = "rpi_cloud"
+LIVE_OBJECTS_STATUS = "live_objects"
 
 
 class OrchestratorNotification:
@@ -27,6 +31,8 @@ class OrchestratorNotification:
     server_cloud_notify_connected_nodes_path: str
     rpi_cloud_ip_addr: str
     server_cloud_ports: Iterable[int]
+    http_dispatcher: HttpNotificationDispatcher
+    status_snapshot_cache: StatusSnapshotCache
 
     def init_notification_module(
         self,
@@ -36,6 +42,11 @@ class OrchestratorNotification:
         server_cloud_notify_device_path: str,
         server_cloud_notify_connected_nodes_path: str,
         server_cloud_ports: Iterable[int],
+        http_max_workers: int,
+        http_max_queue_size: int,
+        http_overflow_policy: str,
+        http_timeout_in_secs: float,
+        status_heartbeat_period_in_secs: float,
     ):
         """Initialize the polling service for the orchestrator"""
         logger.info("initializing Orchestrator polling module")
@@ -49,26 +60,43 @@ class OrchestratorNotification:
         )
         self.server_cloud_ports = server_cloud_ports
 
+        # Create HTTP notifications dispatcher
+        self.http_dispatcher = HttpNotificationDispatcher(
+            max_workers=http_max_workers,
+            max_queue_size=http_max_queue_size,
+            overflow_policy=http_overflow_policy,
+            timeout_in_secs=http_timeout_in_secs,
+        )
+
+        # Skip the status notifications identical to the last one sent
+        self.status_snapshot_cache = StatusSnapshotCache(
+            heartbeat_period_in_secs=status_heartbeat_period_in_secs
+        )
+
+        # Resend the Live Objects status at next notification if not published
+        live_objects_service.set_status_not_sent_callback(
+            lambda: self.status_snapshot_cache.invalidate(LIVE_OBJECTS_STATUS)
+        )
+
+        # Replay the notifications kept in the outbox
+        notification_outbox_service.register_sender(
+            destination=RPI_CLOUD_OUTBOX, sender=self.send_outbox_notification
+        )
 
     def notify_wifi_status(self, bands_status: Iterable[WifiBandStatus]):
         """Send MQTT command to electrical pannel to represent the wifi bands status"""
 
         logger.info("Sending MQTT message to notify wifi status")
 
-        # Build relays command
+        # Build relays command, relay i represents BANDS[i]
+        bands = {band_status.band: band_status.status for band_status in bands_status}
         relays_statuses_in_command = []
         for i in range(6):
+            status = bool(i < len(BANDS) and bands.get(BANDS[i]))
             relays_statuses_in_command.append(
-                SingleRelayStatus(relay_number=i, status=False, powered=False)
+                SingleRelayStatus(relay_number=i, status=status, powered=status)
             )
 
-        for i, band in enumerate(BANDS):
-            for band_status in bands_status:
-                if band_status.band == band:
-                    relays_statuses_in_command[i].status = band_status.status
-                    relays_statuses_in_command[i].powered = band_status.status
-                    break
-
         relays_statuses = RelaysStatus(
             relay_statuses=relays_statuses_in_command,
             command=True,
@@ -98,133 +126,129 @@ class OrchestratorNotification:
             "Posting HTTP to notify current wifi status and use situation to RPI cloud"
         )
 
-        connected_to_internet = wifi_bands_manager_service.is_connected_to_internet()
-        # TODO: MOCK for test REMOVE
-        #connected_to_internet = True
-        if connected_to_internet:
-            # Get wifi status from bands status
-            wifi_status = False
-            band_status_2GHz = False
-            band_status_5GHz = False
-            band_status_6GHz = False
-
-            for band_status in bands_status:
-                if band_status.band == "2.4GHz":
-                    band_status_2GHz = band_status.status
-                elif band_status.band == "5GHz":
-                    band_status_5GHz = band_status.status
-                elif band_status.band == "6GHz":
-                    band_status_6GHz = band_status.status
-                if band_status.status:
-                    wifi_status = True
-
-            # get Alimelo values
-            alimelo_busvoltage = "unknown"
-            alimelo_shuntvoltage = "unknown"
-            alimelo_loadvoltage = "unknown"
-            alimelo_current_mA = "unknown"
-            alimelo_power_mW = "unknown"
-            alimelo_battery_level = "unknown"
-            alimelo_power_supplied = "unknown"
-            alimelo_is_powered_by_battery = "unknown"
-            alimelo_is_charging = "unknown"
-
-            if alimelo_ressources is not None:
-                alimelo_busvoltage = alimelo_ressources.busvoltage
-                alimelo_shuntvoltage = alimelo_ressources.shuntvoltage
-                alimelo_loadvoltage = alimelo_ressources.loadvoltage
-                alimelo_current_mA = alimelo_ressources.current_mA
-                alimelo_power_mW = alimelo_ressources.power_mW
-                alimelo_battery_level = alimelo_manager_service.get_battery_level()
-                alimelo_power_supplied = (
-                    alimelo_ressources.electricSocketIsPowerSupplied
-                )
-                alimelo_is_powered_by_battery = alimelo_ressources.isPowredByBattery
-                alimelo_is_charging = alimelo_ressources.isChargingBattery
-
-            # Get electrical panel power outlet status
-            po0_status = False
-            po1_status = False
-            po2_status = False
-            po0_powered = False
-            po1_powered = False
-            po2_powered = False
-            if relay_statuses is not None:
-                for relay_status in relay_statuses.relay_statuses:
-                    if relay_status.relay_number == 0:
-                        po0_status = relay_status.status
-                        po0_powered = relay_status.powered
-                    if relay_status.relay_number == 1:
-                        po1_status = relay_status.status
-                        po1_powered = relay_status.powered
-                    if relay_status.relay_number == 2:
-                        po2_status = relay_status.status
-                        po2_powered = relay_status.powered
-
-            # Get power strip relays outlet status
-            power_strip_r1_status = False
-            power_strip_r2_status = False
-            power_strip_r3_status = False
-            power_strip_r4_status = False
-
-            if power_strip_relays_status is not None:
-                for relay_status in power_strip_relays_status.relay_statuses:
-                    if relay_status.relay_number == 1:
-                        power_strip_r1_status = relay_status.status
-                    if relay_status.relay_number == 2:
-                        power_strip_r2_status = relay_status.status
-                    if relay_status.relay_number == 3:
-                        power_strip_r3_status = relay_status.status
-                    if relay_status.relay_number == 4:
-                        power_strip_r4_status = relay_status.status
-
-            # Get Orchestrator ip address
-            try:
-                s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-                s.connect(("192.168.1.122", 80))
-                orchestrator_ip_addr = s.getsockname()[0]
-                orquestrator_base_url = f"http://{orchestrator_ip_addr}:5000/"
-                s.close()
-            except:
-                logger.error("Error retreiving orchestrator IP")
-                orquestrator_base_url = ""
-
-            # Post status to rpi cloud
-            for port in self.server_cloud_ports:
-                post_url = f"http://{self.rpi_cloud_ip_addr}:{port}/{self.server_cloud_notify_status_path}"
-                data = {
-                    "orquestrator_base_url": orquestrator_base_url,
-                    "wifi_status": wifi_status,
-                    "band_2GHz_status": band_status_2GHz,
-                    "band_5GHz_status": band_status_5GHz,
-                    "band_6GHz_status": band_status_6GHz,
-                    "use_situation": use_situation,
-                    "energy_limitations": energy_limitations,
-                    "alimelo_busvoltage": alimelo_busvoltage,
-                    "alimelo_shuntvoltage": alimelo_shuntvoltage,
-                    "alimelo_loadvoltage": alimelo_loadvoltage,
-                    "alimelo_current_mA": alimelo_current_mA,
-                    "alimelo_power_mW": alimelo_power_mW,
-                    "alimelo_battery_level": alimelo_battery_level,
-                    "alimelo_power_supplied": alimelo_power_supplied,
-                    "alimelo_is_powered_by_battery": alimelo_is_powered_by_battery,
-                    "alimelo_is_charging": alimelo_is_charging,
-                    "po0_status": po0_status,
-                    "po0_powered": po0_powered,
-                    "po1_status": po1_status,
-                    "po1_powered": po1_powered,
-                    "po2_status": po2_status,
-                    "po2_powered": po2_powered,
-                    "power_strip_relay1_status": power_strip_r1_status,
-                    "power_strip_relay2_status": power_strip_r2_status,
-                    "power_strip_relay3_status": power_strip_r3_status,
-                    "power_strip_relay4_status": power_strip_r4_status,
-                }
-
-                self.http_post_in_dedicated_thread(url=post_url, data=data)
-        else:
-            logger.error(
-                f"Imposible to post notification, box is disconnected from internet"
+        # Get wifi status from bands status
+        wifi_status = False
+        band_status_2GHz = False
+        band_status_5GHz = False
+        band_status_6GHz = False
+
+        for band_status in bands_status:
+            if band_status.band == "2.4GHz":
+                band_status_2GHz = band_status.status
+            elif band_status.band == "5GHz":
+                band_status_5GHz = band_status.status
+            elif band_status.band == "6GHz":
+                band_status_6GHz = band_status.status
+            if band_status.status:
+                wifi_status = True
+
+        # get Alimelo values
+        alimelo_busvoltage = "unknown"
+        alimelo_shuntvoltage = "unknown"
+        alimelo_loadvoltage = "unknown"
+        alimelo_current_mA = "unknown"
+        alimelo_power_mW = "unknown"
+        alimelo_battery_level = "unknown"
+        alimelo_power_supplied = "unknown"
+        alimelo_is_powered_by_battery = "unknown"
+        alimelo_is_charging = "unknown"
+
+        if alimelo_ressources is not None:
+            alimelo_busvoltage = alimelo_ressources.busvoltage
+            alimelo_shuntvoltage = alimelo_ressources.shuntvoltage
+            alimelo_loadvoltage = alimelo_ressources.loadvoltage
+            alimelo_current_mA = alimelo_ressources.current_mA
+            alimelo_power_mW = alimelo_ressources.power_mW
+            alimelo_battery_level = alimelo_manager_service.get_battery_level()
+            alimelo_power_supplied = (
+                alimelo_ressources.electricSocketIsPowerSupplied
+            )
+            alimelo_is_powered_by_battery = alimelo_ressources.isPowredByBattery
+            alimelo_is_charging = alimelo_ressources.isChargingBattery
+
+        # Get electrical panel power outlet status
+        po0_status = False
+        po1_status = False
+        po2_status = False
+        po0_powered = False
+        po1_powered = False
+        po2_powered = False
+        if relay_statuses is not None:
+            for relay_status in relay_statuses.relay_statuses:
+                if relay_status.relay_number == 0:
+                    po0_status = relay_status.status
+                    po0_powered = relay_status.powered
+                if relay_status.relay_number == 1:
+                    po1_status = relay_status.status
+                    po1_powered = relay_status.powered
+                if relay_status.relay_number == 2:
+                    po2_status = relay_status.status
+                    po2_powered = relay_status.powered
+
+        # Get power strip relays outlet status
+        power_strip_r1_status = False
+        power_strip_r2_status = False
+        power_strip_r3_status = False
+        power_strip_r4_status = False
+
+        if power_strip_relays_status is not None:
+            for relay_status in power_strip_relays_status.relay_statuses:
+                if relay_status.relay_number == 1:
+                    power_strip_r1_status = relay_status.status
+                if relay_status.relay_number == 2:
+                    power_strip_r2_status = relay_status.status
+                if relay_status.relay_number == 3:
+                    power_strip_r3_status = relay_status.status
+                if relay_status.relay_number == 4:
+                    power_strip_r4_status = relay_status.status
+
+        # Get Orchestrator ip address
+        try:
+            s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            s.connect(("192.168.1.122", 80))
+            orchestrator_ip_addr = s.getsockname()[0]
+            orquestrator_base_url = f"http://{orchestrator_ip_addr}:5000/"
+            s.close()
+        except:
+            logger.error("Error retreiving orchestrator IP")
+            orquestrator_base_url = ""
+
+        # Post status to rpi cloud
+        for port in self.server_cloud_ports:
+            post_url = f"http://{self.rpi_cloud_ip_addr}:{port}/{self.server_cloud_notify_status_path}"
+            data = {
+                "orquestrator_base_url": orquestrator_base_url,
+                "wifi_status": wifi_status,
+                "band_2GHz_status": band_status_2GHz,
+                "band_5GHz_status": band_status_5GHz,
+                "band_6GHz_status": band_status_6GHz,
+                "use_situation": use_situation,
+                "energy_limitations": energy_limitations,
+                "alimelo_busvoltage": alimelo_busvoltage,
+                "alimelo_shuntvoltage": alimelo_shuntvoltage,
+                "alimelo_loadvoltage": alimelo_loadvoltage,
+                "alimelo_current_mA": alimelo_current_mA,
+                "alimelo_power_mW": alimelo_power_mW,
+                "alimelo_battery_level": alimelo_battery_level,
+                "alimelo_power_supplied": alimelo_power_supplied,
+                "alimelo_is_powered_by_battery": alimelo_is_powered_by_battery,
+                "alimelo_is_charging": alimelo_is_charging,
+                "po0_status": po0_status,
+                "po0_powered": po0_powered,
+                "po1_status": po1_status,
+                "po1_powered": po1_powered,
+                "po2_status": po2_status,
+                "po2_powered": po2_powered,
+                "power_strip_relay1_status": power_strip_r1_status,
+                "power_strip_relay2_status": power_strip_r2_status,
+                "power_strip_relay3_status": power_strip_r3_status,
+                "power_strip_relay4_status": power_strip_r4_status,
+            }
+            if not self.status_snapshot_cache.should_send(post_url, data):
+                logger.info(f"Status unchanged, not posted to {post_url}")
+                continue
+            self.post_to_cloud_server(
+                url=post_url, data=data, kind="status", coalesce_key=f"status|{post_url}"
             )
 
     def notify_status_to_liveobjects(
@@ -254,7 +278,8 @@ class OrchestratorNotification:
         ep = ""
         if relay_statuses is not None:
             for idx in range(0, 6):
-                if relay_statuses.relay_statuses[idx].status:
+                relay_status = relay_statuses.get(idx)
+                if relay_status is not None and relay_status.status:
                     ep += "1"
                 else:
                     ep += "0"
@@ -274,21 +299,20 @@ class OrchestratorNotification:
             "us": us,
         }
 
+        if not self.status_snapshot_cache.should_send(LIVE_OBJECTS_STATUS, data_to_send):
+            logger.info(f"Status unchanged, not published to Live Objects")
+            return
         live_objects_service.publish_data(data_to_send=data_to_send, tags = ["status"])
 
     def transfer_alarm_to_cloud_server(self, alarm_type: str):
         """Transfer alarm notification to cloud server"""
 
-        connected_to_internet = wifi_bands_manager_service.is_connected_to_internet()
-        # TODO: MOCK for test REMOVE
-        # connected_to_internet = True
-        if connected_to_internet:
-            logger.info(f"Posting HTTP to notify alarm {alarm_type} to RPI cloud")
-            data = {"alarm_type": alarm_type}
-            # Post alarm to rpi cloud
-            for port in self.server_cloud_ports:
-                post_url = f"http://{self.rpi_cloud_ip_addr}:{port}/{self.server_cloud_notify_alarm_path}"
-                self.http_post_in_dedicated_thread(url=post_url, data=data)
+        logger.info(f"Posting HTTP to notify alarm {alarm_type} to RPI cloud")
+        data = {"alarm_type": alarm_type}
+        # Post alarm to rpi cloud
+        for port in self.server_cloud_ports:
+            post_url = f"http://{self.rpi_cloud_ip_addr}:{port}/{self.server_cloud_notify_alarm_path}"
+            self.post_to_cloud_server(url=post_url, data=data, kind=ALARM)
 
     def transfer_alarm_to_liveobjects(self, alarm_type: str):
         """Transfer alarm notification to cloud  Live objects"""
@@ -306,42 +330,82 @@ class OrchestratorNotification:
         for port in self.server_cloud_ports:
             post_url = f"http://{self.rpi_cloud_ip_addr}:{port}/{self.server_cloud_notify_device_path}"
             logger.info(f"Post battery device to: {post_url}")
-            self.http_post_in_dedicated_thread(url=post_url, data=data)
+            self.post_to_cloud_server(
+                url=post_url,
+                data=data,
+                kind="battery",
+                coalesce_key=f"battery|{device}|{post_url}",
+            )
 
     def notify_thread_connected_nodes_to_cloud_server(self, connected_nodes: dict):
         """Transfer connected nodes to to cloud server"""
-        # Post connected nodes to rpi cloud
-        data = {}
-        for node_id in connected_nodes.keys():
-            data[node_id] = connected_nodes[node_id].strftime("%H:%M:%S")
+        # Post connected nodes to rpi cloud, last seen is already formatted
+        data = dict(connected_nodes)
         for port in self.server_cloud_ports:
             post_url = f"http://{self.rpi_cloud_ip_addr}:{port}/{self.server_cloud_notify_connected_nodes_path}"
-            self.http_post_in_dedicated_thread(url=post_url, data=data)
-
-    def http_post(self, url: str, data: dict, timeout: int = POST_TIMEOUT_IN_SECS):
-        """HTTP Post"""
-        try:
-            server_response = requests.post(
-                url,
-                data=(data),
-                headers={"Content-Type": "application/x-www-form-urlencoded"},
-                timeout=timeout,
+            self.post_to_cloud_server(
+                url=post_url,
+                data=data,
+                kind="thread_nodes",
+                coalesce_key=f"thread_nodes|{post_url}",
             )
-            logger.info(f"Server response: {server_response.text}")
-        except Exception:
-            logger.error(f"Error when posting to rpi cloud")
 
-    def http_post_in_dedicated_thread(
-        self, url: str, data: dict, timeout: int = POST_TIMEOUT_IN_SECS
+    def post_to_cloud_server(
+        self, url: str, data: dict, kind: str, coalesce_key: str = None
     ):
-        """HTTP Post in dedicated thread"""
+        """
+        Post notification to cloud server, keep it in the outbox if it can
+        not be delivered. A delivered snapshot supersedes the stored one
+        """
+        payload = {"url": url, "data": data}
+        # Every alarm is a distinct event, never deduplicated
+        dedup_key = uuid4().hex if kind == ALARM else None
+
+        def store_in_outbox():
+            notification_outbox_service.put(
+                destination=RPI_CLOUD_OUTBOX,
+                kind=kind,
+                payload=payload,
+                coalesce_key=coalesce_key,
+                dedup_key=dedup_key,
+            )
+
+        if not wifi_bands_manager_service.is_connected_to_internet():
+            logger.error(f"Box is disconnected from internet, {kind} kept in outbox")
+            store_in_outbox()
+            return
+
+        def post_done(future: Future):
+            if not future.result():
+                # Resend the status at next notification
+                if kind == "status":
+                    self.status_snapshot_cache.invalidate(url)
+                store_in_outbox()
+            elif coalesce_key is not None:
+                notification_outbox_service.discard(
+                    destination=RPI_CLOUD_OUTBOX, coalesce_key=coalesce_key
+                )
 
-        post_thread = threading.Thread(
-            target=self.http_post,
-            args=[url, data, timeout],
-            name="NotificationHttpPost",
+        self.http_post(url=url, data=data, critical=kind == ALARM).add_done_callback(
+            post_done
         )
-        post_thread.start()
+
+    def send_outbox_notification(self, payload: dict) -> bool:
+        """Send a notification replayed from the outbox"""
+        return self.http_post(
+            url=payload["url"], data=payload["data"], critical=True
+        ).result()
+
+    def http_post(self, url: str, data: dict, critical: bool = False) -> Future:
+        """HTTP Post using the notifications dispatcher"""
+        return self.http_dispatcher.post(url=url, data=data, critical=critical)
+
+    def get_notification_metrics(self) -> dict:
+        """Get HTTP notifications dispatcher and status snapshots metrics"""
+        return {
+            "http": self.http_dispatcher.get_metrics(),
+            "status_snapshots": self.status_snapshot_cache.get_metrics(),
+        }
 
 
 orchestrator_notification_service: OrchestratorNotification = OrchestratorNotification()
@@ -0,0 +1,65 @@
+"""
+Status snapshot cache, detects the status notifications identical to the
+last one sent to a destination
+"""
+import hashlib
+import json
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class StatusSnapshotCache:
+    """
+    Keep the hash of the last snapshot sent per destination. A snapshot is
+    sent when it changed or when the heartbeat period is elapsed
+    """
+
+    def __init__(self, heartbeat_period_in_secs: float):
+        self.heartbeat_period_in_secs = heartbeat_period_in_secs
+        # {destination: (hash, snapshot, sent_at)}
+        self._last_sent = {}
+        self._lock = threading.Lock()
+        self._metrics = {"sent": 0, "heartbeats": 0, "suppressed": 0}
+
+    @staticmethod
+    def get_hash(snapshot: dict) -> str:
+        """Get snapshot hash, independent of the keys order"""
+        return hashlib.sha1(
+            json.dumps(snapshot, sort_keys=True, default=str).encode()
+        ).hexdigest()
+
+    def should_send(self, destination: str, snapshot: dict) -> bool:
+        """Return True and record the snapshot if it must be sent"""
+        snapshot_hash = self.get_hash(snapshot)
+        now = time.monotonic()
+        with self._lock:
+            last_sent = self._last_sent.get(destination)
+            if last_sent is not None and last_sent[0] == snapshot_hash:
+                if now - last_sent[2] < self.heartbeat_period_in_secs:
+                    self._metrics["suppressed"] += 1
+                    return False
+                self._metrics["heartbeats"] += 1
+            else:
+                self._metrics["sent"] += 1
+                if last_sent is not None:
+                    changed_fields = [
+                        field
+                        for field in snapshot
+                        if snapshot[field] != last_sent[1].get(field)
+                    ]
+                    logger.info(f"Status changed for {destination}: {changed_fields}")
+            self._last_sent[destination] = (snapshot_hash, dict(snapshot), now)
+        return True
+
+    def invalidate(self, destination: str):
+        """Forget the last snapshot sent, the next one is sent in any case"""
+        with self._lock:
+            self._last_sent.pop(destination, None)
+
+    def get_metrics(self) -> dict:
+        """Return snapshot cache metrics"""
+        with self._lock:
+            return dict(self._metrics)
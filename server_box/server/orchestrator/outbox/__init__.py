@@ -0,0 +1,3 @@
+"""Orchestrator notifications outbox package"""
+from .service import notification_outbox_service
+from .store import ALARM
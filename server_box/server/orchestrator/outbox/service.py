@@ -0,0 +1,161 @@
+import logging
+import threading
+import time
+from typing import List
+from server.managers.connectivity_manager import connectivity_manager_service
+from .store import OutboxStore, OutboxMessage
+
+logger = logging.getLogger(__name__)
+
+
+class NotificationOutbox:
+    """
+    Store-and-forward outbox. Notifications that can not be sent are
+    persisted and replayed in throttled batches when internet is back
+    """
+
+    store: OutboxStore
+    replay_batch_size: int
+    replay_batch_interval_in_secs: float
+    retry_period_in_secs: float
+
+    def __init__(self):
+        self.senders = {}
+        self.replay_requested = threading.Event()
+        self.metrics_lock = threading.Lock()
+        self.metrics = {
+            "stored": 0,
+            "coalesced": 0,
+            "duplicated": 0,
+            "replayed": 0,
+            "replay_failures": 0,
+        }
+
+    def init_outbox_module(
+        self,
+        db_file: str,
+        max_messages: int,
+        replay_batch_size: int,
+        replay_batch_interval_in_secs: float,
+        retry_period_in_secs: float,
+    ):
+        """Initialize the notifications outbox for the orchestrator"""
+        logger.info("initializing Orchestrator outbox module")
+        self.store = OutboxStore(db_file=db_file, max_messages=max_messages)
+        self.replay_batch_size = replay_batch_size
+        self.replay_batch_interval_in_secs = replay_batch_interval_in_secs
+        self.retry_period_in_secs = retry_period_in_secs
+
+        # Replay the backlog when connectivity comes back
+        connectivity_manager_service.add_connectivity_change_callback(
+            self.connectivity_change_callback
+        )
+        self.replay_thread = threading.Thread(
+            target=self.replay_loop, name="OutboxReplay", daemon=True
+        )
+        self.replay_thread.start()
+
+    def register_sender(self, destination: str, sender: callable):
+        """
+        Register the sender of a destination, sender(payload) returns True
+        if the message was delivered
+        """
+        self.senders[destination] = sender
+        self.replay_requested.set()
+
+    def put(
+        self,
+        destination: str,
+        kind: str,
+        payload: dict,
+        coalesce_key: str = None,
+        dedup_key: str = None,
+    ):
+        """Persist a notification to be sent later"""
+        try:
+            result = self.store.put(
+                destination=destination,
+                kind=kind,
+                payload=payload,
+                coalesce_key=coalesce_key,
+                dedup_key=dedup_key,
+            )
+        except Exception as e:
+            logger.error(f"Error storing {kind} notification in outbox: {e}")
+            return
+        logger.info(f"Notification {kind} for {destination} {result} in outbox")
+        with self.metrics_lock:
+            self.metrics[result] += 1
+
+    def discard(self, destination: str, coalesce_key: str):
+        """Remove the stored snapshot superseded by a delivered notification"""
+        try:
+            self.store.discard(destination=destination, coalesce_key=coalesce_key)
+        except Exception as e:
+            logger.error(f"Error discarding outbox notification: {e}")
+
+    def connectivity_change_callback(self, connected: bool):
+        """Trigger replay on reconnection"""
+        if connected:
+            self.replay_requested.set()
+
+    def replay_loop(self):
+        """Outbox replay loop"""
+        while True:
+            self.replay_requested.wait(timeout=self.retry_period_in_secs)
+            self.replay_requested.clear()
+            if not connectivity_manager_service.is_connected_to_internet():
+                continue
+            try:
+                self.replay()
+            except Exception as e:
+                logger.error(f"Error replaying outbox: {e}")
+
+    def replay(self):
+        """Send the stored notifications destination by destination"""
+        for destination, sender in list(self.senders.items()):
+            while True:
+                batch = self.store.fetch_batch(destination, self.replay_batch_size)
+                if not batch:
+                    break
+                logger.info(f"Replaying {len(batch)} notifications to {destination}")
+                sent_ids, failed = self.send_batch(batch, sender)
+                self.store.delete(sent_ids)
+                if failed:
+                    break
+                # Throttle the batches to keep the link usable
+                time.sleep(self.replay_batch_interval_in_secs)
+        self.store.compact()
+
+    def send_batch(self, batch: List[OutboxMessage], sender: callable):
+        """Send a batch in order, stop at the first failure"""
+        sent_ids = []
+        for message in batch:
+            try:
+                delivered = sender(message.payload)
+            except Exception as e:
+                logger.error(f"Error sending outbox message: {e}")
+                delivered = False
+            if not delivered:
+                self.store.mark_failed(message.id)
+                with self.metrics_lock:
+                    self.metrics["replay_failures"] += 1
+                return sent_ids, True
+            sent_ids.append(message.id)
+            with self.metrics_lock:
+                self.metrics["replayed"] += 1
+        return sent_ids, False
+
+    def get_metrics(self) -> dict:
+        """Return outbox metrics"""
+        with self.metrics_lock:
+            metrics = dict(self.metrics)
+        metrics["evicted"] = self.store.evicted
+        metrics["pending"] = {
+            destination: self.store.count(destination) for destination in self.senders
+        }
+        return metrics
+
+
+notification_outbox_service: NotificationOutbox = NotificationOutbox()
+""" NotificationOutbox service singleton"""
@@ -0,0 +1,213 @@
+"""
+Outbox SQLite store, persists the notifications waiting to be sent
+"""
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Iterable
+
+logger = logging.getLogger(__name__)
+
+ALARM = "alarm"
+
+CREATE_TABLE = """
+CREATE TABLE IF NOT EXISTS messages (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    destination TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    coalesce_key TEXT,
+    dedup_key TEXT NOT NULL UNIQUE,
+    payload TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0
+)
+"""
+CREATE_INDEX = """
+CREATE INDEX IF NOT EXISTS messages_destination
+ON messages (destination, kind, id)
+"""
+
+
+@dataclass
+class OutboxMessage:
+    """Model for a message stored in the outbox"""
+
+    id: int
+    destination: str
+    kind: str
+    payload: dict
+    created_at: float
+    attempts: int
+
+
+class OutboxStore:
+    """
+    Thread safe SQLite store. Identical messages are stored once, a message
+    with a coalesce key replaces the previous one with the same key
+    """
+
+    def __init__(self, db_file: str, max_messages: int, vacuum_threshold: int = 500):
+        self.db_file = db_file
+        self.max_messages = max_messages
+        self.vacuum_threshold = vacuum_threshold
+        self._deleted_since_vacuum = 0
+        self._lock = threading.Lock()
+        self.evicted = 0
+
+        # Open database
+        directory = os.path.dirname(db_file)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._connection = sqlite3.connect(db_file, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        with self._connection:
+            self._connection.execute(CREATE_TABLE)
+            self._connection.execute(CREATE_INDEX)
+
+    def put(
+        self,
+        destination: str,
+        kind: str,
+        payload: dict,
+        coalesce_key: str = None,
+        dedup_key: str = None,
+    ) -> str:
+        """
+        Store a message, return "stored", "coalesced" or "duplicated".
+        Without dedup key, messages with the same payload are duplicates
+        """
+        serialized_payload = json.dumps(payload, sort_keys=True)
+        if dedup_key is None:
+            dedup_key = hashlib.sha1(
+                f"{destination}|{serialized_payload}".encode()
+            ).hexdigest()
+
+        with self._lock, self._connection:
+            # Remove the snapshot superseded by the new one
+            removed = 0
+            if coalesce_key is not None:
+                removed = self._connection.execute(
+                    "DELETE FROM messages WHERE destination = ? AND coalesce_key = ?"
+                    " AND dedup_key != ?",
+                    (destination, coalesce_key, dedup_key),
+                ).rowcount
+                self._deleted_since_vacuum += removed
+
+            inserted = self._connection.execute(
+                "INSERT OR IGNORE INTO messages"
+                " (destination, kind, coalesce_key, dedup_key, payload, created_at)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    destination,
+                    kind,
+                    coalesce_key,
+                    dedup_key,
+                    serialized_payload,
+                    time.time(),
+                ),
+            ).rowcount
+            self._evict_overflow()
+
+        if not inserted:
+            return "duplicated"
+        return "coalesced" if removed else "stored"
+
+    def fetch_batch(self, destination: str, limit: int) -> Iterable[OutboxMessage]:
+        """Get the oldest messages of a destination, alarms first"""
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT id, destination, kind, payload, created_at, attempts"
+                " FROM messages WHERE destination = ?"
+                " ORDER BY kind != ?, id LIMIT ?",
+                (destination, ALARM, limit),
+            ).fetchall()
+        return [
+            OutboxMessage(
+                id=row[0],
+                destination=row[1],
+                kind=row[2],
+                payload=json.loads(row[3]),
+                created_at=row[4],
+                attempts=row[5],
+            )
+            for row in rows
+        ]
+
+    def delete(self, message_ids: Iterable[int]):
+        """Remove the sent messages"""
+        message_ids = list(message_ids)
+        if not message_ids:
+            return
+        with self._lock, self._connection:
+            self._connection.executemany(
+                "DELETE FROM messages WHERE id = ?", [(id,) for id in message_ids]
+            )
+            self._deleted_since_vacuum += len(message_ids)
+
+    def discard(self, destination: str, coalesce_key: str):
+        """Remove the stored snapshot superseded by a delivered one"""
+        with self._lock, self._connection:
+            removed = self._connection.execute(
+                "DELETE FROM messages WHERE destination = ? AND coalesce_key = ?",
+                (destination, coalesce_key),
+            ).rowcount
+            self._deleted_since_vacuum += removed
+        return removed
+
+    def mark_failed(self, message_id: int):
+        """Increment the message send attempts"""
+        with self._lock, self._connection:
+            self._connection.execute(
+                "UPDATE messages SET attempts = attempts + 1 WHERE id = ?",
+                (message_id,),
+            )
+
+    def compact(self):
+        """Reclaim the space of the deleted messages"""
+        with self._lock:
+            if self._deleted_since_vacuum < self.vacuum_threshold:
+                return
+            logger.info("Compacting outbox database")
+            self._connection.execute("VACUUM")
+            self._deleted_since_vacuum = 0
+
+    def count(self, destination: str = None) -> int:
+        """Return the number of stored messages"""
+        with self._lock:
+            if destination is None:
+                row = self._connection.execute("SELECT COUNT(*) FROM messages")
+            else:
+                row = self._connection.execute(
+                    "SELECT COUNT(*) FROM messages WHERE destination = ?",
+                    (destination,),
+                )
+            return row.fetchone()[0]
+
+    def close(self):
+        """Close database"""
+        with self._lock:
+            self._connection.close()
+
+    def _evict_overflow(self):
+        """Remove the oldest non alarm messages above the size cap (lock must be held)"""
+        overflow = (
+            self._connection.execute("SELECT COUNT(*) FROM messages").fetchone()[0]
+            - self.max_messages
+        )
+        if overflow <= 0:
+            return
+        evicted = self._connection.execute(
+            "DELETE FROM messages WHERE id IN"
+            " (SELECT id FROM messages WHERE kind != ? ORDER BY id LIMIT ?)",
+            (ALARM, overflow),
+        ).rowcount
+        self._deleted_since_vacuum += evicted
+        self.evicted += evicted
+        if evicted:
+            logger.error(f"Outbox full, {evicted} messages evicted")
@@ -1,7 +1,6 @@
 import logging
 import time
 from datetime import timedelta
-from timeloop import Timeloop
 from server.orchestrator.notification import orchestrator_notification_service
 from server.orchestrator.box_status import orchestrator_box_status_service
 from server.orchestrator.use_situations import orchestrator_use_situations_service
@@ -10,14 +9,19 @@ from server.orchestrator.energy_limitations import (
 )
 from server.managers.wifi_bands_ssh_manager import wifi_bands_manager_service
 from server.managers.thread_manager import thread_manager_service
-from server.managers.electrical_panel_manager import electrical_panel_manager_service
-from server.managers.power_strip_manager import power_strip_manager_service
-from server.managers.alimelo_manager import alimelo_manager_service, AlimeloRessources
 from server.managers.mqtt_manager import mqtt_manager_service
+from server.common.scheduler import scheduler_service
+from server.common.device_state import (
+    device_state_store,
+    ELECTRICAL_PANEL_RELAYS,
+    POWER_STRIP_RELAYS,
+    ALIMELO_RESSOURCES,
+    USE_SITUATION,
+)
 
 logger = logging.getLogger(__name__)
 
-resources_status_timeloop = Timeloop()
+WIFI_STATUS_CACHE_KEY = "wifi_status"
 
 
 class OrchestratorPolling:
@@ -30,6 +34,7 @@ class OrchestratorPolling:
     live_objects_notification_period: int
     connected_thread_nodes_notification_period_in_secs: int
     home_office_mac_addr: str
+    wifi_status_cache_max_age_in_secs: int
 
     def init_polling_module(
         self,
@@ -39,6 +44,7 @@ class OrchestratorPolling:
         alimelo_status_check_period_in_secs: int,
         connected_thread_nodes_notification_period_in_secs: int,
         home_office_mac_addr: str,
+        wifi_status_cache_max_age_in_secs: int,
     ):
         """Initialize the polling service for the orchestrator"""
         logger.info("initializing Orchestrator polling module")
@@ -53,36 +59,50 @@ class OrchestratorPolling:
         )
         self.alimelo_status_check_period_in_secs = alimelo_status_check_period_in_secs
         self.home_office_mac_addr = home_office_mac_addr
+        self.wifi_status_cache_max_age_in_secs = wifi_status_cache_max_age_in_secs
+
+        # Notify the connected nodes as soon as a node joins or leaves
+        thread_manager_service.add_node_event_callback(self.thread_node_event_callback)
 
         # Schedule ressources polling
         self.schedule_resources_status_polling()
 
+    def thread_node_event_callback(self, event: str, node_id: str):
+        """Notify the connected nodes to cloud on node join or leave"""
+        logger.info(f"Thread node {node_id} {event}, notify cloud")
+        orchestrator_notification_service.notify_thread_connected_nodes_to_cloud_server(
+            connected_nodes=thread_manager_service.get_connected_nodes()
+        )
+
+    def get_wifi_status(self):
+        """Get wifi status, the jobs polling it at the same time share the reading"""
+        return scheduler_service.result_cache.get(
+            key=WIFI_STATUS_CACHE_KEY,
+            max_age_in_secs=self.wifi_status_cache_max_age_in_secs,
+            read=wifi_bands_manager_service.update_wifi_status_attribute,
+        )
+
     def schedule_resources_status_polling(self):
         """Schedule the resources polling"""
 
         # Start wifi status polling service
-        @resources_status_timeloop.job(
+        @scheduler_service.job(
             interval=timedelta(seconds=self.wifi_status_polling_period_in_secs)
         )
         def poll_wifi_status():
             # retrieve wifi status
             logger.info(f"Polling wifi status")
 
-            wifi_status = wifi_bands_manager_service.update_wifi_status_attribute()
-            current_use_situation = (
-                orchestrator_use_situations_service.get_current_use_situation()
-            )
+            wifi_status = self.get_wifi_status()
             if wifi_status is None:
                 logger.error("Impossible to get wifi status")
                 return
 
-            # Get relays status
-            relay_statuses = (
-                electrical_panel_manager_service.get_relays_last_received_status()
-            )
-
-            # Get power strip status
-            power_strip_relays_statuses = power_strip_manager_service.get_relays_status()
+            # Use situation, relays and power strip status from one consistent state
+            state = device_state_store.snapshot()
+            current_use_situation = state.get(USE_SITUATION)
+            relay_statuses = state.get(ELECTRICAL_PANEL_RELAYS)
+            power_strip_relays_statuses = state.get(POWER_STRIP_RELAYS)
 
             # Get energy limitations
             energy_limitations = (
@@ -99,7 +119,7 @@ class OrchestratorPolling:
             orchestrator_notification_service.notify_cloud_server(
                 bands_status=wifi_status.bands_status,
                 use_situation=current_use_situation,
-                alimelo_ressources=alimelo_manager_service.alimelo_ressources,
+                alimelo_ressources=state.get(ALIMELO_RESSOURCES),
                 relay_statuses=relay_statuses,
                 energy_limitations=energy_limitations,
                 power_strip_relays_status=power_strip_relays_statuses,
@@ -115,7 +135,7 @@ class OrchestratorPolling:
 
             logger.info(f"Polling wifi done")
 
-        @resources_status_timeloop.job(
+        @scheduler_service.job(
             interval=timedelta(seconds=self.home_office_station_polling_period_in_secs)
         )
         def poll_home_office_station():
@@ -149,7 +169,7 @@ class OrchestratorPolling:
                 )
             logger.info(f"Polling home office connection status done")
 
-        @resources_status_timeloop.job(
+        @scheduler_service.job(
             interval=timedelta(
                 seconds=self.connected_thread_nodes_notification_period_in_secs
             )
@@ -157,7 +177,6 @@ class OrchestratorPolling:
         def notify_thread_connected_nodes_to_cloud():
             # retrieve connected nodes
             logger.info(f"Polling thread connected nodes and notify cloud")
-            thread_manager_service.update_connected_nodes()
             connected_nodes = thread_manager_service.get_connected_nodes()
 
             # Notify connected nodes to cloud
@@ -166,23 +185,20 @@ class OrchestratorPolling:
             )
 
         # Start ressources polling and live objects notification
-        @resources_status_timeloop.job(
+        @scheduler_service.job(
             interval=timedelta(seconds=self.live_objects_notification_period)
         )
         def poll_ressources_and_notify_live_objects():
             # retrieve wifi status
             logger.info(f"Polling ressources status and send to LiveObjects")
 
-            wifi_status = wifi_bands_manager_service.update_wifi_status_attribute()
+            wifi_status = self.get_wifi_status()
             if wifi_status is None:
                 logger.error("Impossible to get wifi status")
                 return
-            relay_statuses = (
-                electrical_panel_manager_service.get_relays_last_received_status()
-            )
-            use_situation = (
-                orchestrator_use_situations_service.get_current_use_situation()
-            )
+            state = device_state_store.snapshot()
+            relay_statuses = state.get(ELECTRICAL_PANEL_RELAYS)
+            use_situation = state.get(USE_SITUATION)
             connected_to_internet = (
                 wifi_bands_manager_service.is_connected_to_internet()
             )
@@ -195,7 +211,7 @@ class OrchestratorPolling:
                 use_situation=use_situation,
             )
 
-        # @resources_status_timeloop.job(
+        # @scheduler_service.job(
         #     interval=timedelta(seconds=self.alimelo_status_check_period_in_secs)
         # )
         # def check_alimelo_status():
@@ -215,8 +231,6 @@ class OrchestratorPolling:
         #                 alarm_type="low_power"
         #             )
 
-        resources_status_timeloop.start(block=False)
-
 
 orchestrator_polling_service: OrchestratorPolling = OrchestratorPolling()
 """ OrchestratorPolling service singleton"""
@@ -0,0 +1,136 @@
+"""
+Thread messages codec, decodes the messages received from the Thread
+dongle in typed messages through a dispatch table keyed by prefix
+"""
+import logging
+import threading
+from dataclasses import dataclass
+
+logger = logging.getLogger(__name__)
+
+# Alarm types by alarm code, battery alarms are named after the device
+ALARM_TYPES = {
+    "db": "doorbell",
+    "pd": "presence",
+    "em": "emergency_btn",
+}
+BATTERY_ALARM_CODE = "bat"
+
+# Device types by battery message prefix
+BATTERY_DEVICE_TYPES = {
+    "bt": "button",
+}
+
+
+class ThreadMessageError(ValueError):
+    """Message not matching the Thread protocol"""
+
+
+@dataclass(frozen=True)
+class AlarmMessage:
+    """al_{device}_{code}"""
+
+    device: str
+    alarm_type: str
+
+
+@dataclass(frozen=True)
+class PredefinedCommandMessage:
+    """cmd_{number}"""
+
+    command_number: int
+
+
+@dataclass(frozen=True)
+class BatteryLevelMessage:
+    """bt_{device}_{level}"""
+
+    device_type: str
+    device: str
+    level: str
+
+
+@dataclass(frozen=True)
+class DirectCommandMessage:
+    """{ressource}_{command}"""
+
+    ressource: str
+    command: str
+
+
+def split_fields(msg: str, count: int) -> list:
+    """Split message in count fields separated by _"""
+    fields = msg.split("_")
+    if len(fields) != count or not all(fields):
+        raise ThreadMessageError(f"Expected {count} fields in {msg}")
+    return fields
+
+
+def decode_alarm(msg: str) -> AlarmMessage:
+    """Decode al_{device}_{code}"""
+    _, device, code = split_fields(msg, 3)
+    if code == BATTERY_ALARM_CODE:
+        return AlarmMessage(device=device, alarm_type=f"battery_btn_{device}")
+    alarm_type = ALARM_TYPES.get(code)
+    if alarm_type is None:
+        raise ThreadMessageError(f"Unknown alarm code {code}")
+    return AlarmMessage(device=device, alarm_type=alarm_type)
+
+
+def decode_predefined_command(msg: str) -> PredefinedCommandMessage:
+    """Decode cmd_{number}"""
+    _, number = split_fields(msg, 2)
+    try:
+        return PredefinedCommandMessage(command_number=int(number))
+    except ValueError:
+        raise ThreadMessageError(f"Invalid command number {number}")
+
+
+def decode_battery_level(msg: str) -> BatteryLevelMessage:
+    """Decode {device_type prefix}_{device}_{level}"""
+    prefix, device, level = split_fields(msg, 3)
+    return BatteryLevelMessage(
+        device_type=BATTERY_DEVICE_TYPES[prefix], device=device, level=level
+    )
+
+
+def decode_direct_command(msg: str) -> DirectCommandMessage:
+    """Decode {ressource}_{command}"""
+    ressource, command = split_fields(msg, 2)
+    return DirectCommandMessage(ressource=ressource, command=command)
+
+
+# Decoders by message prefix, the other messages are direct commands
+DECODERS = {
+    "al": decode_alarm,
+    "cmd": decode_predefined_command,
+    **{prefix: decode_battery_level for prefix in BATTERY_DEVICE_TYPES},
+}
+
+
+class ThreadMessageCodec:
+    """Thread messages decoder with per type throughput and error counters"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counters = {"parse_errors": 0}
+
+    def decode(self, msg: str):
+        """Return the typed message, raise ThreadMessageError if invalid"""
+        prefix = msg.split("_", 1)[0]
+        decoder = DECODERS.get(prefix, decode_direct_command)
+        try:
+            message = decoder(msg)
+        except ThreadMessageError:
+            with self._lock:
+                self.counters["parse_errors"] += 1
+            raise
+        with self._lock:
+            name = type(message).__name__
+            self.counters[name] = self.counters.get(name, 0) + 1
+        return message
+
+    def get_counters(self) -> dict:
+        """Return the decoding counters"""
+        with self._lock:
+            return dict(self.counters)
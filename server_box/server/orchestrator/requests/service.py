@@ -1,5 +1,7 @@
 import logging
 import json
+import queue
+import threading
 from datetime import datetime
 from server.managers.wifi_bands_ssh_manager import wifi_bands_manager_service
 
@@ -12,21 +14,55 @@ from server.orchestrator.box_status import orchestrator_box_status_service
 from server.orchestrator.live_objects import live_objects_service
 from server.orchestrator.commands import orchestrator_commands_service
 from server.interfaces.mqtt_interface import SingleRelayStatus, RelaysStatus
+from server.common.executor import KeyedExecutor
+from .codec import (
+    ThreadMessageCodec,
+    ThreadMessageError,
+    AlarmMessage,
+    BatteryLevelMessage,
+    PredefinedCommandMessage,
+    DirectCommandMessage,
+)
 
 
 logger = logging.getLogger(__name__)
 
+# Handler, executor lane and priority by message type, alarms are served first
+MESSAGE_ROUTES = {
+    AlarmMessage: ("handle_alarm", "alarms", 0),
+    PredefinedCommandMessage: ("handle_predefined_command", "commands", 1),
+    DirectCommandMessage: ("handle_direct_command", "commands", 1),
+    BatteryLevelMessage: ("handle_battery_level", "battery", 2),
+}
+
 
 class OrchestratorRequests:
     """OrchestratorRequests service"""
 
     # Attributes
+    thread_codec: ThreadMessageCodec
+    executor: KeyedExecutor
+
     def init_requests_module(
-        self, mqtt_alarm_notif_topic: str, mqtt_command_topic: str
+        self,
+        mqtt_alarm_notif_topic: str,
+        mqtt_command_topic: str,
+        max_workers: int,
+        max_queue_size: int,
     ):
         """Initialize the requests callbacks for the orchestrator"""
         logger.info("initializing Orchestrator requests module")
 
+        # Messages are decoded by the reader and handled in the executor
+        self.thread_codec = ThreadMessageCodec()
+        self.executor = KeyedExecutor(
+            max_workers=max_workers,
+            max_queue_size=max_queue_size,
+            name="OrchestratorRequests",
+        )
+        self.handler_errors = 0
+        self._lock = threading.Lock()
+
         # Set callback functions
         thread_manager_service.set_msg_reception_callback(
             self.thread_msg_reception_callback
@@ -52,62 +88,76 @@ class OrchestratorRequests:
         )
 
     def thread_msg_reception_callback(self, msg: str):
-        """Callback for thread request message reception"""
-
+        """Callback for thread request message reception, called by the serial reader"""
         logger.info(f"Thread received message: {msg} len(msg): {len(msg)}")
         try:
-            # Thread message is an alarm
-            if msg.startswith("al"):
-                _device, _type = msg.split("_")[1:]
-                if _type == "db":
-                    alarm_type = "doorbell"
-                elif _type == "pd":
-                    alarm_type = "presence"
-                elif _type == "em":
-                    alarm_type = "emergency_btn"
-                elif _type == "bat":  # al_bt1_bat
-                    alarm_type = f"battery_btn_{_device}"
-                else:
-                    logger.error(f"Error in alarm received format {msg}")
-                    return
-                logger.info(f"Alarm received {alarm_type}")
+            message = self.thread_codec.decode(msg)
+        except ThreadMessageError as e:
+            logger.error(f"Error in message received format {msg}: {e}")
+            return
+        self.dispatch(message)
 
-                if _device == "cam":
-                    # Turn wifi ON if alarm from camera
-                    wifi_bands_manager_service.set_band_status(
-                        band="2.4GHz", status=True
-                    )
+    def dispatch(self, message):
+        """Run the message handler in the message lane, off the caller thread"""
+        handler_name, lane, priority = MESSAGE_ROUTES[type(message)]
+        try:
+            self.executor.submit(
+                lane, self.run_handler, getattr(self, handler_name), message, priority=priority
+            )
+        except queue.Full:
+            logger.error(f"Requests queue full, message dropped: {message}")
+
+    def run_handler(self, handler: callable, message):
+        """Run a message handler, log its errors"""
+        try:
+            handler(message)
+        except Exception as e:
+            with self._lock:
+                self.handler_errors += 1
+            logger.exception(f"Error handling message {message}: {e}")
+
+    def handle_alarm(self, message: AlarmMessage):
+        """Transfer alarm to cloud server and Live Objects"""
+        logger.info(f"Alarm received {message.alarm_type}")
+
+        if message.device == "cam":
+            # Turn wifi ON if alarm from camera, dont block the alarm transfer
+            wifi_bands_manager_service.set_band_status_async(band="2.4GHz", status=True)
+
+        # Transfer alarm to cloud server
+        orchestrator_notification_service.transfer_alarm_to_cloud_server(
+            message.alarm_type
+        )
 
-                # Transfer alarm to cloud server
-                orchestrator_notification_service.transfer_alarm_to_cloud_server(
-                    alarm_type
-                )
+        # Transfer alarm to Live Objects
+        orchestrator_notification_service.transfer_alarm_to_liveobjects(
+            message.alarm_type
+        )
 
-                # Transfer alarm to Live Objects
-                orchestrator_notification_service.transfer_alarm_to_liveobjects(
-                    alarm_type
-                )
+    def handle_battery_level(self, message: BatteryLevelMessage):
+        """Transfer device battery level to cloud server"""
+        logger.info(f"Device {message.device} battery level received: {message.level}")
+        orchestrator_notification_service.transfer_device_battery_level_to_cloud_server(
+            device_type=message.device_type,
+            device=message.device,
+            batLevel=message.level,
+        )
 
-            # If Thread message is buttons a command
-            elif msg.startswith("cmd"):
-                self.command_reception_callback(msg)
-
-            # If Thread message is a buttons battery status command
-            elif msg.startswith("bt"):
-                device_type = "button"
-                device, level = msg.split("_")[1:]
-                logger.info(f"Device {device} battery level received: {level}")
-                orchestrator_notification_service.transfer_device_battery_level_to_cloud_server(
-                    device_type=device_type, device=device, batLevel=level
-                )
+    def handle_predefined_command(self, message: PredefinedCommandMessage):
+        """Execute predefined command"""
+        if not orchestrator_commands_service.execute_predefined_command(
+            message.command_number
+        ):
+            logger.error("Error in command format")
+            return
+        logger.info("Command executed")
 
-            # If Thread message is a direct command
-            else:
-                if not orchestrator_commands_service.execute_command(msg):
-                    logger.error("Error in command format")
-                    return
-        except:
-            logger.error(f"Error in message received format {msg}")
+    def handle_direct_command(self, message: DirectCommandMessage):
+        """Execute direct command"""
+        if not orchestrator_commands_service.execute_command(
+            ressource=message.ressource, command=message.command
+        ):
+            logger.error("Error in command format")
 
     def alarm_notification_reception_callback(self, msg):
         """Callback for MQTT object alarm notification"""
@@ -127,15 +177,24 @@ class OrchestratorRequests:
         if type(msg) == dict:
             msg = msg["command"]
         try:
-            command_number = int(msg.split("cmd_")[1])
-            if not orchestrator_commands_service.execute_predefined_command(
-                command_number
-            ):
-                logger.error("Error in command format")
-                return
-        except:
-            logger.error("Error in command format")
-        logger.info("Command executed")
+            message = self.thread_codec.decode(msg)
+        except ThreadMessageError as e:
+            logger.error(f"Error in command format {msg}: {e}")
+            return
+        if not isinstance(message, PredefinedCommandMessage):
+            logger.error(f"Error in command format {msg}")
+            return
+        self.dispatch(message)
+
+    def get_metrics(self) -> dict:
+        """Return messages decoding, handlers and queue metrics"""
+        with self._lock:
+            handler_errors = self.handler_errors
+        return {
+            "codec": self.thread_codec.get_counters(),
+            "handler_errors": handler_errors,
+            "executor": self.executor.get_metrics(),
+        }
 
     def live_objects_command_reception_callback(self, command: str):
         """Callback for alimelo command reception"""
@@ -171,20 +230,20 @@ class OrchestratorRequests:
                     f" w5={wifi_band_5GHz}  w6={wifi_band_6GHz}"
                 )
                 if wifi_general_status is not None:
-                    wifi_bands_manager_service.set_wifi_status(
+                    wifi_bands_manager_service.set_wifi_status_async(
                         status=wifi_general_status
                     )
                 else:
                     if wifi_band_2GHz is not None:
-                        wifi_bands_manager_service.set_band_status(
+                        wifi_bands_manager_service.set_band_status_async(
                             band="2.4GHz", status=wifi_band_2GHz
                         )
                     if wifi_band_5GHz is not None:
-                        wifi_bands_manager_service.set_band_status(
+                        wifi_bands_manager_service.set_band_status_async(
                             band="5GHz", status=wifi_band_5GHz
                         )
                     if wifi_band_6GHz is not None:
-                        wifi_bands_manager_service.set_band_status(
+                        wifi_bands_manager_service.set_band_status_async(
                             band="6GHz", status=wifi_band_6GHz
                         )
 
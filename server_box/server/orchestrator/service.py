@@ -1,10 +1,10 @@
 import logging
 from flask import Flask
-from timeloop import Timeloop
 from server.orchestrator.requests import orchestrator_requests_service
 from server.orchestrator.polling import orchestrator_polling_service
 from server.orchestrator.box_status import orchestrator_box_status_service
 from server.orchestrator.notification import orchestrator_notification_service
+from server.orchestrator.outbox import notification_outbox_service
 from server.orchestrator.use_situations import orchestrator_use_situations_service
 from server.orchestrator.live_objects import live_objects_service
 from server.orchestrator.commands import orchestrator_commands_service
@@ -15,8 +15,6 @@ from server.orchestrator.energy_limitations import (
 
 logger = logging.getLogger(__name__)
 
-resources_status_timeloop = Timeloop()
-
 
 class Orchestrator:
     """Orchestrator service"""
@@ -41,12 +39,26 @@ class Orchestrator:
             orchestrator_use_situations_service.init_use_situations_module(
                 use_situations_config_file=app.config["USE_SITUATIONS_CONFIG"],
                 default_use_situation=app.config["DEFAULT_USE_SITUATION"],
+                max_workers=app.config["USE_SITUATIONS_MAX_WORKERS"],
+            )
+
+            # Init notifications outbox module
+            notification_outbox_service.init_outbox_module(
+                db_file=app.config["OUTBOX_DB_FILE"],
+                max_messages=app.config["OUTBOX_MAX_MESSAGES"],
+                replay_batch_size=app.config["OUTBOX_REPLAY_BATCH_SIZE"],
+                replay_batch_interval_in_secs=app.config[
+                    "OUTBOX_REPLAY_BATCH_INTERVAL_IN_SECS"
+                ],
+                retry_period_in_secs=app.config["OUTBOX_RETRY_PERIOD_IN_SECS"],
             )
 
             # Init LiveObjects module
             live_objects_service.init_live_objects_module(
                 commands_reception_topic=app.config["MQTT_LIVE_OBJECTS_COMMANDS_TOPIC"],
                 data_send_topic=app.config["MQTT_LIVE_OBJECTS_DATA_SEND_TOPIC"],
+                send_queue_size=app.config["LIVE_OBJECTS_SEND_QUEUE_SIZE"],
+                publish_batch_size=app.config["LIVE_OBJECTS_PUBLISH_BATCH_SIZE"],
             )
 
             # Init Box status module
@@ -68,6 +80,13 @@ class Orchestrator:
                     "RPI_CLOUD_THREAD_NODES_PATH"
                 ],
                 server_cloud_ports=app.config["RPI_CLOUD_PORTS"],
+                http_max_workers=app.config["RPI_CLOUD_HTTP_MAX_WORKERS"],
+                http_max_queue_size=app.config["RPI_CLOUD_HTTP_MAX_QUEUE_SIZE"],
+                http_overflow_policy=app.config["RPI_CLOUD_HTTP_OVERFLOW_POLICY"],
+                http_timeout_in_secs=app.config["RPI_CLOUD_HTTP_TIMEOUT_IN_SECS"],
+                status_heartbeat_period_in_secs=app.config[
+                    "STATUS_NOTIFICATION_HEARTBEAT_PERIOD_IN_SECS"
+                ],
             )
 
             # Init ressources polling module
@@ -88,12 +107,17 @@ class Orchestrator:
                     "THREAD_NODES_CHECK_PERIOD_IN_SECS"
                 ],
                 home_office_mac_addr=app.config["HOME_OFFICE_MAC_ADDR"],
+                wifi_status_cache_max_age_in_secs=app.config[
+                    "WIFI_STATUS_CACHE_MAX_AGE_IN_SECS"
+                ],
             )
 
             # Init requests module
             orchestrator_requests_service.init_requests_module(
                 mqtt_alarm_notif_topic=app.config["MQTT_ALARM_NOTIFICATION_TOPIC"],
                 mqtt_command_topic=app.config["MQTT_COMMAND_TOPIC"],
+                max_workers=app.config["REQUESTS_MAX_WORKERS"],
+                max_queue_size=app.config["REQUESTS_MAX_QUEUE_SIZE"],
             )
 
             # Init commands module
@@ -0,0 +1,156 @@
+"""
+Use situations execution engine, applies the resources status of a use
+situation concurrently and reports the result
+"""
+import logging
+import time
+from concurrent.futures import wait
+from dataclasses import dataclass, field
+from typing import List
+from server.common.executor import KeyedExecutor
+
+logger = logging.getLogger(__name__)
+
+ACTION_APPLIED = "applied"
+ACTION_SKIPPED = "skipped"
+ACTION_FAILED = "failed"
+
+
+@dataclass
+class UseSituationActionResult:
+    """Result of the action executed for a single resource"""
+
+    resource: str
+    target: object
+    result: str
+    duration_in_secs: float = 0.0
+    error: str = None
+
+    def to_json(self):
+        """Return json dict that represents the UseSituationActionResult instance"""
+        return {
+            "resource": self.resource,
+            "target": str(self.target),
+            "result": self.result,
+            "duration_in_secs": round(self.duration_in_secs, 3),
+            "error": self.error,
+        }
+
+
+@dataclass
+class UseSituationReport:
+    """Aggregated result of a use situation execution"""
+
+    use_situation: str
+    energy_limitation: str
+    actions: List[UseSituationActionResult] = field(default_factory=list)
+    duration_in_secs: float = 0.0
+
+    @property
+    def success(self) -> bool:
+        """True if no action failed"""
+        return all(action.result != ACTION_FAILED for action in self.actions)
+
+    def to_json(self):
+        """Return json dict that represents the UseSituationReport instance"""
+        return {
+            "use_situation": self.use_situation,
+            "energy_limitation": self.energy_limitation,
+            "success": self.success,
+            "duration_in_secs": round(self.duration_in_secs, 3),
+            "actions": [action.to_json() for action in self.actions],
+        }
+
+
+class UseSituationEngine:
+    """
+    Diff the use situation target status against the last known status of
+    each resource and dispatch only the needed actions. Actions on different
+    resources run concurrently, actions on the same resource keep their order
+    """
+
+    def __init__(self, max_workers: int):
+        self.executor = KeyedExecutor(max_workers=max_workers, name="UseSituationEngine")
+        self.resources = {}
+        self.last_report = None
+
+    def register_resource(
+        self, resource: str, get_known_status: callable, apply_status: callable
+    ):
+        """
+        Register a resource. get_known_status returns the last known status
+        (None if unknown), apply_status(target) returns True if applied
+        """
+        self.resources[resource] = (get_known_status, apply_status)
+
+    def execute(
+        self, use_situation: str, energy_limitation: str, targets: dict
+    ) -> UseSituationReport:
+        """Apply the targets status {resource: target} and wait for the report"""
+        start = time.monotonic()
+        report = UseSituationReport(
+            use_situation=use_situation, energy_limitation=energy_limitation
+        )
+
+        # Dispatch the needed actions
+        dispatched = []
+        for resource, target in targets.items():
+            get_known_status, apply_status = self.resources[resource]
+            try:
+                known_status = get_known_status()
+            except Exception as e:
+                logger.error(f"Error getting {resource} known status: {e}")
+                known_status = None
+
+            if known_status is not None and known_status == target:
+                report.actions.append(
+                    UseSituationActionResult(
+                        resource=resource, target=target, result=ACTION_SKIPPED
+                    )
+                )
+                continue
+
+            future = self.executor.submit(
+                resource, self.run_action, resource, target, apply_status
+            )
+            dispatched.append(future)
+
+        # Wait for all the actions
+        wait(dispatched)
+        for future in dispatched:
+            report.actions.append(future.result())
+
+        report.duration_in_secs = time.monotonic() - start
+        self.last_report = report
+        logger.info(f"Use situation report: {report.to_json()}")
+        return report
+
+    def run_action(
+        self, resource: str, target, apply_status: callable
+    ) -> UseSituationActionResult:
+        """Apply a single resource status and time it"""
+        start = time.monotonic()
+        result = UseSituationActionResult(
+            resource=resource, target=target, result=ACTION_APPLIED
+        )
+        try:
+            if not apply_status(target):
+                result.result = ACTION_FAILED
+        except Exception as e:
+            result.result = ACTION_FAILED
+            result.error = str(e)
+        result.duration_in_secs = time.monotonic() - start
+        return result
+
+    def get_last_report(self) -> UseSituationReport:
+        """Return the report of the last use situation execution"""
+        return self.last_report
+
+    def get_metrics(self) -> dict:
+        """Return the engine executor metrics and the last report"""
+        return {
+            "executor": self.executor.get_metrics(),
+            "last_report": None
+            if self.last_report is None
+            else self.last_report.to_json(),
+        }
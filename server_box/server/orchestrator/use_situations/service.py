@@ -1,8 +1,8 @@
 import logging
 import yaml
 from datetime import datetime
-from timeloop import Timeloop
-from server.managers.wifi_bands_ssh_manager import wifi_bands_manager_service
+from functools import partial
+from server.managers.wifi_bands_ssh_manager import wifi_bands_manager_service, BANDS
 from server.managers.electrical_panel_manager import electrical_panel_manager_service
 from server.managers.power_strip_manager import power_strip_manager_service
 from server.interfaces.mqtt_interface import SingleRelayStatus, RelaysStatus
@@ -10,21 +10,28 @@ from server.orchestrator.energy_limitations import (
     orchestrator_energy_limitations_service,
 )
 from server.common import ServerBoxException, ErrorCode
+from server.common.device_state import state_property, USE_SITUATION
+from .engine import UseSituationEngine, UseSituationReport
 
 
 logger = logging.getLogger(__name__)
 
-resources_status_timeloop = Timeloop()
+ELECTRICAL_PANEL_RELAYS = range(6)
+POWER_STRIP_RELAYS = range(1, 5)
 
 
 class OrchestratorUseSituations:
     """OrchestratorUseSituations service"""
 
     use_situations_dict: dict
-    current_use_situation: str
+    current_use_situation: str = state_property(USE_SITUATION, "Current use situation")
+    engine: UseSituationEngine
 
     def init_use_situations_module(
-        self, use_situations_config_file: str, default_use_situation: str
+        self,
+        use_situations_config_file: str,
+        default_use_situation: str,
+        max_workers: int,
     ):
         """Initialize the use situations  service for the orchestrator"""
         logger.info("initializing Orchestrator use situations module")
@@ -32,6 +39,10 @@ class OrchestratorUseSituations:
         # Load use situations from copnfig
         self.load_use_situations(use_situations_config_file)
 
+        # Create use situations execution engine
+        self.engine = UseSituationEngine(max_workers=max_workers)
+        self.register_engine_resources()
+
         # set default use situation
         self.set_use_situation(use_situation=default_use_situation)
 
@@ -51,8 +62,27 @@ class OrchestratorUseSituations:
             except (yaml.YAMLError, KeyError) as exc:
                 raise ServerBoxException(ErrorCode.USE_SITUATIONS_CONFIG_FILE_ERROR)
 
-    def set_use_situation(self, use_situation: str):
-        """Set use situation"""
+    def register_engine_resources(self):
+        """Register the use situations resources in the execution engine"""
+        for band in BANDS:
+            self.engine.register_resource(
+                resource=f"WIFI/{band}",
+                get_known_status=partial(self.get_known_band_status, band),
+                apply_status=partial(self.set_use_situation_band_status, band),
+            )
+        self.engine.register_resource(
+            resource="ELECTRICAL_OUTLETS",
+            get_known_status=self.get_known_electrical_panel_status,
+            apply_status=self.set_use_situation_electrical_panel_status,
+        )
+        self.engine.register_resource(
+            resource="POWER_STRIP",
+            get_known_status=self.get_known_power_strip_status,
+            apply_status=self.set_use_situation_power_strip_status,
+        )
+
+    def set_use_situation(self, use_situation: str) -> UseSituationReport:
+        """Set use situation, return the execution report"""
         logger.info(f"Setting use situation: {use_situation}")
         if use_situation in self.use_situations_dict:
             self.current_use_situation = use_situation
@@ -66,45 +96,82 @@ class OrchestratorUseSituations:
             orchestrator_energy_limitations_service.get_current_energy_limitations()
         )
         logger.info(f"Energy limitation: {energy_limitation}")
-
-        # Set use situation wifi status
-        self.set_use_situation_wifi_status(
-            self.use_situations_dict[self.current_use_situation][energy_limitation][
-                "WIFI"
-            ]
+        use_situation_config = self.use_situations_dict[self.current_use_situation][
+            energy_limitation
+        ]
+
+        # Build the resources target status
+        targets = {}
+        for band, band_status in use_situation_config["WIFI"].items():
+            targets[f"WIFI/{band}"] = band_status
+        targets["ELECTRICAL_OUTLETS"] = self.relays_target_status(
+            use_situation_config["ELECTRICAL_OUTLETS"], ELECTRICAL_PANEL_RELAYS
         )
-
-        # Set use situation Electrical panel
-        self.set_use_situation_electrical_panel_status(
-            self.use_situations_dict[self.current_use_situation][energy_limitation][
-                "ELECTRICAL_OUTLETS"
-            ]
+        targets["POWER_STRIP"] = self.relays_target_status(
+            use_situation_config["POWER_STRIP"], POWER_STRIP_RELAYS
         )
 
-        # Set use situation Power strip statis
-        self.set_use_situation_power_strip_status(
-            self.use_situations_dict[self.current_use_situation][energy_limitation][
-                "POWER_STRIP"
-            ]
+        # Apply the resources status
+        return self.engine.execute(
+            use_situation=use_situation,
+            energy_limitation=energy_limitation,
+            targets=targets,
         )
 
-    def set_use_situation_wifi_status(self, wifi_bands_status: dict):
-        """Set wifi status"""
-        for band in wifi_bands_status:
-            band_status = wifi_bands_status[band]
-            logger.info(f"Setting wifi band {band} to {band_status}")
-            ret = wifi_bands_manager_service.set_band_status(
-                band=band, status=band_status
-            )
-            if ret is None:
-                logger.error("Error in wifi band status command execution")
-                return False
+    def relays_target_status(self, relays_status: dict, relay_numbers: range) -> dict:
+        """Return the status of all the relays, relays not in config are OFF"""
+        return {
+            relay_number: relays_status.get(relay_number, False)
+            for relay_number in relay_numbers
+        }
+
+    def get_known_band_status(self, band: str):
+        """Return the last known wifi band status"""
+        wifi_status = wifi_bands_manager_service.get_current_wifi_status()
+        if wifi_status is None:
+            return None
+        for band_status in wifi_status.bands_status:
+            if band_status.band == band:
+                return band_status.status
+        return None
+
+    def get_known_electrical_panel_status(self):
+        """Return the last electrical panel relays status received"""
+        relays_status = electrical_panel_manager_service.get_relays_last_received_status()
+        if relays_status is None:
+            return None
+        return {
+            relay_status.relay_number: relay_status.status
+            for relay_status in relays_status.relay_statuses
+        }
+
+    def get_known_power_strip_status(self):
+        """Return the current power strip relays status"""
+        relays_status = power_strip_manager_service.get_relays_status()
+        if relays_status is None:
+            return None
+        return {
+            relay_status.relay_number: relay_status.status
+            for relay_status in relays_status.relay_statuses
+        }
+
+    def set_use_situation_band_status(self, band: str, band_status: bool):
+        """Set wifi band status"""
+        logger.info(f"Setting wifi band {band} to {band_status}")
+        # In the band lane of the wifi manager, ordered with the other band changes
+        ret = wifi_bands_manager_service.set_band_status_async(
+            band=band, status=band_status
+        ).result()
+        if ret is None:
+            logger.error("Error in wifi band status command execution")
+            return False
+        return True
 
     def set_use_situation_electrical_panel_status(self, electrical_panel_status: dict):
         """Set electrical panel status"""
         # Build RelayStatus instance
         relays_status = []
-        for outlet_number in range(6):
+        for outlet_number in ELECTRICAL_PANEL_RELAYS:
             if outlet_number in electrical_panel_status:
                 outlet_status = electrical_panel_status[outlet_number]
             else:
@@ -127,12 +194,13 @@ class OrchestratorUseSituations:
         electrical_panel_manager_service.publish_mqtt_relays_status_command(
             relays_statuses
         )
+        return True
 
     def set_use_situation_power_strip_status(self, power_strip_status: dict):
         """Set electrical panel status"""
         # Build RelayStatus instance
         relays_status = []
-        for outlet_number in range(1,5):
+        for outlet_number in POWER_STRIP_RELAYS:
             if outlet_number in power_strip_status:
                 outlet_status = power_strip_status[outlet_number]
             else:
@@ -153,6 +221,7 @@ class OrchestratorUseSituations:
 
         # Call Power strip manager service to set relays status
         power_strip_manager_service.set_relays_statuses(relays_status=relays_statuses)
+        return True
 
     def get_current_use_situation(self):
         """Get current use situation"""
@@ -162,6 +231,14 @@ class OrchestratorUseSituations:
         """Get available use situation list"""
         return list(self.use_situations_dict.keys())
 
+    def get_last_use_situation_report(self) -> UseSituationReport:
+        """Get the execution report of the last use situation set"""
+        return self.engine.get_last_report()
+
+    def get_engine_metrics(self) -> dict:
+        """Get the use situations execution engine metrics"""
+        return self.engine.get_metrics()
+
     def get_use_situation_to_switch(self):
         """Get the use situation to switch for command"""
         return self.use_situations_dict[self.current_use_situation]["SWITCH_TO"]
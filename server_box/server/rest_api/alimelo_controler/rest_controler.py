@@ -2,7 +2,7 @@
 import logging
 from flask.views import MethodView
 from flask_smorest import Blueprint
-from .rest_model import AlimeloRessourcesSchema
+from .rest_model import AlimeloRessourcesSchema, TelemetryQuerySchema
 from server.managers.alimelo_manager import alimelo_manager_service
 from server.common.box_status import box_sleeping
 
@@ -22,3 +22,41 @@ class AlimeloRessources(MethodView):
         """Get Alimelo ressources"""
         logger.info(f"GET alimelo/")
         return alimelo_manager_service.alimelo_ressources
+
+
+@bp.route("/telemetry")
+class AlimeloTelemetry(MethodView):
+    """API to retrieve the alimelo power telemetry history"""
+
+    @box_sleeping
+    @bp.doc(
+        security=[{"tokenAuth": []}],
+        responses={400: "BAD_REQUEST", 404: "NOT_FOUND"},
+    )
+    @bp.arguments(TelemetryQuerySchema, location="query")
+    @bp.response(status_code=200)
+    def get(self, args: dict):
+        """Get telemetry samples (raw) or buckets mean/min/max (1min, 15min)"""
+        logger.info(f"GET alimelo/telemetry {args}")
+        return alimelo_manager_service.telemetry.query(
+            resolution=args["resolution"], since_in_secs=args["since_in_secs"]
+        )
+
+
+@bp.route("/telemetry/aggregates")
+class AlimeloTelemetryAggregates(MethodView):
+    """API to retrieve the alimelo power telemetry aggregates"""
+
+    @box_sleeping
+    @bp.doc(
+        security=[{"tokenAuth": []}],
+        responses={400: "BAD_REQUEST", 404: "NOT_FOUND"},
+    )
+    @bp.arguments(TelemetryQuerySchema, location="query")
+    @bp.response(status_code=200)
+    def get(self, args: dict):
+        """Get min/max/mean per field and energy over the window"""
+        logger.info(f"GET alimelo/telemetry/aggregates {args}")
+        return alimelo_manager_service.telemetry.aggregate(
+            resolution=args["resolution"], since_in_secs=args["since_in_secs"]
+        )
@@ -1,7 +1,9 @@
 """REST API models for Alimelo package"""
 
 from marshmallow import Schema
-from marshmallow.fields import Float, Bool, Integer
+from marshmallow.fields import Float, Bool, Integer, Str
+from marshmallow.validate import OneOf, Range
+from server.managers.alimelo_manager import TELEMETRY_RESOLUTIONS
 
 
 class AlimeloRessourcesSchema(Schema):
@@ -16,3 +18,13 @@ class AlimeloRessourcesSchema(Schema):
     electricSocketIsPowerSupplied = Bool(required=True, allow_none=False)
     isPowredByBattery = Bool(required=True, allow_none=False)
     isChargingBattery = Bool(required=True, allow_none=False)
+
+
+class TelemetryQuerySchema(Schema):
+    """REST ressource for Alimelo telemetry query"""
+
+    resolution = Str(
+        load_default="raw",
+        validate=OneOf([resolution for resolution, _, _ in TELEMETRY_RESOLUTIONS]),
+    )
+    since_in_secs = Float(load_default=None, allow_none=True, validate=Range(min=0))
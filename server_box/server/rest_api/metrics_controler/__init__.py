@@ -0,0 +1,2 @@
+"""REST API metrics controler package"""
+from .rest_controler import bp
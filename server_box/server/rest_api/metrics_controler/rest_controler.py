@@ -0,0 +1,229 @@
+""" REST controller for orchestrator internal metrics """
+import logging
+from flask.views import MethodView
+from flask_smorest import Blueprint
+from server.managers.wifi_bands_ssh_manager import wifi_bands_manager_service
+from server.managers.connectivity_manager import connectivity_manager_service
+from server.orchestrator.use_situations import orchestrator_use_situations_service
+from server.orchestrator.notification import orchestrator_notification_service
+from server.orchestrator.outbox import notification_outbox_service
+from server.orchestrator.live_objects import live_objects_service
+from server.common.scheduler import scheduler_service
+from server.managers.thread_manager import thread_manager_service
+from server.orchestrator.requests import orchestrator_requests_service
+from server.managers.alimelo_manager import alimelo_manager_service
+from server.managers.mqtt_manager import mqtt_manager_service
+from server.managers.mqtt_liveobjects_manager import mqtt_liveobjects_manager_service
+from server.common.device_state import device_state_store
+from server.common.rest_cache import rest_cache_service
+
+logger = logging.getLogger(__name__)
+
+bp = Blueprint("metrics", __name__, url_prefix="/metrics")
+""" The api blueprint. Should be registered in app main api object """
+
+
+@bp.route("/ssh_pool")
+class SshPoolMetricsApi(MethodView):
+    """API to retrieve the livebox ssh sessions pool metrics"""
+
+    @bp.doc(
+        security=[{"tokenAuth": []}],
+        responses={400: "BAD_REQUEST", 404: "NOT_FOUND"},
+    )
+    @bp.response(status_code=200)
+    def get(self):
+        """Get ssh sessions pool metrics"""
+        logger.info(f"GET metrics/ssh_pool")
+        return wifi_bands_manager_service.get_ssh_pool_metrics()
+
+
+@bp.route("/use_situations")
+class UseSituationsMetricsApi(MethodView):
+    """API to retrieve the use situations execution engine metrics"""
+
+    @bp.doc(
+        security=[{"tokenAuth": []}],
+        responses={400: "BAD_REQUEST", 404: "NOT_FOUND"},
+    )
+    @bp.response(status_code=200)
+    def get(self):
+        """Get use situations execution engine metrics and last report"""
+        logger.info(f"GET metrics/use_situations")
+        return orchestrator_use_situations_service.get_engine_metrics()
+
+
+@bp.route("/connectivity")
+class ConnectivityMetricsApi(MethodView):
+    """API to retrieve the internet connectivity monitor metrics"""
+
+    @bp.doc(
+        security=[{"tokenAuth": []}],
+        responses={400: "BAD_REQUEST", 404: "NOT_FOUND"},
+    )
+    @bp.response(status_code=200)
+    def get(self):
+        """Get internet connectivity monitor metrics"""
+        logger.info(f"GET metrics/connectivity")
+        return connectivity_manager_service.get_metrics()
+
+
+@bp.route("/notifications")
+class NotificationsMetricsApi(MethodView):
+    """API to retrieve the cloud notifications metrics"""
+
+    @bp.doc(
+        security=[{"tokenAuth": []}],
+        responses={400: "BAD_REQUEST", 404: "NOT_FOUND"},
+    )
+    @bp.response(status_code=200)
+    def get(self):
+        """Get HTTP notifications dispatcher and status snapshots metrics"""
+        logger.info(f"GET metrics/notifications")
+        return orchestrator_notification_service.get_notification_metrics()
+
+
+@bp.route("/outbox")
+class OutboxMetricsApi(MethodView):
+    """API to retrieve the notifications outbox metrics"""
+
+    @bp.doc(
+        security=[{"tokenAuth": []}],
+        responses={400: "BAD_REQUEST", 404: "NOT_FOUND"},
+    )
+    @bp.response(status_code=200)
+    def get(self):
+        """Get notifications outbox metrics"""
+        logger.info(f"GET metrics/outbox")
+        return notification_outbox_service.get_metrics()
+
+
+@bp.route("/live_objects")
+class LiveObjectsMetricsApi(MethodView):
+    """API to retrieve the Live Objects publisher metrics"""
+
+    @bp.doc(
+        security=[{"tokenAuth": []}],
+        responses={400: "BAD_REQUEST", 404: "NOT_FOUND"},
+    )
+    @bp.response(status_code=200)
+    def get(self):
+        """Get Live Objects publisher metrics"""
+        logger.info(f"GET metrics/live_objects")
+        return live_objects_service.get_publisher_metrics()
+
+
+@bp.route("/scheduler")
+class SchedulerMetricsApi(MethodView):
+    """API to retrieve the periodic jobs scheduler metrics"""
+
+    @bp.doc(
+        security=[{"tokenAuth": []}],
+        responses={400: "BAD_REQUEST", 404: "NOT_FOUND"},
+    )
+    @bp.response(status_code=200)
+    def get(self):
+        """Get periodic jobs timing stats and shared result cache metrics"""
+        logger.info(f"GET metrics/scheduler")
+        return scheduler_service.get_metrics()
+
+
+@bp.route("/thread_dongle")
+class ThreadDongleMetricsApi(MethodView):
+    """API to retrieve the Thread dongle counters"""
+
+    @bp.doc(
+        security=[{"tokenAuth": []}],
+        responses={400: "BAD_REQUEST", 404: "NOT_FOUND"},
+    )
+    @bp.response(status_code=200)
+    def get(self):
+        """Get Thread dongle reception, framing, status writer and nodes counters"""
+        logger.info(f"GET metrics/thread_dongle")
+        return thread_manager_service.get_dongle_counters()
+
+
+@bp.route("/requests")
+class RequestsMetricsApi(MethodView):
+    """API to retrieve the Thread and MQTT requests handling metrics"""
+
+    @bp.doc(
+        security=[{"tokenAuth": []}],
+        responses={400: "BAD_REQUEST", 404: "NOT_FOUND"},
+    )
+    @bp.response(status_code=200)
+    def get(self):
+        """Get messages decoding counters, handler errors and queue metrics"""
+        logger.info(f"GET metrics/requests")
+        return orchestrator_requests_service.get_metrics()
+
+
+@bp.route("/alimelo")
+class AlimeloMetricsApi(MethodView):
+    """API to retrieve the Alimelo serial link counters"""
+
+    @bp.doc(
+        security=[{"tokenAuth": []}],
+        responses={400: "BAD_REQUEST", 404: "NOT_FOUND"},
+    )
+    @bp.response(status_code=200)
+    def get(self):
+        """Get Alimelo serial link and frames parser counters"""
+        logger.info(f"GET metrics/alimelo")
+        return alimelo_manager_service.get_link_counters()
+
+
+@bp.route("/mqtt")
+class MqttMetricsApi(MethodView):
+    """API to retrieve the MQTT connections, publish pipelines and dispatchers metrics"""
+
+    @bp.doc(
+        security=[{"tokenAuth": []}],
+        responses={400: "BAD_REQUEST", 404: "NOT_FOUND"},
+    )
+    @bp.response(status_code=200)
+    def get(self):
+        """Get local broker and Live Objects connection, publish and dispatch metrics"""
+        logger.info(f"GET metrics/mqtt")
+        return {
+            "local": {
+                "connection": mqtt_manager_service.get_connection_metrics(),
+                "publish": mqtt_manager_service.get_publish_metrics(),
+                "dispatch": mqtt_manager_service.get_dispatch_metrics(),
+            },
+            "live_objects": {
+                "connection": mqtt_liveobjects_manager_service.get_connection_metrics(),
+                "publish": mqtt_liveobjects_manager_service.get_publish_metrics(),
+                "dispatch": mqtt_liveobjects_manager_service.get_dispatch_metrics(),
+            },
+        }
+
+
+@bp.route("/device_state")
+class DeviceStateMetricsApi(MethodView):
+    """API to retrieve the device state store metrics"""
+
+    @bp.doc(
+        security=[{"tokenAuth": []}],
+        responses={400: "BAD_REQUEST", 404: "NOT_FOUND"},
+    )
+    @bp.response(status_code=200)
+    def get(self):
+        """Get device state version, commits and last change version per resource"""
+        logger.info(f"GET metrics/device_state")
+        return device_state_store.get_metrics()
+
+
+@bp.route("/rest_cache")
+class RestCacheMetricsApi(MethodView):
+    """API to retrieve the REST readings cache metrics"""
+
+    @bp.doc(
+        security=[{"tokenAuth": []}],
+        responses={400: "BAD_REQUEST", 404: "NOT_FOUND"},
+    )
+    @bp.response(status_code=200)
+    def get(self):
+        """Get REST cache requests, fresh requests and shared readings counters"""
+        logger.info(f"GET metrics/rest_cache")
+        return rest_cache_service.get_metrics()
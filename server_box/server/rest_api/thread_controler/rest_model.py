@@ -1,7 +1,23 @@
 """REST API models for Thread package"""
 
 from marshmallow import Schema
-from marshmallow.fields import Str, Bool
+from marshmallow.fields import Str, Bool, Int, Float, Nested
+
+
+class KeepAliveIntervalSchema(Schema):
+    """REST ressource for Thread node keep alive interval"""
+
+    avg = Float(required=True, allow_none=True)
+    min = Float(required=True, allow_none=True)
+    max = Float(required=True, allow_none=True)
+
+
+class RssiSchema(Schema):
+    """REST ressource for Thread node RSSI"""
+
+    last = Int(required=True, allow_none=True)
+    min = Int(required=True, allow_none=True)
+    max = Int(required=True, allow_none=True)
 
 
 class NodeSchema(Schema):
@@ -9,6 +25,9 @@ class NodeSchema(Schema):
 
     id = Str(required=True, allow_none=False)
     last_seen = Str(required=True, allow_none=False)
+    keep_alives = Int(required=True, allow_none=False)
+    keep_alive_interval_in_secs = Nested(KeepAliveIntervalSchema, required=True)
+    rssi = Nested(RssiSchema, required=True)
 
 
 class ThreadNetworkSetupSchema(Schema):
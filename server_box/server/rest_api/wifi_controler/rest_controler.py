@@ -2,9 +2,10 @@
 import logging
 from flask.views import MethodView
 from flask_smorest import Blueprint
-from server.managers.wifi_bands_ssh_manager import wifi_bands_manager_service
-from .rest_model import WifiStatusSchema, MacAdressListSchema
+from server.managers.wifi_bands_ssh_manager import wifi_bands_manager_service, BANDS
+from .rest_model import WifiStatusSchema, MacAdressListSchema, CachedReadingQuerySchema
 from server.common.box_status import box_sleeping
+from server.common.rest_cache import rest_cache_service, WIFI_STATUS_READING, WIFI_STATIONS_READING
 from server.common import ServerBoxException, ErrorCode
 
 
@@ -14,6 +15,31 @@ bp = Blueprint("wifi", __name__, url_prefix="/wifi")
 """ The api blueprint. Should be registered in app main api object """
 
 
+def get_wifi_status(fresh: bool):
+    """Return the cached wifi status reading, shared with the polling jobs"""
+    wifi_status = rest_cache_service.get(
+        WIFI_STATUS_READING,
+        read=wifi_bands_manager_service.update_wifi_status_attribute,
+        fresh=fresh,
+    )
+    if wifi_status is None:
+        raise ServerBoxException(ErrorCode.SSH_CONNECTION_ERROR)
+    return wifi_status
+
+
+def get_connected_stations(band: str, fresh: bool):
+    """Return the cached connected stations reading"""
+    stations = rest_cache_service.get(
+        WIFI_STATIONS_READING,
+        read=lambda: wifi_bands_manager_service.get_connected_stations_mac_list(band),
+        key=band,
+        fresh=fresh,
+    )
+    if stations is None:
+        raise ServerBoxException(ErrorCode.SSH_CONNECTION_ERROR)
+    return stations
+
+
 @bp.route("/")
 class WifiStatusApi(MethodView):
     """API to retrieve wifi general status"""
@@ -22,14 +48,13 @@ class WifiStatusApi(MethodView):
         security=[{"tokenAuth": []}],
         responses={400: "BAD_REQUEST", 404: "NOT_FOUND"},
     )
+    @bp.etag
+    @bp.arguments(CachedReadingQuerySchema, location="query")
     @bp.response(status_code=200, schema=WifiStatusSchema)
-    def get(self):
-        """Get livebox wifi status"""
+    def get(self, args: CachedReadingQuerySchema):
+        """Get livebox wifi status, from a recent reading unless fresh"""
         logger.info(f"GET wifi/")
-        status = wifi_bands_manager_service.get_wifi_status()
-        if status is None:
-            raise ServerBoxException(ErrorCode.SSH_CONNECTION_ERROR)
-        return {"status": status}
+        return {"status": get_wifi_status(args["fresh"]).status}
 
     @box_sleeping
     @bp.doc(security=[{"tokenAuth": []}], responses={400: "BAD_REQUEST"})
@@ -59,16 +84,19 @@ class WifiBandsStatusApi(MethodView):
         security=[{"tokenAuth": []}],
         responses={400: "BAD_REQUEST", 404: "NOT_FOUND"},
     )
+    @bp.etag
+    @bp.arguments(CachedReadingQuerySchema, location="query")
     @bp.response(status_code=200, schema=WifiStatusSchema)
-    def get(self, band: str):
-        """Get wifi band status"""
+    def get(self, args: CachedReadingQuerySchema, band: str):
+        """Get wifi band status, from a recent reading unless fresh"""
         logger.info(f"GET wifi/bands/{band}")
 
-        status = wifi_bands_manager_service.get_band_status(band)
-        if status is None:
-            raise ServerBoxException(ErrorCode.SSH_CONNECTION_ERROR)
-
-        return {"status": status}
+        if band not in BANDS:
+            raise ServerBoxException(ErrorCode.UNKNOWN_BAND_WIFI)
+        for band_status in get_wifi_status(args["fresh"]).bands_status:
+            if band_status.band == band:
+                return {"status": band_status.status}
+        raise ServerBoxException(ErrorCode.SSH_CONNECTION_ERROR)
 
 
     @box_sleeping
@@ -99,16 +127,13 @@ class WifiConnectedStationsApi(MethodView):
         security=[{"tokenAuth": []}],
         responses={400: "BAD_REQUEST", 404: "NOT_FOUND"},
     )
+    @bp.etag
+    @bp.arguments(CachedReadingQuerySchema, location="query")
     @bp.response(status_code=200, schema=MacAdressListSchema)
-    def get(self):
-        """Get connected stations"""
+    def get(self, args: CachedReadingQuerySchema):
+        """Get connected stations, from a recent reading unless fresh"""
         logger.info(f"GET wifi/stations/")
-
-        stations = wifi_bands_manager_service.get_connected_stations_mac_list()
-        if stations is None:
-            raise ServerBoxException(ErrorCode.SSH_CONNECTION_ERROR)
-
-        return {"mac_list": stations}
+        return {"mac_list": get_connected_stations(None, args["fresh"])}
 
 
 @bp.route("/stations/<band>")
@@ -120,13 +145,10 @@ class WifiConnectedStationsApi(MethodView):
         security=[{"tokenAuth": []}],
         responses={400: "BAD_REQUEST", 404: "NOT_FOUND"},
     )
+    @bp.etag
+    @bp.arguments(CachedReadingQuerySchema, location="query")
     @bp.response(status_code=200, schema=MacAdressListSchema)
-    def get(self, band: str):
-        """Get connected stations"""
+    def get(self, args: CachedReadingQuerySchema, band: str):
+        """Get connected stations for a band, from a recent reading unless fresh"""
         logger.info(f"GET wifi/stations/{band}")
-
-        stations = wifi_bands_manager_service.get_connected_stations_mac_list(band)
-        if stations is None:
-            raise ServerBoxException(ErrorCode.SSH_CONNECTION_ERROR)
-
-        return {"mac_list": stations}
+        return {"mac_list": get_connected_stations(band, args["fresh"])}
@@ -10,6 +10,12 @@ class WifiStatusSchema(Schema):
     status = Bool(required=True, allow_none=False)
 
 
+class CachedReadingQuerySchema(Schema):
+    """REST ressource for the GET endpoints served from the cache"""
+
+    fresh = Bool(load_default=False)
+
+
 class MacAdressListSchema(Schema):
     """Rest ressource for mac addresses list"""
 
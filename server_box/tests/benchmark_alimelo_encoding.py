@@ -0,0 +1,41 @@
+"""
+Alimelo wire encodings size and transmission time comparison
+Run from server_box: python -m tests.benchmark_alimelo_encoding
+"""
+import timeit
+from server.interfaces.alimelo_interface.codec import ENCODERS
+
+BAUD_RATE = 9600
+# 8N1: start bit, 8 data bits, stop bit
+BITS_PER_BYTE = 10
+
+PAYLOADS = {
+    "status": {
+        "wf": {"w": True, "ci": False, "w2": True, "w5": True, "w6": False},
+        "ep": "110100",
+        "us": "PRESENCE_HOME_OFFICE",
+    },
+    "status_unknown_us": {
+        "wf": {"w": False, "ci": False, "w2": False, "w5": False, "w6": None},
+        "ep": "",
+        "us": "CUSTOM_SITUATION",
+    },
+    "alarm": {"al": {"doorbell": 1}},
+    "battery_alarm": {"al": {"battery_btn_bt1": 1}},
+}
+
+
+def main():
+    print(f"{'payload':<20}{'encoding':<10}{'bytes':>7}{'ms @9600':>10}{'encode us':>11}")
+    for name, payload in PAYLOADS.items():
+        for encoding, encode in ENCODERS.items():
+            size = len(encode(payload).encode())
+            transmission_in_ms = size * BITS_PER_BYTE / BAUD_RATE * 1000
+            encode_in_us = timeit.timeit(lambda: encode(payload), number=10000) * 100
+            print(
+                f"{name:<20}{encoding:<10}{size:>7}{transmission_in_ms:>10.1f}{encode_in_us:>11.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
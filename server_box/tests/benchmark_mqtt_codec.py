@@ -0,0 +1,100 @@
+"""
+MQTT payloads codec speed, legacy model serialization against the codec
+with the json module and orjson when installed
+Run from server_box: python -m tests.benchmark_mqtt_codec
+"""
+import json
+import timeit
+import dateutil.parser
+from server.interfaces.mqtt_interface import codec
+from server.interfaces.mqtt_interface.model import SingleRelayStatus, RelaysStatus
+from server.interfaces.mqtt_liveobjects_interface import model as live_objects_model
+
+NUMBER = 20000
+
+
+def relays_status(relays: int) -> RelaysStatus:
+    """Relays status as published by the box"""
+    return RelaysStatus(
+        relay_statuses=[SingleRelayStatus(i, i % 2 == 0, True) for i in range(relays)],
+        command=True,
+    )
+
+
+MESSAGES = {
+    "electrical_panel": relays_status(6),
+    "power_strip": relays_status(4),
+}
+
+LIVE_OBJECTS_PAYLOADS = {
+    "lo_status": {
+        "wf": {"w": True, "ci": False, "w2": True, "w5": True, "w6": False},
+        "ep": "110100",
+        "us": "PRESENCE_HOME_OFFICE",
+    },
+    "lo_alarm": {"al": {"doorbell": 1}},
+}
+
+
+def legacy_serialize(msg) -> str:
+    """Serialization before the codec"""
+    return json.dumps(msg if type(msg) is dict else msg.to_json())
+
+
+def legacy_deserialize(payload):
+    """Deserialization before the codec"""
+    data = json.loads(payload)
+    if "relay_statuses" in data:
+        return RelaysStatus(
+            relay_statuses=[SingleRelayStatus.from_json(r) for r in data["relay_statuses"]],
+            command=data["command"],
+            timestamp=dateutil.parser.isoparse(data["timestamp"]),
+        )
+    return data
+
+
+def time_in_us(fn, arg) -> float:
+    """Average call time in microseconds"""
+    return timeit.timeit(lambda: fn(arg), number=NUMBER) / NUMBER * 1e6
+
+
+def run(implementations: dict, messages: dict):
+    """Print encode and decode times of each implementation"""
+    for name, msg in messages.items():
+        for implementation, (serialize, deserialize) in implementations.items():
+            payload = serialize(msg)
+            print(
+                f"{name:<20}{implementation:<10}{len(payload):>7}"
+                f"{time_in_us(serialize, msg):>12.2f}{time_in_us(deserialize, payload):>12.2f}"
+            )
+
+
+def main():
+    orjson = codec.orjson
+    implementations = {"legacy": (legacy_serialize, legacy_deserialize)}
+
+    def without_orjson(fn):
+        def call(arg):
+            codec.orjson = None
+            try:
+                return fn(arg)
+            finally:
+                codec.orjson = orjson
+
+        return call
+
+    implementations["json"] = (without_orjson(codec.serialize), without_orjson(codec.deserialize))
+    if orjson is not None:
+        implementations["orjson"] = (codec.serialize, codec.deserialize)
+
+    print(f"{'payload':<20}{'codec':<10}{'bytes':>7}{'encode us':>12}{'decode us':>12}")
+    run(implementations, MESSAGES)
+    live_objects = {
+        "legacy": (legacy_serialize, json.loads),
+        "codec": (live_objects_model.serialize, live_objects_model.deserialize),
+    }
+    run(live_objects, LIVE_OBJECTS_PAYLOADS)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Device state store unit tests"""
+import threading
+import time
+from server.common.device_state import DeviceStateStore
+
+
+def test_commit_publishes_new_snapshot():
+    # GIVEN
+    store = DeviceStateStore()
+    store.update({"use_situation": "DEEP_SLEEP", "thread_nodes": frozenset({"node1"})})
+    before = store.snapshot()
+
+    # WHEN
+    after = store.set("use_situation", "ABSENCE_LOW_CONSUMPTION")
+
+    # THEN
+    assert before.version == 1
+    assert before["use_situation"] == "DEEP_SLEEP"
+    assert after.version == 2
+    assert after["use_situation"] == "ABSENCE_LOW_CONSUMPTION"
+    assert after.key_versions == {"use_situation": 2, "thread_nodes": 1}
+    assert store.snapshot() is after
+
+
+def test_subscribers_called_on_change_only():
+    # GIVEN
+    store = DeviceStateStore()
+    changes = []
+    store.subscribe("use_situation", lambda key, value, snapshot: changes.append((value, snapshot.version)))
+    store.subscribe("use_situation", lambda key, value, snapshot: 1 / 0)
+
+    # WHEN
+    store.set("use_situation", "DEEP_SLEEP")
+    store.set("use_situation", "DEEP_SLEEP")
+    store.set("thread_nodes", frozenset())
+    store.set("use_situation", "PRESENCE_HOME_OFFICE")
+
+    # THEN
+    assert changes == [("DEEP_SLEEP", 1), ("PRESENCE_HOME_OFFICE", 3)]
+    assert store.get_metrics()["callback_errors"] == 2
+    assert store.get_metrics()["unchanged"] == 1
+
+
+def test_concurrent_modifications_kept():
+    # GIVEN
+    store = DeviceStateStore()
+    store.set("thread_nodes", frozenset())
+
+    def add_node(node: str):
+        def apply(nodes: frozenset) -> frozenset:
+            # Let the other writers read the same value without the lock
+            time.sleep(0.01)
+            return nodes | {node}
+
+        store.modify("thread_nodes", apply)
+
+    threads = [threading.Thread(target=add_node, args=(f"node{i}",)) for i in range(3)]
+
+    # WHEN
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # THEN
+    assert store.get("thread_nodes") == frozenset({"node0", "node1", "node2"})
+    assert store.snapshot().version == 4
@@ -0,0 +1,58 @@
+"""Keyed executor unit tests"""
+import queue
+import threading
+import time
+import pytest
+from server.common.executor import KeyedExecutor
+
+
+@pytest.fixture(scope="function")
+def executor():
+    executor = KeyedExecutor(max_workers=4, name="TestExecutor")
+    yield executor
+    executor.shutdown(wait=True)
+
+
+def test_same_key_tasks_keep_order(executor):
+    # GIVEN
+    executed = []
+
+    # WHEN
+    futures = [
+        executor.submit("lane", lambda idx: executed.append(idx) or time.sleep(0.01), idx)
+        for idx in range(5)
+    ]
+    for future in futures:
+        future.result(timeout=2)
+
+    # THEN
+    assert executed == [0, 1, 2, 3, 4]
+
+
+def test_different_keys_run_concurrently(executor):
+    # GIVEN
+    barrier = threading.Barrier(3, timeout=2)
+
+    # WHEN
+    futures = [executor.submit(key, barrier.wait) for key in ("a", "b", "c")]
+
+    # THEN
+    for future in futures:
+        future.result(timeout=2)
+    assert executor.get_metrics()["submitted"] == 3
+
+
+def test_bounded_executor_rejects_when_full():
+    # GIVEN
+    executor = KeyedExecutor(max_workers=1, max_queue_size=1, name="TestExecutor")
+    started = threading.Event()
+    release = threading.Event()
+    executor.submit("lane", lambda: started.set() or release.wait())
+    started.wait(timeout=2)
+    executor.submit("lane", release.wait)
+
+    # WHEN / THEN
+    with pytest.raises(queue.Full):
+        executor.submit("lane", release.wait)
+    release.set()
+    executor.shutdown(wait=True)
@@ -0,0 +1,44 @@
+"""REST read-through cache unit tests"""
+from server.common.scheduler import SharedResultCache
+from server.common.rest_cache import RestCache
+
+
+def test_readings_reused_until_fresh_request():
+    # GIVEN
+    rest_cache = RestCache(result_cache=SharedResultCache())
+    rest_cache.max_age_in_secs = 60
+    readings = []
+
+    def read():
+        readings.append(len(readings))
+        return readings[-1]
+
+    # WHEN
+    first = rest_cache.get("wifi_status", read)
+    cached = rest_cache.get("wifi_status", read)
+    fresh = rest_cache.get("wifi_status", read, fresh=True)
+
+    # THEN
+    assert (first, cached, fresh) == (0, 0, 1)
+    assert rest_cache.get_metrics()["fresh_requests"] == 1
+
+
+def test_per_endpoint_max_age_and_keys():
+    # GIVEN
+    rest_cache = RestCache(result_cache=SharedResultCache())
+    rest_cache.max_age_in_secs = 60
+    rest_cache.max_ages = {"wifi_stations": 0}
+    readings = []
+
+    def read():
+        readings.append(1)
+        return ["aa:bb:cc:dd:ee:ff"]
+
+    # WHEN
+    rest_cache.get("wifi_stations", read, key="5GHz")
+    rest_cache.get("wifi_stations", read, key="5GHz")
+    rest_cache.get("wifi_status", read)
+    rest_cache.get("wifi_status", read)
+
+    # THEN
+    assert len(readings) == 3
@@ -0,0 +1,129 @@
+"""Scheduler timing unit tests, the job task is stepped with a fake clock"""
+import types
+from datetime import timedelta
+import pytest
+from server.common.scheduler import service
+from server.common.scheduler.service import Scheduler
+
+
+class FakeClock:
+    """Monotonic clock advanced by the scheduler sleeps"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+    @types.coroutine
+    def sleep(self, delay: float):
+        yield delay
+        self.now += delay
+
+
+class FakeLoop:
+    """Loop keeping the submitted job runs until they are completed"""
+
+    def __init__(self):
+        self.pending = []
+
+    def run_in_executor(self, executor, function: callable, *args):
+        self.pending.append((function, args))
+
+    def complete(self):
+        for function, args in self.pending:
+            function(*args)
+        self.pending = []
+
+
+@pytest.fixture(scope="function")
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(service.time, "monotonic", clock.monotonic)
+    monkeypatch.setattr(service.asyncio, "sleep", clock.sleep)
+    return clock
+
+
+def create_job(scheduler: Scheduler, function: callable, jitter_in_secs: float = 0):
+    return scheduler.add_job(
+        function=function,
+        interval=timedelta(seconds=10),
+        jitter_in_secs=jitter_in_secs,
+        name="job",
+    )
+
+
+def test_job_runs_at_interval(clock):
+    # GIVEN
+    run_times = []
+    scheduler = Scheduler()
+    job = create_job(scheduler, lambda: run_times.append(clock.now))
+    scheduler.loop = FakeLoop()
+    task = scheduler._run_periodically(job)
+    # Sleep until the first run
+    task.send(None)
+
+    # WHEN
+    for _ in range(3):
+        task.send(None)
+        scheduler.loop.complete()
+
+    # THEN
+    assert run_times == [1010.0, 1020.0, 1030.0]
+    assert job.get_stats()["runs"] == 3
+
+
+def test_jitter_delays_run_within_bounds(clock, monkeypatch):
+    # GIVEN
+    scheduler = Scheduler()
+    job = create_job(scheduler, lambda: None, jitter_in_secs=2)
+    monkeypatch.setattr(service.random, "uniform", lambda low, high: high)
+    task = scheduler._run_periodically(job)
+
+    # WHEN
+    delays = [task.send(None)]
+    scheduler.loop = FakeLoop()
+    delays.append(task.send(None))
+
+    # THEN
+    assert delays == [12.0, 10.0]
+
+
+def test_run_skipped_while_previous_run_active(clock):
+    # GIVEN
+    scheduler = Scheduler()
+    job = create_job(scheduler, lambda: None)
+    scheduler.loop = FakeLoop()
+    task = scheduler._run_periodically(job)
+    # Sleep until the first run
+    task.send(None)
+
+    # WHEN
+    for _ in range(3):
+        task.send(None)
+    skipped = job.get_stats()["overruns_skipped"]
+    scheduler.loop.complete()
+    task.send(None)
+
+    # THEN
+    assert skipped == 2
+    assert len(scheduler.loop.pending) == 1
+    assert job.get_stats()["runs"] == 1
+
+
+def test_missed_periods_coalesced(clock):
+    # GIVEN
+    scheduler = Scheduler()
+    job = create_job(scheduler, lambda: None)
+    scheduler.loop = FakeLoop()
+    task = scheduler._run_periodically(job)
+
+    # WHEN
+    task.send(None)
+    # The run due at 1010 starts 35 s late
+    clock.now += 35
+    next_delay = task.send(None)
+
+    # THEN
+    assert job.get_stats()["coalesced"] == 3
+    assert next_delay == 5.0
@@ -0,0 +1,58 @@
+"""Alimelo wire encodings unit tests"""
+from server.interfaces.alimelo_interface.codec import (
+    encode_compact,
+    decode_compact,
+    encode_json,
+)
+
+
+def test_compact_status_round_trip():
+    # GIVEN
+    status = {
+        "wf": {"w": True, "ci": False, "w2": True, "w5": True, "w6": None},
+        "ep": "110100",
+        "us": "ABSENCE_LOW_CONSUMPTION",
+    }
+
+    # WHEN
+    frame = encode_compact(status)
+
+    # THEN
+    assert len(frame) == 5
+    assert decode_compact(frame) == status
+
+
+def test_compact_alarms_round_trip():
+    # GIVEN
+    alarms = {"al": {"doorbell": 1, "battery_btn_bt1": 1}}
+
+    # WHEN
+    frame = encode_compact(alarms)
+
+    # THEN
+    assert frame == "AA~battery_btn_bt1;"
+    assert decode_compact(frame) == alarms
+
+
+def test_compact_merged_alarms_keep_counts():
+    # GIVEN
+    alarms = {"al": {"presence": 2, "doorbell": 1}}
+
+    # WHEN
+    frame = encode_compact(alarms)
+
+    # THEN
+    assert frame == "ABBA"
+    assert decode_compact(frame) == alarms
+
+
+def test_payload_out_of_schema_is_sent_as_json():
+    # GIVEN
+    payload = {"wf": {"w": True}, "ep": "12", "us": "DEEP_SLEEP"}
+
+    # WHEN
+    frame = encode_compact(payload)
+
+    # THEN
+    assert frame == "J" + encode_json(payload)
+    assert decode_compact(frame) == payload
@@ -0,0 +1,58 @@
+"""Alimelo frames parser unit tests"""
+from server.interfaces.alimelo_interface.parser import (
+    AlimeloFrameParser,
+    NOTIFICATION,
+    COMMAND,
+)
+
+
+def get_parser():
+    return AlimeloFrameParser(
+        notification_separator="ORCHESTRATOR_SERIAL_NOTIFICATION",
+        command_separator="ORCHESTRATOR_SERIAL_COMMAND",
+    )
+
+
+def test_notification_split_across_reads():
+    # GIVEN
+    parser = get_parser()
+
+    # WHEN
+    first_frames = parser.feed(b"ORCHESTRATOR_SERIAL_NOTIFICATION_BEGINS\r\n")
+    second_frames = parser.feed(b'{"alimelo":\r\n{"bat": 9')
+    third_frames = parser.feed(b'00}}\r\nORCHESTRATOR_SERIAL_NOTIFICATION_ENDS\r\n')
+
+    # THEN
+    assert first_frames == second_frames == []
+    assert third_frames == [(NOTIFICATION, '{"alimelo":{"bat": 900}}')]
+
+
+def test_notification_and_command_received_together():
+    # GIVEN
+    parser = get_parser()
+
+    # WHEN
+    frames = parser.feed(
+        b"noise\r\n"
+        b"ORCHESTRATOR_SERIAL_COMMAND_BEGINS\r\n{\"cmd\": 1}\r\nORCHESTRATOR_SERIAL_COMMAND_ENDS\r\n"
+        b"ORCHESTRATOR_SERIAL_NOTIFICATION_BEGINS\r\n{}\r\nORCHESTRATOR_SERIAL_NOTIFICATION_ENDS\r\n"
+    )
+
+    # THEN
+    assert frames == [(COMMAND, '{"cmd": 1}'), (NOTIFICATION, "{}")]
+    assert parser.counters["ignored_lines"] == 1
+
+
+def test_unterminated_frame_is_dropped():
+    # GIVEN
+    parser = get_parser()
+
+    # WHEN
+    frames = parser.feed(
+        b"ORCHESTRATOR_SERIAL_COMMAND_BEGINS\r\npartial\r\n"
+        b"ORCHESTRATOR_SERIAL_NOTIFICATION_BEGINS\r\n{}\r\nORCHESTRATOR_SERIAL_NOTIFICATION_ENDS\r\n"
+    )
+
+    # THEN
+    assert frames == [(NOTIFICATION, "{}")]
+    assert parser.counters["unterminated_frames"] == 1
@@ -0,0 +1,93 @@
+"""SSH connection pool unit tests"""
+import pytest
+from server.interfaces.box_interface_ssh import pool as pool_module
+from server.interfaces.box_interface_ssh import box_ssh_connection_pool
+from server.common import ServerBoxException
+
+
+class FakeSshClient:
+    """Fake ssh session, counts the handshakes"""
+
+    handshakes = 0
+
+    def __init__(self, **kwargs):
+        self.connection = object()
+        self.alive = False
+
+    def open(self):
+        FakeSshClient.handshakes += 1
+        self.alive = True
+
+    def is_alive(self):
+        return self.alive
+
+    def close(self):
+        self.alive = False
+
+    def send_command(self, command: str):
+        if not self.alive:
+            raise ServerBoxException(pool_module.ErrorCode.SSH_CONNECTION_ERROR)
+        return f"output {command}"
+
+
+@pytest.fixture(scope="function")
+def pool(monkeypatch):
+    FakeSshClient.handshakes = 0
+    monkeypatch.setattr(pool_module, "SshClient", FakeSshClient)
+    yield box_ssh_connection_pool(host="livebox", max_sessions=2, timeout_in_secs=0.1)
+
+
+def test_session_is_reused(pool):
+    # GIVEN
+    with pool.session() as session:
+        session.send_command("wl -i wl0 bss")
+
+    # WHEN
+    with pool.session() as session:
+        output = session.send_command("wl -i wl1 bss")
+
+    # THEN
+    assert output == "output wl -i wl1 bss"
+    assert FakeSshClient.handshakes == 1
+    assert pool.get_metrics()["sessions_reused"] == 1
+
+
+def test_broken_session_reconnects(pool):
+    # GIVEN
+    with pool.session() as session:
+        session._holder[0].alive = False
+
+        # WHEN
+        output = session.send_command("wl -i wl0 bss")
+
+    # THEN
+    assert output == "output wl -i wl0 bss"
+    assert pool.get_metrics()["reconnections"] == 1
+
+
+def test_acquire_timeout_when_pool_is_full(pool):
+    # GIVEN
+    first = pool.acquire()
+    second = pool.acquire()
+
+    # WHEN / THEN
+    with pytest.raises(ServerBoxException):
+        pool.acquire()
+    pool.release(first)
+    pool.release(second)
+    assert pool.get_metrics()["acquire_timeouts"] == 1
+
+
+def test_idle_sessions_are_closed(pool):
+    # GIVEN
+    pool.idle_timeout_in_secs = 0
+    with pool.session() as session:
+        session.send_command("wl -i wl0 bss")
+
+    # WHEN
+    with pool.session() as session:
+        session.send_command("wl -i wl0 bss")
+
+    # THEN
+    assert pool.get_metrics()["sessions_closed_idle"] == 1
+    assert FakeSshClient.handshakes == 2
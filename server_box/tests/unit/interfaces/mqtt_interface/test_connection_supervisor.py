@@ -0,0 +1,113 @@
+"""MQTT connection supervisor unit tests"""
+import paho.mqtt.client as mqtt
+from server.interfaces.mqtt_interface.client import MQTTClient
+from server.interfaces.mqtt_interface.supervisor import ConnectionSupervisor
+
+
+class FakeClient:
+    """paho client network loop, the connection is lost after loops_before_loss loops"""
+
+    def __init__(self, loops_before_loss: int):
+        self.loops_before_loss = loops_before_loss
+        self.loops = 0
+        self.supervisor = None
+
+    def loop(self, timeout):
+        self.loops += 1
+        if self.loops == self.loops_before_loss:
+            return mqtt.MQTT_ERR_CONN_LOST
+        if self.loops > self.loops_before_loss:
+            # Connected again, end of the test
+            self.supervisor.stop()
+        return mqtt.MQTT_ERR_SUCCESS
+
+
+def create_supervisor(client=None, connect=None) -> ConnectionSupervisor:
+    supervisor = ConnectionSupervisor(
+        client=client, connect=connect, min_delay_in_secs=1, max_delay_in_secs=8
+    )
+    # Record the backoff waits instead of sleeping
+    supervisor.waits = []
+    supervisor._stopped.wait = supervisor.waits.append
+    return supervisor
+
+
+def test_backoff_doubles_up_to_max_with_jitter():
+    # GIVEN
+    supervisor = create_supervisor()
+
+    # WHEN
+    for _ in range(5):
+        supervisor._backoff()
+
+    # THEN
+    for wait, max_delay in zip(supervisor.waits, [1, 2, 4, 8, 8]):
+        assert max_delay / 2 <= wait <= max_delay
+    assert supervisor.get_metrics()["reconnection_delay_in_secs"] == 8
+
+
+def test_connection_resets_backoff():
+    # GIVEN
+    states = []
+    supervisor = create_supervisor()
+    supervisor.add_state_callback(states.append)
+    for _ in range(3):
+        supervisor._backoff()
+
+    # WHEN
+    supervisor.set_connected(True)
+    supervisor.set_connected(True)
+
+    # THEN
+    assert supervisor.get_metrics()["reconnection_delay_in_secs"] == 1
+    assert states == [True]
+    assert supervisor.wait_for_connection(timeout_in_secs=0)
+
+
+def test_reconnection_after_failures_and_loss():
+    # GIVEN
+    client = FakeClient(loops_before_loss=2)
+    connect_results = [OSError("refused"), OSError("refused"), None, None]
+
+    def connect():
+        result = connect_results.pop(0)
+        if result is not None:
+            raise result
+        supervisor.set_connected(True)
+
+    supervisor = create_supervisor(client=client, connect=connect)
+    client.supervisor = supervisor
+
+    # WHEN
+    supervisor._run()
+
+    # THEN
+    assert connect_results == []
+    assert len(supervisor.waits) == 3
+    assert 1 <= supervisor.waits[1] <= 2
+    # Backoff reset by the connection before the loss
+    assert 0.5 <= supervisor.waits[2] <= 1
+    metrics = supervisor.get_metrics()
+    assert metrics["connection_attempts"] == 4
+    assert metrics["connections"] == 2
+    assert metrics["disconnections"] == 2
+
+
+def test_subscribed_again_on_connection():
+    # GIVEN
+    mqtt_client = MQTTClient(broker_address="localhost", username="test")
+    mqtt_client.subscribe("alarm/#", lambda msg: None)
+    mqtt_client.subscribe("relays/status", lambda msg: None)
+    paho_client = mqtt_client._client
+    subscriptions = []
+    paho_client.subscribe = lambda topic, qos: subscriptions.append((topic, qos))
+
+    # WHEN
+    paho_client.on_connect(paho_client, None, {}, mqtt.CONNACK_REFUSED_SERVER_UNAVAILABLE)
+    refused_subscriptions = list(subscriptions)
+    paho_client.on_connect(paho_client, None, {}, mqtt.CONNACK_ACCEPTED)
+
+    # THEN
+    assert refused_subscriptions == []
+    assert sorted(subscriptions) == [("alarm/#", 1), ("relays/status", 1)]
+    assert mqtt_client.get_connection_metrics()["connected"]
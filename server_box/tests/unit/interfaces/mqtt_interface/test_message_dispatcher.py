@@ -0,0 +1,94 @@
+"""MQTT messages dispatcher unit tests"""
+import threading
+import time
+from server.interfaces.mqtt_interface.dispatcher import MessageDispatcher
+
+
+def wait_handled(dispatcher: MessageDispatcher, count: int):
+    deadline = time.monotonic() + 2
+    while time.monotonic() < deadline:
+        metrics = dispatcher.get_metrics()
+        if sum(topic["handled"] for topic in metrics["topics"].values()) >= count:
+            return
+        time.sleep(0.01)
+    raise TimeoutError("Messages not handled")
+
+
+def test_same_topic_messages_keep_order():
+    # GIVEN
+    dispatcher = MessageDispatcher(max_workers=4, max_queue_size=100)
+    received = {"a": [], "b": []}
+
+    def callback(msg):
+        # Slow first messages would be overtaken without topic ordering
+        time.sleep(0.01 if msg[1] < 2 else 0)
+        received[msg[0]].append(msg[1])
+
+    # WHEN
+    for idx in range(10):
+        for topic in received:
+            dispatcher.dispatch(topic, [callback], (topic, idx))
+    wait_handled(dispatcher, 20)
+    dispatcher.executor.shutdown()
+
+    # THEN
+    assert received == {"a": list(range(10)), "b": list(range(10))}
+
+
+def test_messages_dropped_when_queue_full():
+    # GIVEN
+    dispatcher = MessageDispatcher(max_workers=1, max_queue_size=2)
+    release = threading.Event()
+    handled = []
+
+    # WHEN
+    dispatcher.dispatch("busy", [lambda msg: release.wait(2)], None)
+    time.sleep(0.05)
+    for idx in range(4):
+        dispatcher.dispatch("topic", [handled.append], idx)
+    release.set()
+    wait_handled(dispatcher, 3)
+    dispatcher.executor.shutdown()
+
+    # THEN
+    assert handled == [0, 1]
+    assert dispatcher.get_metrics()["dropped"] == 2
+
+
+def test_priority_topic_handled_first():
+    # GIVEN
+    dispatcher = MessageDispatcher(
+        max_workers=1, max_queue_size=10, priority_topics=["alarm/#"]
+    )
+    release = threading.Event()
+    handled = []
+
+    # WHEN
+    dispatcher.dispatch("busy", [lambda msg: release.wait(2)], None)
+    time.sleep(0.05)
+    dispatcher.dispatch("status", [handled.append], "status")
+    dispatcher.dispatch("alarm/doorbell", [handled.append], "alarm")
+    release.set()
+    wait_handled(dispatcher, 3)
+    dispatcher.executor.shutdown()
+
+    # THEN
+    assert handled == ["alarm", "status"]
+
+
+def test_failing_callback_does_not_stop_others():
+    # GIVEN
+    dispatcher = MessageDispatcher(max_workers=1, max_queue_size=10)
+    handled = []
+
+    def failing_callback(msg):
+        raise ValueError("invalid message")
+
+    # WHEN
+    dispatcher.dispatch("topic", [failing_callback, handled.append], "msg")
+    wait_handled(dispatcher, 1)
+    dispatcher.executor.shutdown()
+
+    # THEN
+    assert handled == ["msg"]
+    assert dispatcher.get_metrics()["topics"]["topic"]["failed"] == 1
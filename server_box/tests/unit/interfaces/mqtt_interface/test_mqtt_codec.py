@@ -0,0 +1,54 @@
+"""MQTT payloads codec unit tests"""
+from datetime import datetime, timezone
+from server.interfaces.mqtt_interface import codec
+from server.interfaces.mqtt_interface.model import SingleRelayStatus, RelaysStatus
+
+
+def test_relays_status_round_trip():
+    # GIVEN
+    timestamp = datetime(2023, 5, 4, 12, 30, 15, 123456)
+    relays_status = RelaysStatus(
+        relay_statuses=[SingleRelayStatus(i, i % 2 == 0, True) for i in range(6)],
+        command=True,
+        timestamp=timestamp,
+    )
+
+    # WHEN
+    decoded = codec.deserialize(codec.serialize(relays_status))
+
+    # THEN
+    assert isinstance(decoded, RelaysStatus)
+    assert decoded.to_json() == relays_status.to_json()
+    assert decoded.timestamp == timestamp
+
+
+def test_json_module_fallback(monkeypatch):
+    # GIVEN
+    monkeypatch.setattr(codec, "orjson", None)
+    relays_status = RelaysStatus([SingleRelayStatus(1, False, True)], command=False)
+
+    # WHEN
+    payload = codec.serialize(relays_status)
+    decoded = codec.deserialize(payload)
+
+    # THEN
+    assert isinstance(payload, bytes)
+    assert decoded.to_json() == relays_status.to_json()
+
+
+def test_decode_foreign_payloads():
+    # GIVEN
+    utc_payload = (
+        b'{"relay_statuses": [{"relay_number": 2, "status": true, "powered": false}],'
+        b' "timestamp": "2023-05-04T12:30:15Z", "command": false}'
+    )
+    other_payload = b'{"data": "ping"}'
+
+    # WHEN
+    relays_status = codec.deserialize(utc_payload)
+    other = codec.deserialize(other_payload)
+
+    # THEN
+    assert relays_status.timestamp == datetime(2023, 5, 4, 12, 30, 15, tzinfo=timezone.utc)
+    assert relays_status.relay_statuses[0].relay_number == 2
+    assert other == {"data": "ping"}
@@ -0,0 +1,145 @@
+"""MQTT publish pipeline unit tests"""
+import paho.mqtt.client as mqtt
+from server.interfaces.mqtt_interface.pipeline import PublishPipeline
+
+
+class FakeInfo:
+    def __init__(self, rc: int, mid: int):
+        self.rc = rc
+        self.mid = mid
+
+
+class FakeClient:
+    """paho client publish, refuses the first refusals publishes"""
+
+    def __init__(self, refusals: int = 0):
+        self.published = []
+        self.refusals = refusals
+        self.on_publish = None
+
+    def publish(self, topic, payload, qos):
+        if self.refusals:
+            self.refusals -= 1
+            return FakeInfo(mqtt.MQTT_ERR_QUEUE_SIZE, 0)
+        mid = len(self.published) + 1
+        self.published.append((mid, topic))
+        if self.on_publish is not None:
+            # Acknowledgment received before publish returns
+            self.on_publish(mid)
+        return FakeInfo(mqtt.MQTT_ERR_SUCCESS, mid)
+
+
+def create_pipeline(client, max_in_flight=2, max_attempts=3):
+    return PublishPipeline(
+        client=client,
+        max_in_flight=max_in_flight,
+        max_queue_size=10,
+        ack_timeout_in_secs=5,
+        max_attempts=max_attempts,
+    )
+
+
+def test_window_of_unacknowledged_messages():
+    # GIVEN
+    client = FakeClient()
+    pipeline = create_pipeline(client, max_in_flight=2)
+    futures = [pipeline.submit(f"topic/{i}", b"{}", 1) for i in range(4)]
+
+    # WHEN
+    queued_while_paused = len(client.published)
+    pipeline.resume()
+    published_in_window = len(client.published)
+    pipeline.on_publish(1)
+
+    # THEN
+    assert queued_while_paused == 0
+    assert published_in_window == 2
+    assert len(client.published) == 3
+    assert futures[0].result(timeout=1) is True
+    assert not futures[1].done()
+    assert pipeline.get_metrics()["in_flight"] == 2
+
+
+def test_early_acknowledgment():
+    # GIVEN
+    client = FakeClient()
+    pipeline = create_pipeline(client)
+    client.on_publish = pipeline.on_publish
+    pipeline.resume()
+
+    # WHEN
+    future = pipeline.submit("topic", b"{}", 1)
+
+    # THEN
+    assert future.result(timeout=1) is True
+    assert pipeline.get_metrics()["in_flight"] == 0
+
+
+def test_late_message_is_not_published_again():
+    # GIVEN
+    client = FakeClient()
+    pipeline = create_pipeline(client)
+    pipeline.resume()
+    future = pipeline.submit("topic", b"{}", 1)
+
+    # WHEN
+    pipeline.sweep(now=float("inf"))
+    pipeline.resume()
+    pipeline.on_publish(1)
+
+    # THEN
+    assert client.published == [(1, "topic")]
+    assert pipeline.get_metrics()["late"] == 1
+    assert future.result(timeout=1) is True
+
+
+def test_refused_message_retried_until_max_attempts():
+    # GIVEN
+    client = FakeClient(refusals=4)
+    pipeline = create_pipeline(client, max_attempts=3)
+    pipeline.resume()
+
+    # WHEN
+    failed = pipeline.submit("topic/failed", b"{}", 1)
+    for _ in range(2):
+        pipeline.resume()
+    retried = pipeline.submit("topic/retried", b"{}", 1)
+    pipeline.resume()
+
+    # THEN
+    assert failed.result(timeout=1) is False
+    assert client.published == [(1, "topic/retried")]
+    assert not retried.done()
+    assert pipeline.get_metrics()["retried"] == 3
+
+
+def test_cancelled_message_is_not_published():
+    # GIVEN
+    client = FakeClient()
+    pipeline = create_pipeline(client)
+    future = pipeline.submit("topic", b"{}", 1)
+
+    # WHEN
+    cancelled = future.cancel()
+    pipeline.resume()
+
+    # THEN
+    assert cancelled
+    assert client.published == []
+    assert pipeline.get_metrics()["cancelled"] == 1
+
+
+def test_cancelled_messages_make_room_in_full_queue():
+    # GIVEN
+    pipeline = create_pipeline(FakeClient())
+    futures = [pipeline.submit("topic", b"{}", 1) for _ in range(10)]
+    futures[3].cancel()
+
+    # WHEN
+    accepted = pipeline.submit("topic", b"{}", 1)
+    rejected = pipeline.submit("topic", b"{}", 1)
+
+    # THEN
+    assert not accepted.done()
+    assert rejected.result(timeout=1) is False
+    assert pipeline.get_metrics()["queue_depth"] == 10
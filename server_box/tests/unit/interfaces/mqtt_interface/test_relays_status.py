@@ -0,0 +1,47 @@
+"""Relays status model unit tests"""
+from datetime import datetime
+import pytest
+from server.interfaces.mqtt_interface.model import SingleRelayStatus, RelaysStatus
+
+
+def test_relay_lookup_by_number():
+    # GIVEN
+    relays_status = RelaysStatus(
+        relay_statuses=[
+            SingleRelayStatus(3, True, False),
+            SingleRelayStatus(0, False, True),
+            SingleRelayStatus(5, True, True),
+        ],
+        command=False,
+    )
+
+    # WHEN
+    relay_5 = relays_status.get(5)
+    relay_1 = relays_status.get(1)
+
+    # THEN
+    assert relay_5 == SingleRelayStatus(5, True, True)
+    assert relay_1 is None
+    assert [relay.relay_number for relay in relays_status.relay_statuses] == [0, 3, 5]
+
+
+def test_changes_return_new_snapshot():
+    # GIVEN
+    timestamp = datetime(2023, 5, 4, 12, 0, 0)
+    relays_status = RelaysStatus(
+        [SingleRelayStatus(i, False, True) for i in range(1, 5)], command=True, timestamp=timestamp
+    )
+
+    # WHEN
+    changed = relays_status.with_relay(2, True)
+
+    # THEN
+    assert relays_status.get(2).status is False
+    assert changed.get(2) == SingleRelayStatus(2, True, True)
+    assert changed != relays_status
+    assert changed.with_relay(2, False) == relays_status
+    assert hash(changed.with_relay(2, False)) == hash(relays_status)
+    with pytest.raises(AttributeError):
+        relays_status.timestamp = datetime.now()
+    with pytest.raises(AttributeError):
+        relays_status.relay_statuses[0].status = True
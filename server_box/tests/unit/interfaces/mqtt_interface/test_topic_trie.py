@@ -0,0 +1,44 @@
+"""MQTT topic trie unit tests"""
+import pytest
+from server.interfaces.mqtt_interface.topic_trie import TopicTrie
+
+
+def test_wildcard_filters_match():
+    # GIVEN
+    trie = TopicTrie()
+    for topic_filter in ["status/relays", "status/relays/+", "status/#", "#", "command/+/on"]:
+        trie.add(topic_filter, topic_filter)
+
+    # WHEN
+    relays_matches = trie.match("status/relays")
+    panel_matches = trie.match("status/relays/panel2")
+    command_matches = trie.match("command/wifi/on")
+    system_matches = trie.match("$SYS/broker")
+
+    # THEN
+    assert sorted(relays_matches) == ["#", "status/#", "status/relays"]
+    assert sorted(panel_matches) == ["#", "status/#", "status/relays/+"]
+    assert sorted(command_matches) == ["#", "command/+/on"]
+    assert system_matches == []
+
+
+def test_several_handlers_per_filter():
+    # GIVEN
+    trie = TopicTrie()
+
+    # WHEN
+    first_is_new = trie.add("status/relays", "handler1")
+    second_is_new = trie.add("status/relays", "handler2")
+    trie.remove("status/relays", "handler1")
+
+    # THEN
+    assert first_is_new and not second_is_new
+    assert trie.match("status/relays") == ["handler2"]
+    trie.remove("status/relays", "handler2")
+    assert trie.get_filters() == []
+
+
+@pytest.mark.parametrize("topic_filter", ["status/#/relays", "status/relay+", ""])
+def test_invalid_filters_are_rejected(topic_filter):
+    with pytest.raises(ValueError):
+        TopicTrie().add(topic_filter, "handler")
@@ -0,0 +1,40 @@
+"""Thread dongle frame decoder unit tests"""
+from server.interfaces.thread_dongle_interface.framing import FrameDecoder
+
+
+def test_messages_received_together_are_split():
+    # GIVEN
+    decoder = FrameDecoder(delimiter=b"\n")
+
+    # WHEN
+    frames = decoder.feed(b"ka_node1\nal_door\r\n")
+
+    # THEN
+    assert frames == [b"ka_node1", b"al_door"]
+
+
+def test_frame_split_across_reads():
+    # GIVEN
+    decoder = FrameDecoder(delimiter=b"\r\n")
+
+    # WHEN
+    first_frames = decoder.feed(b"wifi-all-o")
+    second_frames = decoder.feed(b"n\r")
+    third_frames = decoder.feed(b"\nka_node")
+
+    # THEN
+    assert first_frames == []
+    assert second_frames == []
+    assert third_frames == [b"wifi-all-on"]
+
+
+def test_oversized_frame_is_discarded():
+    # GIVEN
+    decoder = FrameDecoder(delimiter=b"\n", max_frame_size=8)
+
+    # WHEN
+    frames = decoder.feed(b"0123456789") + decoder.feed(b"abc\nka_n1\n")
+
+    # THEN
+    assert frames == [b"ka_n1"]
+    assert decoder.counters["oversized_frames"] == 1
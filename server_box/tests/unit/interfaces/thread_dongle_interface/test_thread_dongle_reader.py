@@ -0,0 +1,61 @@
+"""Thread dongle reader unit tests"""
+import serial
+from server.interfaces.thread_dongle_interface import service
+from server.interfaces.thread_dongle_interface.service import ThreadServerDongle
+
+
+class FakeSerial:
+    """Serial port failing the opening after the first one"""
+
+    opened = 0
+
+    def __init__(self, *args, **kwargs):
+        FakeSerial.opened += 1
+        if FakeSerial.opened > 1:
+            raise serial.SerialException("no such device")
+
+    def close(self):
+        pass
+
+
+def create_dongle(monkeypatch) -> ThreadServerDongle:
+    FakeSerial.opened = 0
+    monkeypatch.setattr(service.serial, "Serial", FakeSerial)
+    return ThreadServerDongle(
+        thread_serial_port="/dev/null",
+        reconnect_min_delay_in_secs=1,
+        reconnect_max_delay_in_secs=4,
+    )
+
+
+def test_reopen_delay_doubles_up_to_max(monkeypatch):
+    # GIVEN
+    delays = []
+    monkeypatch.setattr(service.time, "sleep", delays.append)
+    dongle = create_dongle(monkeypatch)
+
+    # WHEN
+    for _ in range(4):
+        dongle.restart_serial_port()
+
+    # THEN
+    assert delays == [1, 2, 4, 4]
+    assert dongle.get_counters()["reconnections"] == 4
+    assert FakeSerial.opened == 5
+
+
+def test_invalid_keep_alive_is_dropped(monkeypatch):
+    # GIVEN
+    dongle = create_dongle(monkeypatch)
+    keep_alives = []
+    dongle.set_keep_alive_reception_callback(
+        lambda node_id, rssi: keep_alives.append((node_id, rssi))
+    )
+
+    # WHEN
+    for msg in ["ka", "ka_", "ka_node1_x", "ka_node2_-70"]:
+        dongle.process_message(msg)
+
+    # THEN
+    assert keep_alives == [("node1", None), ("node2", -70)]
+    assert dongle.get_counters()["decode_errors"] == 2
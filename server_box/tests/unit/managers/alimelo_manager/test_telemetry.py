@@ -0,0 +1,72 @@
+"""Alimelo telemetry history unit tests"""
+import pytest
+from server.managers.alimelo_manager.telemetry import TelemetryHistory, FIELDS
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def get_sample(power_mW: float) -> dict:
+    sample = dict.fromkeys(FIELDS, 1.0)
+    sample["power_mW"] = power_mW
+    return sample
+
+
+def test_raw_buffer_keeps_the_last_samples():
+    # GIVEN
+    clock = FakeClock()
+    history = TelemetryHistory(memory_budget_in_kb=1, clock=clock)
+    capacity = history.buffers["raw"].capacity
+
+    # WHEN
+    for idx in range(capacity + 3):
+        clock.now = idx
+        history.record(get_sample(power_mW=idx))
+
+    # THEN
+    samples = history.query("raw")
+    assert len(samples["timestamp"]) == capacity
+    assert samples["timestamp"][0] == 3
+    assert samples["power_mW"][-1] == capacity + 2
+
+
+def test_aggregates_and_energy():
+    # GIVEN
+    clock = FakeClock()
+    history = TelemetryHistory(memory_budget_in_kb=64, clock=clock)
+
+    # WHEN
+    for idx in range(0, 3601, 60):
+        clock.now = idx
+        history.record(get_sample(power_mW=1000.0))
+
+    # THEN
+    aggregates = history.aggregate("raw")
+    assert aggregates["samples"] == 61
+    assert aggregates["fields"]["power_mW"]["mean"] == 1000.0
+    assert aggregates["energy_mWh"] == pytest.approx(1000.0)
+    assert len(history.aggregate("raw", since_in_secs=600)["fields"]) == len(FIELDS)
+    assert history.aggregate("raw", since_in_secs=600)["samples"] == 11
+
+
+def test_samples_are_downsampled_in_buckets():
+    # GIVEN
+    clock = FakeClock()
+    history = TelemetryHistory(memory_budget_in_kb=64, clock=clock)
+
+    # WHEN
+    for idx in range(0, 121, 10):
+        clock.now = idx
+        history.record(get_sample(power_mW=idx))
+
+    # THEN
+    buckets = history.query("1min")
+    assert buckets["timestamp"] == [0.0, 60.0]
+    assert buckets["count"] == [6.0, 6.0]
+    assert buckets["power_mW_mean"] == [25.0, 85.0]
+    assert buckets["power_mW_max"] == [50.0, 110.0]
@@ -0,0 +1,40 @@
+"""Power strip relays status unit tests"""
+import threading
+import time
+from datetime import datetime
+from server.interfaces.mqtt_interface import RelaysStatus
+from server.managers.power_strip_manager.service import PowerStripManager, thread_manager_service
+
+# Relays 1 to 4
+RELAYS_MASK = 0b11110
+
+
+def test_received_status_not_reverted_by_relay_change(monkeypatch):
+    # GIVEN
+    monkeypatch.setattr(
+        thread_manager_service, "update_power_strip_status_in_dongle", lambda **kwargs: None
+    )
+    manager = PowerStripManager()
+    manager.relays_status = RelaysStatus.from_masks(RELAYS_MASK, 0, 0, False, datetime.now())
+    with_relay = RelaysStatus.with_relay
+    relay_change_started = threading.Event()
+
+    def slow_with_relay(*args, **kwargs):
+        # The status is received while the relay change is in progress
+        relay_change_started.set()
+        time.sleep(0.05)
+        return with_relay(*args, **kwargs)
+
+    monkeypatch.setattr(RelaysStatus, "with_relay", slow_with_relay)
+    relay_change = threading.Thread(target=manager.set_single_relay_status, args=(1, True))
+
+    # WHEN
+    relay_change.start()
+    relay_change_started.wait(1)
+    manager.set_relays_statuses(
+        RelaysStatus.from_masks(RELAYS_MASK, 0b00100, 0, False, datetime.now())
+    )
+    relay_change.join()
+
+    # THEN
+    assert manager.get_relays_status().get(2).status is True
@@ -0,0 +1,17 @@
+"""Thread connected nodes device state unit tests"""
+from server.common.device_state import device_state_store, THREAD_NODES
+from server.managers.thread_manager.service import ThreadManager
+from server.managers.thread_manager.registry import NodeRegistry
+
+
+def test_keep_alive_commits_connected_nodes():
+    # GIVEN
+    thread_manager = ThreadManager()
+    thread_manager.node_registry = NodeRegistry(timeout_in_secs=60)
+    thread_manager.node_registry.add_event_callback(thread_manager.record_connected_nodes)
+
+    # WHEN
+    thread_manager.keep_alive_reception_callback("node1", rssi=-60)
+
+    # THEN
+    assert device_state_store.get(THREAD_NODES) == frozenset({"node1"})
@@ -0,0 +1,67 @@
+"""Thread node registry unit tests"""
+from server.managers.thread_manager.registry import NodeRegistry, NODE_JOINED, NODE_LEFT
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_join_and_leave_events():
+    # GIVEN
+    clock = FakeClock()
+    registry = NodeRegistry(timeout_in_secs=60, clock=clock)
+    events = []
+    registry.add_event_callback(lambda event, node_id: events.append((event, node_id)))
+
+    # WHEN
+    registry.record_keep_alive("node1")
+    registry.record_keep_alive("node2")
+    clock.now = 30
+    registry.record_keep_alive("node1")
+    clock.now = 61
+    expired = registry.expire()
+
+    # THEN
+    assert expired == ["node2"]
+    assert events == [(NODE_JOINED, "node1"), (NODE_JOINED, "node2"), (NODE_LEFT, "node2")]
+    assert list(registry.get_snapshot()) == ["node1"]
+
+
+def test_keep_alive_and_rssi_stats():
+    # GIVEN
+    clock = FakeClock()
+    registry = NodeRegistry(timeout_in_secs=60, clock=clock)
+
+    # WHEN
+    registry.record_keep_alive("node1", rssi=-70)
+    clock.now = 10
+    registry.record_keep_alive("node1", rssi=-60)
+    clock.now = 30
+    registry.record_keep_alive("node1", rssi=-80)
+
+    # THEN
+    [node] = registry.get_nodes()
+    assert node["keep_alives"] == 3
+    assert node["keep_alive_interval_in_secs"] == {"avg": 15.0, "min": 10.0, "max": 20.0}
+    assert node["rssi"] == {"last": -80, "min": -80, "max": -60}
+
+
+def test_snapshot_is_reused_until_change():
+    # GIVEN
+    registry = NodeRegistry(timeout_in_secs=60, clock=FakeClock())
+    registry.record_keep_alive("node1")
+
+    # WHEN
+    first_snapshot = registry.get_snapshot()
+    second_snapshot = registry.get_snapshot()
+    registry.record_keep_alive("node2")
+    third_snapshot = registry.get_snapshot()
+
+    # THEN
+    assert first_snapshot is second_snapshot
+    assert set(first_snapshot) == {"node1"}
+    assert set(third_snapshot) == {"node1", "node2"}
@@ -0,0 +1,77 @@
+"""Livebox ssh fakes for the wifi bands manager unit tests"""
+import os
+import threading
+from contextlib import contextmanager
+import server
+from server.common.executor import KeyedExecutor
+from server.managers.wifi_bands_ssh_manager.service import WifiBandsManager, BANDS
+
+SSH_COMMANDS_FILE = os.path.join(os.path.dirname(server.__file__), "config", "ssh_commands.yml")
+
+
+class FakeLivebox:
+    """
+    Livebox shell, a radio is up after a number of status polls. The
+    failing commands print nothing, their error goes to the hidden stderr
+    """
+
+    def __init__(self, polls_before_change: int = 2):
+        self.polls_before_change = polls_before_change
+        self.radios = {"wl0": "down", "wl1": "down", "wl2": "down"}
+        self.pending = {}
+        self.failing_commands = set()
+        self.commands = []
+        self.lock = threading.Lock()
+
+    def send_command(self, command: str) -> str:
+        with self.lock:
+            self.commands.append(command)
+        return "\n".join(
+            line for line in map(self.run, command.split("; ")) if line
+        )
+
+    def run(self, command: str) -> str:
+        with self.lock:
+            if command.startswith("echo "):
+                return command[len("echo "):]
+            if command in self.failing_commands:
+                return ""
+            interface = command.split()[2]
+            if command.endswith("bss"):
+                if interface in self.pending:
+                    polls, status = self.pending[interface]
+                    if polls == 0:
+                        self.radios[interface] = status
+                        del self.pending[interface]
+                    else:
+                        self.pending[interface] = (polls - 1, status)
+                return self.radios[interface]
+            if " radio " in command:
+                status = "up" if command.endswith("on") else "down"
+                self.pending[interface] = (self.polls_before_change, status)
+                return ""
+            raise ValueError(f"Unknown command {command}")
+
+
+class FakeSshPool:
+    """Pool lending the same fake session, counts the sessions in use"""
+
+    def __init__(self, livebox: FakeLivebox):
+        self.livebox = livebox
+        self.in_use = 0
+
+    @contextmanager
+    def session(self):
+        self.in_use += 1
+        try:
+            yield self.livebox
+        finally:
+            self.in_use -= 1
+
+
+def create_manager(livebox: FakeLivebox) -> WifiBandsManager:
+    manager = WifiBandsManager()
+    manager.load_commands(SSH_COMMANDS_FILE)
+    manager.ssh_pool = FakeSshPool(livebox)
+    manager.status_change_executor = KeyedExecutor(max_workers=len(BANDS), name="TestWifi")
+    return manager
@@ -0,0 +1,77 @@
+"""Wifi status batched query unit tests"""
+import pytest
+from server.common import ServerBoxException
+from server.managers.wifi_bands_ssh_manager.model import WifiBandStatus, WifiStatus
+from .fakes import FakeLivebox, create_manager
+
+
+class CannedSession:
+    """Session returning the same output to any command"""
+
+    def __init__(self, output: str):
+        self.output = output
+
+    def send_command(self, command: str) -> str:
+        return self.output
+
+
+def test_wifi_status_in_single_exec():
+    # GIVEN
+    livebox = FakeLivebox()
+    livebox.radios = {"wl0": "up", "wl1": "down", "wl2": "up"}
+    manager = create_manager(livebox)
+
+    # WHEN
+    wifi_status = manager.get_wifi_status_batched()
+
+    # THEN
+    assert wifi_status == WifiStatus(
+        status=True,
+        bands_status=[
+            WifiBandStatus(band="2.4GHz", status=True),
+            WifiBandStatus(band="5GHz", status=True),
+            WifiBandStatus(band="6GHz", status=False),
+        ],
+    )
+    assert len(livebox.commands) == 1
+
+
+def test_command_error_gives_empty_output():
+    # GIVEN
+    livebox = FakeLivebox()
+    livebox.radios = {"wl0": "up", "wl1": "up", "wl2": "up"}
+    livebox.failing_commands = {"wl -i wl1 bss"}
+    manager = create_manager(livebox)
+
+    # WHEN
+    outputs = manager.execute_batched_commands(
+        ["wl -i wl2 bss", "wl -i wl1 bss", "wl -i wl0 bss", "wl -i wl2 bss"]
+    )
+    wifi_status = manager.get_wifi_status_batched()
+
+    # THEN
+    assert outputs == {"wl -i wl2 bss": "up", "wl -i wl1 bss": "", "wl -i wl0 bss": "up"}
+    assert wifi_status.status is True
+    assert wifi_status.bands_status[2] == WifiBandStatus(band="6GHz", status=False)
+
+
+@pytest.mark.parametrize(
+    "output",
+    [
+        # Second section missing
+        "__SERVER_BOX_BATCH__0\nup\n__SERVER_BOX_BATCH__end",
+        # Output truncated before the end delimiter
+        "__SERVER_BOX_BATCH__0\nup\n__SERVER_BOX_BATCH__1\nup",
+    ],
+)
+def test_missing_section_is_an_error(output):
+    # GIVEN
+    manager = create_manager(CannedSession(output))
+
+    # WHEN
+    with pytest.raises(ServerBoxException):
+        manager.execute_batched_commands(["wl -i wl2 bss", "wl -i wl0 bss"])
+    wifi_status = manager.get_wifi_status_batched()
+
+    # THEN
+    assert wifi_status is None
@@ -0,0 +1,98 @@
+"""Wifi bands status change unit tests"""
+import time
+from server.managers.wifi_bands_ssh_manager import service
+from server.managers.wifi_bands_ssh_manager.model import WifiBandStatus, WifiStatus
+from .fakes import FakeLivebox, create_manager
+
+
+def test_session_released_while_waiting_for_band_status(monkeypatch):
+    # GIVEN
+    sessions_in_use_while_waiting = []
+    livebox = FakeLivebox(polls_before_change=3)
+    manager = create_manager(livebox)
+    monkeypatch.setattr(
+        service.time, "sleep", lambda _: sessions_in_use_while_waiting.append(manager.ssh_pool.in_use)
+    )
+
+    # WHEN
+    status = manager.set_band_status(band="5GHz", status=True)
+
+    # THEN
+    assert status is True
+    assert livebox.radios["wl0"] == "up"
+    assert sessions_in_use_while_waiting == [0, 0, 0, 0]
+
+
+def test_band_status_changes_applied_in_order(monkeypatch):
+    # GIVEN
+    monkeypatch.setattr(service.time, "sleep", lambda _: None)
+    livebox = FakeLivebox(polls_before_change=1)
+    manager = create_manager(livebox)
+
+    # WHEN
+    futures = [
+        manager.set_band_status_async(band="2.4GHz", status=status)
+        for status in [True, False, True, False]
+    ]
+
+    # THEN
+    assert [future.result(timeout=5) for future in futures] == [True, False, True, False]
+    radio_commands = [command for command in livebox.commands if " radio " in command]
+    assert radio_commands == [
+        "wl -i wl2 radio on",
+        "wl -i wl2 radio off",
+        "wl -i wl2 radio on",
+        "wl -i wl2 radio off",
+    ]
+
+
+def test_wifi_status_not_updated_without_band_status(monkeypatch):
+    # GIVEN
+    livebox = FakeLivebox()
+    livebox.radios = {"wl0": "up", "wl1": "up", "wl2": "up"}
+    manager = create_manager(livebox)
+    manager.batched_status_query = False
+    get_band_status = manager.get_band_status
+    monkeypatch.setattr(
+        manager,
+        "get_band_status",
+        lambda band: None if band == "6GHz" else get_band_status(band),
+    )
+
+    # WHEN
+    wifi_status = manager.update_wifi_status_attribute()
+
+    # THEN
+    assert wifi_status is None
+
+
+def test_concurrent_band_changes_all_recorded(monkeypatch):
+    # GIVEN
+    sleep = time.sleep
+    monkeypatch.setattr(service.time, "sleep", lambda _: None)
+
+    def slow_wifi_status(*args, **kwargs):
+        # Widen the window between the read and the write of the known status
+        sleep(0.01)
+        return WifiStatus(*args, **kwargs)
+
+    monkeypatch.setattr(service, "WifiStatus", slow_wifi_status)
+    livebox = FakeLivebox(polls_before_change=1)
+    manager = create_manager(livebox)
+    manager.wifi_status = WifiStatus(
+        status=False,
+        bands_status=[WifiBandStatus(band=band, status=False) for band in service.BANDS],
+    )
+
+    # WHEN
+    futures = [
+        manager.set_band_status_async(band=band, status=True) for band in service.BANDS
+    ]
+    for future in futures:
+        future.result(timeout=5)
+
+    # THEN
+    assert manager.wifi_status == WifiStatus(
+        status=True,
+        bands_status=[WifiBandStatus(band=band, status=True) for band in service.BANDS],
+    )
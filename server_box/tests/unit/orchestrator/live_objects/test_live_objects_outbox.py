@@ -0,0 +1,44 @@
+"""LiveObjects outbox unit tests"""
+import pytest
+from server.orchestrator.live_objects.service import (
+    LiveObjects,
+    LIVE_OBJECTS_OUTBOX,
+    notification_outbox_service,
+    wifi_bands_manager_service,
+)
+from server.orchestrator.outbox.store import OutboxStore
+
+
+class FakePublisher:
+    """Publisher keeping the queued messages"""
+
+    def __init__(self):
+        self.queued = []
+
+    def put(self, element: dict):
+        self.queued.append(element)
+
+
+@pytest.fixture(scope="function")
+def store(tmp_path, monkeypatch):
+    store = OutboxStore(db_file=str(tmp_path / "outbox.sqlite3"), max_messages=10)
+    monkeypatch.setattr(notification_outbox_service, "store", store, raising=False)
+    yield store
+    store.close()
+
+
+def test_same_alarm_stored_once_distinct_alarms_kept(store, monkeypatch):
+    # GIVEN
+    monkeypatch.setattr(wifi_bands_manager_service, "is_connected_to_internet", lambda: True)
+    live_objects = LiveObjects()
+    live_objects.data_send_topic = "dev/data"
+    live_objects.publisher = FakePublisher()
+    for _ in range(2):
+        live_objects.publish_data({"al": {"doorbell": 1}}, tags=["alarm"])
+
+    # WHEN
+    for element in live_objects.publisher.queued * 2:
+        live_objects.store_in_outbox(element)
+
+    # THEN
+    assert len(store.fetch_batch(LIVE_OBJECTS_OUTBOX, limit=10)) == 2
@@ -0,0 +1,53 @@
+"""LiveObjects publisher merge unit tests"""
+from server.orchestrator.live_objects.publisher import LiveObjectsPublisher
+
+
+def message(value: dict, tags: list) -> dict:
+    return {"topic": "dev/data", "data_to_send": {"value": value, "tags": tags}}
+
+
+def test_merge_alarms_and_statuses():
+    # GIVEN
+    publisher = LiveObjectsPublisher(
+        publish=None, overflow=None, max_queue_size=10, batch_size=10
+    )
+    elements = [
+        message({"al": {"doorbell": 1}}, ["alarm"]),
+        message({"wf": {"w": True}, "ep": "", "us": "DEEP_SLEEP"}, ["status"]),
+        message({"al": {"doorbell": 1}}, ["alarm", "front"]),
+        message({"al": {"presence": 1}}, ["alarm"]),
+        message({"token": "abc"}, ["token"]),
+        message({"wf": {"w": False}, "ep": "", "us": "DEEP_SLEEP"}, ["status"]),
+    ]
+
+    # WHEN
+    merged = publisher.merge(elements)
+
+    # THEN
+    assert merged == [
+        message({"al": {"doorbell": 2, "presence": 1}}, ["alarm", "front"]),
+        message({"token": "abc"}, ["token"]),
+        message({"wf": {"w": False}, "ep": "", "us": "DEEP_SLEEP"}, ["status"]),
+    ]
+    assert elements[0]["data_to_send"]["value"] == {"al": {"doorbell": 1}}
+    assert publisher.get_metrics()["merged"] == 2
+    assert publisher.get_metrics()["coalesced"] == 1
+
+
+def test_merged_alarms_identity_derived_from_alarms():
+    # GIVEN
+    publisher = LiveObjectsPublisher(
+        publish=None, overflow=None, max_queue_size=10, batch_size=10
+    )
+    doorbell = dict(message({"al": {"doorbell": 1}}, ["alarm"]), dedup_key="a1")
+    presence = dict(message({"al": {"presence": 1}}, ["alarm"]), dedup_key="a2")
+
+    # WHEN
+    single = publisher.merge([doorbell])
+    merged = publisher.merge([doorbell, presence])
+    merged_again = publisher.merge([doorbell, presence])
+
+    # THEN
+    assert single[0]["dedup_key"] == "a1"
+    assert merged[0]["dedup_key"] not in ("a1", "a2")
+    assert merged[0]["dedup_key"] == merged_again[0]["dedup_key"]
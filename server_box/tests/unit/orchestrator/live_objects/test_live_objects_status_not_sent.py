@@ -0,0 +1,39 @@
+"""LiveObjects status not sent unit tests"""
+from server.orchestrator.live_objects.service import LiveObjects, notification_outbox_service
+from server.orchestrator.notification.snapshot_cache import StatusSnapshotCache
+
+
+def message(value: dict, tags: list) -> dict:
+    return {"topic": "dev/data", "data_to_send": {"value": value, "tags": tags}}
+
+
+def test_status_not_published_is_resent(monkeypatch):
+    # GIVEN
+    monkeypatch.setattr(notification_outbox_service, "put", lambda **kwargs: None)
+    status = {"wf": {"w": True}, "ep": "", "us": "DEEP_SLEEP"}
+    cache = StatusSnapshotCache(heartbeat_period_in_secs=3600)
+    live_objects = LiveObjects()
+    live_objects.set_status_not_sent_callback(lambda: cache.invalidate("live_objects"))
+    assert cache.should_send("live_objects", status)
+
+    # WHEN
+    live_objects.store_in_outbox(message(status, ["status", "livebox"]))
+
+    # THEN
+    assert cache.should_send("live_objects", status)
+
+
+def test_alarm_not_published_keeps_status_snapshot(monkeypatch):
+    # GIVEN
+    monkeypatch.setattr(notification_outbox_service, "put", lambda **kwargs: None)
+    status = {"wf": {"w": True}, "ep": "", "us": "DEEP_SLEEP"}
+    cache = StatusSnapshotCache(heartbeat_period_in_secs=3600)
+    live_objects = LiveObjects()
+    live_objects.set_status_not_sent_callback(lambda: cache.invalidate("live_objects"))
+    assert cache.should_send("live_objects", status)
+
+    # WHEN
+    live_objects.store_in_outbox(message({"al": {"doorbell": 1}}, ["alarm", "livebox"]))
+
+    # THEN
+    assert not cache.should_send("live_objects", status)
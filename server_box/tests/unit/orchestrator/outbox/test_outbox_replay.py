@@ -0,0 +1,68 @@
+"""Notifications outbox replay over MQTT unit tests"""
+import threading
+import paho.mqtt.client as mqtt
+import pytest
+from server.interfaces.mqtt_liveobjects_interface.client import MQTTClient
+from server.orchestrator.outbox.service import NotificationOutbox
+from server.orchestrator.outbox.store import OutboxStore
+
+
+class FakeInfo:
+    def __init__(self, rc: int, mid: int):
+        self.rc = rc
+        self.mid = mid
+
+
+class LateAckClient:
+    """paho client publish, the acknowledgment comes after ack_delay_in_secs"""
+
+    def __init__(self, mqtt_client: MQTTClient, ack_delay_in_secs: float):
+        self.mqtt_client = mqtt_client
+        self.ack_delay_in_secs = ack_delay_in_secs
+        self.published = []
+
+    def publish(self, topic, payload, qos):
+        mid = len(self.published) + 1
+        self.published.append(payload)
+        threading.Timer(
+            self.ack_delay_in_secs, self.mqtt_client.publish_pipeline.on_publish, (mid,)
+        ).start()
+        return FakeInfo(mqtt.MQTT_ERR_SUCCESS, mid)
+
+
+@pytest.fixture(scope="function")
+def outbox(tmp_path):
+    outbox = NotificationOutbox()
+    outbox.store = OutboxStore(db_file=str(tmp_path / "outbox.sqlite3"), max_messages=10)
+    outbox.replay_batch_size = 10
+    outbox.replay_batch_interval_in_secs = 0
+    yield outbox
+    outbox.store.close()
+
+
+def test_late_acknowledged_message_not_replayed_again(outbox):
+    # GIVEN
+    mqtt_client = MQTTClient(
+        broker_address="localhost", client_id="test", publish_timeout_in_secs=0.1
+    )
+    paho_client = LateAckClient(mqtt_client, ack_delay_in_secs=0.3)
+    mqtt_client.publish_pipeline.client = paho_client
+    mqtt_client.publish_pipeline.resume()
+    outbox.register_sender(
+        "live_objects",
+        lambda element: mqtt_client.publish(element["topic"], element["data_to_send"]),
+    )
+    outbox.put(
+        "live_objects",
+        "alarm",
+        {"topic": "dev/data", "data_to_send": {"value": {"al": {"doorbell": 1}}, "tags": ["alarm"]}},
+    )
+
+    # WHEN
+    outbox.replay()
+    outbox.replay()
+
+    # THEN
+    assert len(paho_client.published) == 1
+    assert outbox.store.fetch_batch("live_objects", limit=10) == []
+    assert outbox.metrics["replay_failures"] == 0
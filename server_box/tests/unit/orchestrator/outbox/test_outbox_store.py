@@ -0,0 +1,49 @@
+"""Notifications outbox store unit tests"""
+import pytest
+from server.orchestrator.outbox.store import OutboxStore, ALARM
+
+
+@pytest.fixture(scope="function")
+def store(tmp_path):
+    store = OutboxStore(db_file=str(tmp_path / "outbox.sqlite3"), max_messages=3)
+    yield store
+    store.close()
+
+
+def test_status_snapshots_are_coalesced(store):
+    # GIVEN
+    store.put("rpi_cloud", "status", {"use_situation": "A"}, coalesce_key="status")
+
+    # WHEN
+    result = store.put("rpi_cloud", "status", {"use_situation": "B"}, coalesce_key="status")
+
+    # THEN
+    assert result == "coalesced"
+    batch = store.fetch_batch("rpi_cloud", limit=10)
+    assert [message.payload for message in batch] == [{"use_situation": "B"}]
+
+
+def test_identical_messages_are_deduplicated(store):
+    # GIVEN
+    store.put("live_objects", "test", {"status": "running"})
+
+    # WHEN
+    result = store.put("live_objects", "test", {"status": "running"})
+
+    # THEN
+    assert result == "duplicated"
+    assert store.count("live_objects") == 1
+
+
+def test_alarms_are_never_evicted(store):
+    # GIVEN
+    for idx in range(3):
+        store.put("rpi_cloud", ALARM, {"alarm_type": "door"}, dedup_key=str(idx))
+
+    # WHEN
+    store.put("rpi_cloud", "battery", {"device": "sensor"})
+
+    # THEN
+    batch = store.fetch_batch("rpi_cloud", limit=10)
+    assert [message.kind for message in batch] == [ALARM, ALARM, ALARM]
+    assert store.evicted == 1
@@ -0,0 +1,44 @@
+"""Thread messages codec unit tests"""
+import pytest
+from server.orchestrator.requests.codec import (
+    ThreadMessageCodec,
+    ThreadMessageError,
+    AlarmMessage,
+    BatteryLevelMessage,
+    PredefinedCommandMessage,
+    DirectCommandMessage,
+)
+
+
+def test_messages_are_decoded_by_prefix():
+    # GIVEN
+    codec = ThreadMessageCodec()
+
+    # WHEN
+    messages = [
+        codec.decode(msg)
+        for msg in ["al_cam_db", "al_bt1_bat", "cmd_2", "bt_bt1_80", "wifi_all-on"]
+    ]
+
+    # THEN
+    assert messages == [
+        AlarmMessage(device="cam", alarm_type="doorbell"),
+        AlarmMessage(device="bt1", alarm_type="battery_btn_bt1"),
+        PredefinedCommandMessage(command_number=2),
+        BatteryLevelMessage(device_type="button", device="bt1", level="80"),
+        DirectCommandMessage(ressource="wifi", command="all-on"),
+    ]
+    assert codec.get_counters()["AlarmMessage"] == 2
+
+
+def test_invalid_messages_are_counted():
+    # GIVEN
+    codec = ThreadMessageCodec()
+
+    # WHEN
+    for msg in ["al_cam_xx", "cmd_one", "al_cam", "wifi"]:
+        with pytest.raises(ThreadMessageError):
+            codec.decode(msg)
+
+    # THEN
+    assert codec.get_counters()["parse_errors"] == 4
@@ -0,0 +1,95 @@
+"""Use situations execution engine unit tests"""
+import threading
+import time
+from server.common.executor import KeyedExecutor
+from server.managers.wifi_bands_ssh_manager import wifi_bands_manager_service
+from server.orchestrator.use_situations.engine import (
+    UseSituationEngine,
+    ACTION_APPLIED,
+    ACTION_SKIPPED,
+    ACTION_FAILED,
+)
+from server.orchestrator.use_situations.service import OrchestratorUseSituations
+
+
+def test_known_status_actions_skipped():
+    # GIVEN
+    engine = UseSituationEngine(max_workers=2)
+    applied = []
+    engine.register_resource("wifi", lambda: True, lambda target: applied.append(target) or True)
+    engine.register_resource("outlets", lambda: None, lambda target: applied.append(target) or True)
+
+    # WHEN
+    report = engine.execute("DEEP_SLEEP", "NONE", {"wifi": True, "outlets": {1: False}})
+
+    # THEN
+    assert applied == [{1: False}]
+    assert [(action.resource, action.result) for action in report.actions] == [
+        ("wifi", ACTION_SKIPPED),
+        ("outlets", ACTION_APPLIED),
+    ]
+    assert report.success
+
+
+def test_resources_applied_concurrently():
+    # GIVEN
+    engine = UseSituationEngine(max_workers=3)
+    barrier = threading.Barrier(3, timeout=2)
+    for resource in ("2.4GHz", "5GHz", "6GHz"):
+        engine.register_resource(resource, lambda: False, lambda target: barrier.wait() is not None)
+
+    # WHEN
+    report = engine.execute("PRESENCE", "NONE", {"2.4GHz": True, "5GHz": True, "6GHz": True})
+
+    # THEN
+    assert [action.result for action in report.actions] == [ACTION_APPLIED] * 3
+    assert report.success
+
+
+def test_failed_actions_reported():
+    # GIVEN
+    engine = UseSituationEngine(max_workers=2)
+
+    def raise_error(target):
+        raise ValueError("relay not found")
+
+    engine.register_resource("wifi", lambda: False, lambda target: False)
+    engine.register_resource("outlets", lambda: None, raise_error)
+
+    # WHEN
+    report = engine.execute("DEEP_SLEEP", "NONE", {"wifi": True, "outlets": {1: False}})
+
+    # THEN
+    assert [(action.result, action.error) for action in report.actions] == [
+        (ACTION_FAILED, None),
+        (ACTION_FAILED, "relay not found"),
+    ]
+    assert not report.success
+    assert engine.get_last_report() is report
+
+
+def test_band_action_ordered_with_other_band_changes(monkeypatch):
+    # GIVEN
+    changes = []
+
+    def set_band_status(band, status):
+        # The first change is still running when the use situation is applied
+        time.sleep(0.05 if status is False else 0)
+        changes.append((band, status))
+        return status
+
+    monkeypatch.setattr(
+        wifi_bands_manager_service,
+        "status_change_executor",
+        KeyedExecutor(max_workers=3, name="TestWifi"),
+    )
+    monkeypatch.setattr(wifi_bands_manager_service, "set_band_status", set_band_status)
+    use_situations = OrchestratorUseSituations()
+
+    # WHEN
+    wifi_bands_manager_service.set_band_status_async(band="2.4GHz", status=False)
+    applied = use_situations.set_use_situation_band_status(band="2.4GHz", band_status=True)
+
+    # THEN
+    assert applied
+    assert changes == [("2.4GHz", False), ("2.4GHz", True)]